@@ -0,0 +1,271 @@
+"""Grouped aggregates, threshold pass rates and bootstrap confidence intervals over per-row score tables.
+
+Works on EvaluationResult tables from either framework, on any DataFrame or Arrow table of scores, and on
+files streamed in batches. Rows are consumed in one pass. Each (group, metric) keeps only running sums and
+a histogram of its scores on a fixed grid, so memory does not grow with the number of rows.
+Bootstrap intervals resample the histograms rather than the rows, so their cost does not depend on the row
+count either. They use the Poisson bootstrap: every row gets a Poisson(1) weight, so each histogram cell gets
+a Poisson(cell count) weight. Groups under POISSON_MIN_ROWS rows are resampled exactly with a multinomial draw.
+Run from the repository root:
+    python analysis.py results/ragas_evaluation.csv
+    python analysis.py results/deepeval_evaluation.csv --by category --thresholds faithfulness=0.7
+"""
+import argparse
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
+
+# Pass threshold for metrics without one of their own (ragas metrics have none)
+DEFAULT_THRESHOLD = 0.5
+# Smallest group resampled with Poisson weights; a resample of it is practically never empty
+POISSON_MIN_ROWS = 1000
+
+
+def metric_thresholds(result: Any, default: float = DEFAULT_THRESHOLD) -> Dict[str, float]:
+    """Each metric's configured pass threshold from an EvaluationResult, else the default."""
+    configs = getattr(result, "configs", {}) or {}
+    return {name: (configs.get(name) or {}).get("threshold") or default for name in result.metric_names}
+
+
+class _Accumulator:
+    """Running counts, sums and score histogram per group for one metric."""
+
+    def __init__(self, bins: int) -> None:
+        self.bins = bins
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.total = np.zeros(0)
+        self.squares = np.zeros(0)
+        self.passed = np.zeros(0, dtype=np.int64)
+        self.histogram = np.zeros((0, bins), dtype=np.int64)
+        self.thresholds = np.zeros(0)
+
+    def grow(self, thresholds: List[float]) -> None:
+        extra = len(thresholds)
+        self.rows = np.concatenate([self.rows, np.zeros(extra, dtype=np.int64)])
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.total = np.concatenate([self.total, np.zeros(extra)])
+        self.squares = np.concatenate([self.squares, np.zeros(extra)])
+        self.passed = np.concatenate([self.passed, np.zeros(extra, dtype=np.int64)])
+        self.histogram = np.concatenate([self.histogram, np.zeros((extra, self.bins), dtype=np.int64)])
+        self.thresholds = np.concatenate([self.thresholds, np.asarray(thresholds, dtype=float)])
+
+    def update(self, groups: np.ndarray, values: np.ndarray) -> None:
+        size = len(self.rows)
+        self.rows += np.bincount(groups, minlength=size)
+        scored = ~np.isnan(values)
+        groups, values = groups[scored], values[scored]
+        self.count += np.bincount(groups, minlength=size)
+        self.total += np.bincount(groups, values, minlength=size)
+        self.squares += np.bincount(groups, values * values, minlength=size)
+        self.passed += np.bincount(groups[values >= self.thresholds[groups]], minlength=size)
+        # Scores are binned on a grid over [0, 1]; the exact sums above keep means and spreads exact
+        cells = np.rint(np.clip(values, 0.0, 1.0) * (self.bins - 1)).astype(np.int64)
+        self.histogram += np.bincount(groups * self.bins + cells, minlength=size * self.bins).reshape(size, self.bins)
+
+
+class ScoreAnalysis:
+    """Streaming per-group, per-metric aggregates with bootstrap intervals for the mean and the pass rate.
+
+    Feed score chunks with update() (wide: one column per metric; long: a metric name column plus a score
+    column) and read the summary with result().
+    """
+
+    def __init__(self, metrics: Optional[List[str]] = None, by: Optional[List[str]] = None,
+                 thresholds: Union[None, float, Dict[str, float]] = None, confidence: float = 0.95,
+                 resamples: int = 1000, bins: int = 101, metric_column: Optional[str] = None,
+                 score_column: str = "score", seed: int = 0) -> None:
+        if metric_column is None and not metrics:
+            raise ValueError("Name the metric columns, or the metric_column of a long-format table.")
+        self.metrics = list(metrics or [])
+        self.by = list(by or [])
+        self.thresholds = thresholds
+        self.confidence = confidence
+        self.resamples = resamples
+        self.bins = bins
+        self.metric_column = metric_column
+        self.score_column = score_column
+        self.seed = seed
+        self.groups = {}
+        self.keys = []
+        self.accumulators = {}
+
+    def threshold(self, metric: str) -> float:
+        if isinstance(self.thresholds, dict):
+            return self.thresholds.get(metric, DEFAULT_THRESHOLD)
+        return DEFAULT_THRESHOLD if self.thresholds is None else float(self.thresholds)
+
+    def _group_ids(self, chunk: Any) -> np.ndarray:
+        """Global ids of each row's group, registering groups not seen in earlier chunks."""
+        import pandas as pd
+        columns = self.by + ([self.metric_column] if self.metric_column else [])
+        if not columns:
+            codes, uniques = np.zeros(len(chunk), dtype=np.int64), [()]
+        else:
+            codes, uniques = pd.MultiIndex.from_frame(chunk[columns]).factorize()
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        new = []
+        for local, key in enumerate(uniques):
+            key = tuple(key) if isinstance(key, tuple) else (key,) if columns else ()
+            # Missing keys are one group across chunks, however each chunk spells its NaN
+            key = tuple(None if value != value else value for value in key)
+            if key not in self.groups:
+                self.groups[key] = len(self.keys)
+                self.keys.append(key)
+                new.append(key)
+            mapping[local] = self.groups[key]
+        if new:
+            for metric, accumulator in self.accumulators.items():
+                accumulator.grow([self.threshold(metric if metric is not None else key[-1]) for key in new])
+        return mapping[codes]
+
+    def _accumulator(self, metric: Optional[str]) -> _Accumulator:
+        if metric not in self.accumulators:
+            accumulator = _Accumulator(self.bins)
+            accumulator.grow([self.threshold(metric if metric is not None else key[-1]) for key in self.keys])
+            self.accumulators[metric] = accumulator
+        return self.accumulators[metric]
+
+    def update(self, chunk: Any) -> None:
+        """Add a DataFrame, Arrow table or record batch of per-row scores."""
+        if not hasattr(chunk, "iloc"):
+            chunk = chunk.to_pandas()
+        if not len(chunk):
+            return
+        import pandas as pd
+        groups = self._group_ids(chunk)
+        if self.metric_column is not None:
+            # Long format: the metric name is the last part of the group key
+            values = pd.to_numeric(chunk[self.score_column], errors="coerce").to_numpy(dtype=float)
+            self._accumulator(None).update(groups, values)
+            return
+        for metric in self.metrics:
+            values = pd.to_numeric(chunk[metric], errors="coerce").to_numpy(dtype=float)
+            self._accumulator(metric).update(groups, values)
+
+    def _intervals(self, accumulator: _Accumulator, rng: np.random.Generator) -> tuple:
+        """Bootstrap intervals of the mean and the pass rate for every group."""
+        alpha = (1 - self.confidence) / 2
+        grid = np.linspace(0.0, 1.0, self.bins)
+        size = len(accumulator.count)
+        mean_low, mean_high = np.full(size, np.nan), np.full(size, np.nan)
+        pass_low, pass_high = np.full(size, np.nan), np.full(size, np.nan)
+        for g in np.flatnonzero(accumulator.count):
+            n = int(accumulator.count[g])
+            cells = np.flatnonzero(accumulator.histogram[g])
+            counts = accumulator.histogram[g, cells]
+            if n < POISSON_MIN_ROWS:
+                # Exact resampling of n rows; small groups would often get no Poisson weight at all
+                weights = rng.multinomial(n, counts / n, size=self.resamples)
+            else:
+                weights = rng.poisson(counts, size=(self.resamples, len(cells)))
+            means = weights @ grid[cells] / weights.sum(axis=1)
+            # Shift by the binning error so the interval is centred on the exact mean
+            shift = accumulator.total[g] / n - counts @ grid[cells] / n
+            mean_low[g], mean_high[g] = np.quantile(means, [alpha, 1 - alpha]) + shift
+            rates = rng.binomial(n, accumulator.passed[g] / n, size=self.resamples) / n
+            pass_low[g], pass_high[g] = np.quantile(rates, [alpha, 1 - alpha])
+        return mean_low, mean_high, pass_low, pass_high
+
+    def result(self):
+        """One row per group and metric: rows, scored, coverage, mean, std, CI, threshold, pass rate and its CI."""
+        import pandas as pd
+        rng = np.random.default_rng(self.seed)
+        frames = []
+        for metric, accumulator in self.accumulators.items():
+            count = accumulator.count
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = accumulator.total / count
+                variance = (accumulator.squares - count * mean * mean) / (count - 1)
+                pass_rate = accumulator.passed / count
+            mean_low, mean_high, pass_low, pass_high = self._intervals(accumulator, rng)
+            frame = pd.DataFrame(self.keys, columns=self.by + ([self.metric_column] if metric is None else []))
+            if metric is None:
+                frame = frame.rename(columns={self.metric_column: "metric"})
+            else:
+                frame["metric"] = metric
+            frame = frame.assign(
+                rows=accumulator.rows,
+                scored=count,
+                coverage=count / np.maximum(accumulator.rows, 1),
+                mean=mean,
+                std=np.sqrt(np.clip(variance, 0.0, None)),
+                ci_low=mean_low,
+                ci_high=mean_high,
+                threshold=accumulator.thresholds,
+                pass_rate=pass_rate,
+                pass_ci_low=pass_low,
+                pass_ci_high=pass_high,
+            )
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True).sort_values(self.by + ["metric"], ignore_index=True)
+
+
+def analyze(scores: Any, metrics: Optional[List[str]] = None, by: Optional[List[str]] = None,
+            thresholds: Union[None, float, Dict[str, float]] = None, chunk_rows: int = 262144, **options: Any):
+    """Summarise per-row scores in one pass: an EvaluationResult, a DataFrame, an Arrow table or an iterable of chunks.
+
+    Metrics and thresholds default to the result's own metrics and configured thresholds.
+    """
+    if hasattr(scores, "metric_names"):
+        metrics = metrics or list(scores.metric_names)
+        if thresholds is None:
+            thresholds = metric_thresholds(scores)
+        scores = scores.to_pandas()
+    analysis = ScoreAnalysis(metrics, by, thresholds, **options)
+    if hasattr(scores, "to_batches"):
+        chunks = scores.to_batches(max_chunksize=chunk_rows)
+    elif hasattr(scores, "iloc"):
+        chunks = (scores.iloc[start:start + chunk_rows] for start in range(0, len(scores), chunk_rows))
+    else:
+        chunks = scores
+    for chunk in chunks:
+        analysis.update(chunk)
+    return analysis.result()
+
+
+def _parse_thresholds(values: Optional[List[str]]) -> Union[None, float, Dict[str, float]]:
+    if not values:
+        return None
+    if len(values) == 1 and "=" not in values[0]:
+        return float(values[0])
+    thresholds = {}
+    for value in values:
+        name, _, threshold = value.partition("=")
+        if not threshold:
+            raise ValueError(f"Expected metric=threshold, got {value!r}")
+        thresholds[name] = float(threshold)
+    return thresholds
+
+
+def main():
+    from eval import DataHandler
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="per-row score table (CSV, JSONL or Parquet)")
+    parser.add_argument("--metrics", nargs="+", help="score columns; default: the known metric columns present")
+    parser.add_argument("--by", nargs="+", help="metadata columns to break the scores down by")
+    parser.add_argument("--thresholds", nargs="+", help="one threshold, or metric=threshold pairs")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--resamples", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=262144)
+    args = parser.parse_args()
+
+    batches = DataHandler(args.path, stream=True).iter_batches(args.batch_size)
+    first = next(batches, None)
+    if first is None:
+        print("No rows.")
+        return
+    metrics = args.metrics or [name for name in ("faithfulness", "context_recall", "context_precision",
+                                                 "answer_relevancy", "hallucination") if name in first]
+    analysis = ScoreAnalysis(metrics, args.by, _parse_thresholds(args.thresholds), args.confidence, args.resamples)
+    analysis.update(first)
+    for batch in batches:
+        analysis.update(batch)
+    print(analysis.result().to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import json
+from typing import List, Dict, Any, Optional
+
+from instrumentation import TokenUsage, estimate_cost
+from scheduler import estimate_tokens
+
+# Rubric and row fields for each common metric name, mirroring what the framework metrics judge. The rubric's
+# single score is not the framework's algorithm, so evaluators report it as <metric>_batched
+BATCH_RUBRICS = {
+    "faithfulness": (
+        "the fraction of the claims made in the answer that can be inferred from the contexts",
+        ("answer", "contexts"),
+    ),
+    "answer_relevancy": (
+        "how directly and completely the answer addresses the question, without redundant or "
+        "noncommittal content",
+        ("question", "answer"),
+    ),
+    "context_recall": (
+        "the fraction of the statements in the ground truth that can be attributed to the contexts",
+        ("ground_truth", "contexts"),
+    ),
+    "context_precision": (
+        "the rank-weighted fraction of the contexts that are useful for arriving at the ground truth "
+        "answer to the question, rewarding useful contexts ranked first",
+        ("question", "ground_truth", "contexts"),
+    ),
+}
+
+SYSTEM_PROMPT = (
+    "You are an evaluation judge. You score several independent rows at once. "
+    "Judge every row on its own, never comparing rows with each other."
+)
+
+
+class MalformedBatchError(ValueError):
+    """Raised when a batched judge reply cannot be mapped back to one score per row."""
+
+
+class BatchJudge:
+    """Scores K rows per judge request for one metric, with K adapted to the model's context budget."""
+
+    def __init__(self, model: str = "gpt-4", context_tokens: int = 8192, max_batch: int = 16,
+                 completion_tokens_per_row: int = 16, concurrency: int = 8, client: Any = None) -> None:
+        self.model = model
+        self.context_tokens = context_tokens
+        self.max_batch = max_batch
+        self.completion_tokens_per_row = completion_tokens_per_row
+        self.concurrency = concurrency
+        self._client = client
+        self.requests = 0
+        self.fallbacks = 0
+
+    @property
+    def client(self) -> Any:
+        # Created on first use so the module imports without openai installed; requests go through
+        # the registry's pooled connections, which work from whichever event loop is running
+        if self._client is None:
+            from openai import AsyncOpenAI
+            from client_registry import get_registry
+            self._client = AsyncOpenAI(http_client=get_registry().async_http_client())
+        return self._client
+
+    def supports(self, metric_name: str) -> bool:
+        return metric_name in BATCH_RUBRICS
+
+    def _row_payload(self, row: Dict[str, Any], index: int, metric_name: str) -> Dict[str, Any]:
+        payload = {"id": index}
+        for field in BATCH_RUBRICS[metric_name][1]:
+            payload[field] = row.get(field)
+        return payload
+
+    def build_messages(self, rows: List[Dict[str, Any]], indices: List[int], metric_name: str) -> List[Dict[str, str]]:
+        rubric = BATCH_RUBRICS[metric_name][0]
+        items = json.dumps([self._row_payload(rows[i], i, metric_name) for i in indices], ensure_ascii=False)
+        prompt = (
+            f"For each row below, score {rubric}, as a number between 0 and 1.\n"
+            f'Return only a JSON object of the form {{"scores": [{{"id": <row id>, "score": <number>}}, ...]}} '
+            f"with exactly one entry for each of the {len(indices)} row ids.\n\n"
+            f"Rows:\n{items}"
+        )
+        return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+
+    def pack(self, rows: List[Dict[str, Any]], indices: List[int], metric_name: str,
+             max_batch: Optional[int] = None) -> List[List[int]]:
+        """Split rows into batches that fit the context budget; long rows end up in smaller batches."""
+        max_batch = max_batch or self.max_batch
+        overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(BATCH_RUBRICS[metric_name][0]) + 80
+        budget = self.context_tokens - overhead
+        batches, current, used = [], [], 0
+        for i in indices:
+            cost = estimate_tokens(json.dumps(self._row_payload(rows[i], i, metric_name), ensure_ascii=False))
+            cost += self.completion_tokens_per_row
+            if current and (used + cost > budget or len(current) >= max_batch):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def malformed(self) -> None:
+        """Count a reply that could not be parsed; the run re-packs its rows into smaller batches."""
+        self.fallbacks += 1
+
+    def parse(self, content: str, indices: List[int]) -> Dict[int, float]:
+        """Map a reply back to {row index: score}; any missing, extra or invalid entry fails the batch."""
+        try:
+            entries = json.loads(content)["scores"]
+            scores = {int(entry["id"]): float(entry["score"]) for entry in entries}
+        except (ValueError, KeyError, TypeError) as error:
+            raise MalformedBatchError(f"Unparseable batched judge reply: {error}") from error
+        if set(scores) != set(indices):
+            raise MalformedBatchError(f"Batched judge reply covers rows {sorted(scores)}, expected {sorted(indices)}")
+        if any(not 0.0 <= score <= 1.0 for score in scores.values()):
+            raise MalformedBatchError("Batched judge reply has scores outside [0, 1]")
+        return scores
+
+    async def score_batch(self, rows: List[Dict[str, Any]], indices: List[int], metric_name: str) -> tuple:
+        """Return ({row index: score}, TokenUsage) for one batched request."""
+        self.requests += 1
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self.build_messages(rows, indices, metric_name),
+            temperature=0,
+            max_tokens=self.completion_tokens_per_row * len(indices) + 32,
+        )
+        usage = TokenUsage()
+        if response.usage is not None:
+            usage.prompt_tokens = response.usage.prompt_tokens
+            usage.completion_tokens = response.usage.completion_tokens
+            usage.cost = estimate_cost(self.model, usage.prompt_tokens, usage.completion_tokens)
+        usage.requests = 1
+        return self.parse(response.choices[0].message.content or "", indices), usage
+
+    def config(self) -> Dict[str, Any]:
+        """Fields that change batched scores, folded into the score cache key."""
+        return {"judge": "batched", "judge_model": self.model}
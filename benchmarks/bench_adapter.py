@@ -0,0 +1,102 @@
+"""Compare the Arrow-backed DatasetAdapter against the previous tolist()/CSV re-parse path,
+and the memory used with and without the deduplicating context store on overlapping contexts.
+
+Run from the repository root:
+    python benchmarks/bench_adapter.py --rows 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pyarrow as pa
+from datasets import Dataset
+from deepeval.dataset import EvaluationDataset
+
+from context_store import ContextStore
+from eval import DataHandler, DatasetAdapter
+from synthetic import synthetic_frame
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    python_retained, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow_bytes = pa.total_allocated_bytes() - arrow_before
+    print(f"{label:<45} {elapsed:8.2f}s  python peak {python_peak / 2**20:8.1f} MiB  "
+          f"retained {python_retained / 2**20:8.1f} MiB  arrow {arrow_bytes / 2**20:8.1f} MiB")
+    return result
+
+
+def ragas_tolist(frame):
+    return Dataset.from_dict({
+        "question": frame["question"].values.tolist(),
+        "answer": frame["answer"].values.tolist(),
+        "contexts": frame["contexts"].values.tolist(),
+        "ground_truth": frame["ground_truth"].values.tolist(),
+    })
+
+
+def deepeval_csv_reparse(csv_path):
+    # Previous behaviour: DataHandler parsed the file, then DeepEval parsed it again
+    DataHandler(csv_path)
+    dataset = EvaluationDataset()
+    dataset.add_test_cases_from_csv_file(
+        file_path=csv_path,
+        input_col_name="query",
+        actual_output_col_name="actual_output",
+        expected_output_col_name="expected_output",
+        retrieval_context_col_name="retrieval_context",
+        retrieval_context_col_delimiter="|",
+    )
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--context-pool", type=int, default=2000, help="shared passages for the overlap run")
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    adapter = DatasetAdapter()
+    print(f"RAGAs conversion of {args.rows} in-memory rows")
+    measure("tolist() + Dataset.from_dict", lambda: ragas_tolist(frame))
+    measure("Arrow table -> Dataset", lambda: adapter.adapt_dataset(frame, None, "RAGAs"))
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    measure("Arrow table (already loaded) -> Dataset", lambda: adapter.adapt_dataset(table, None, "RAGAs"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench.csv")
+        deepeval_frame = pd.DataFrame({
+            "query": frame["question"],
+            "actual_output": frame["answer"],
+            "expected_output": frame["ground_truth"],
+            "retrieval_context": ["|".join(c) for c in frame["contexts"]],
+        })
+        deepeval_frame.to_csv(csv_path, index=False)
+        print(f"\nDeepEval test cases from a {os.path.getsize(csv_path) / 2**20:.1f} MiB CSV")
+        measure("DataHandler + add_test_cases_from_csv_file", lambda: deepeval_csv_reparse(csv_path))
+        measure("single parse + in-memory test cases", lambda: adapter.adapt_dataset(None, csv_path, "DeepEval"))
+
+    overlapping = synthetic_frame(args.rows, context_pool=args.context_pool)
+    print(f"\nOverlapping contexts: {args.rows} rows drawing from {args.context_pool} shared passages")
+    for framework in ("RAGAs", "DeepEval"):
+        measure(f"{framework} without context store", lambda: adapter.adapt_dataset(overlapping, None, framework))
+        store = ContextStore()
+        measure(f"{framework} with context store",
+                lambda: DatasetAdapter(store).adapt_dataset(overlapping, None, framework))
+        print(f"  {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Grouped aggregates, pass rates and bootstrap intervals over a large per-row score table.
+
+Compares analysis.analyze() with the per-group pandas loop it replaces. The loop uses
+sampling.bootstrap_interval, which draws a resamples x rows index matrix per group.
+Run from the repository root:
+    python benchmarks/bench_analysis.py --rows 1000000 --groups 20
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["faithfulness", "context_recall", "context_precision", "answer_relevancy"]
+
+
+def score_table(rows, groups, seed=0):
+    """Per-row scores with a slice column, some unscored rows and a few distinct values per metric."""
+    rng = np.random.default_rng(seed)
+    table = {"category": rng.integers(0, groups, rows).astype(str), "language": rng.choice(["en", "de", "fr"], rows)}
+    for metric in METRICS:
+        scores = np.round(rng.beta(4, 2, rows), 3)
+        scores[rng.random(rows) < 0.02] = np.nan
+        table[metric] = scores
+    return pd.DataFrame(table)
+
+
+def pandas_loop(frame, by, thresholds, resamples):
+    """The ad-hoc loop: one groupby per metric plus a bootstrap per group."""
+    from sampling import bootstrap_interval
+    report = []
+    for metric in METRICS:
+        for key, group in frame.groupby(by):
+            values = group[metric].dropna().to_numpy()
+            low, high = bootstrap_interval(values, resamples=resamples)
+            report.append({"group": key, "metric": metric, "mean": values.mean(), "ci_low": low, "ci_high": high,
+                           "pass_rate": (values >= thresholds.get(metric, 0.5)).mean()})
+    return pd.DataFrame(report)
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return output, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--resamples", type=int, default=1000)
+    parser.add_argument("--loop-rows", type=int,
+                        help="rows for the pandas loop (default: all), whose bootstrap needs resamples x rows memory")
+    args = parser.parse_args()
+
+    from analysis import analyze
+
+    thresholds = {"faithfulness": 0.7, "context_recall": 0.7, "context_precision": 0.7, "answer_relevancy": 0.5}
+    frame = score_table(args.rows, args.groups)
+    print(f"{args.rows} rows, {args.groups} categories x 3 languages, {len(METRICS)} metrics, "
+          f"{args.resamples} resamples")
+    summary, seconds, peak = measure(lambda: analyze(frame, METRICS, ["category", "language"], thresholds,
+                                                     resamples=args.resamples))
+    print(f"analyze()      {args.rows:>9} rows {seconds:>7.2f}s  peak {peak:>8.1f} MiB  {len(summary)} group/metric rows")
+    sample = frame.head(args.loop_rows or args.rows)
+    _, seconds, peak = measure(lambda: pandas_loop(sample, ["category", "language"], thresholds, args.resamples))
+    print(f"pandas loop    {len(sample):>9} rows {seconds:>7.2f}s  peak {peak:>8.1f} MiB")
+    print(f"max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Batched versus per-row judging on the bundled amnesty_qa_sample.csv, against the offline stub judge.
+
+Reports judge requests, wall time and time per row for each framework, with and without the batch judge.
+Run from the repository root:
+    python benchmarks/bench_batched.py --latency-ms 300 --max-batch 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_judge_server import StubConfig, start_stub_server
+
+METRICS = ["faithfulness", "context_recall", "context_precision", "answer_relevancy"]
+
+
+def run_case(framework, frame, metrics, config, batched, args):
+    from batch_judge import BatchJudge
+    from eval import FrameworkFactory
+    from scheduler import JudgeScheduler, RateLimits
+
+    evaluator = FrameworkFactory.get_evaluator(framework)
+    evaluator.load_frame(frame)
+    evaluator.set_metrics(metrics)
+    evaluator.set_scheduler(JudgeScheduler(RateLimits(concurrency=args.concurrency)))
+    judge = None
+    if batched:
+        judge = BatchJudge(context_tokens=args.context_tokens, max_batch=args.max_batch)
+        evaluator.set_batch_judge(judge)
+    requests_before = config.requests
+    start = time.perf_counter()
+    evaluator.evaluate()
+    elapsed = time.perf_counter() - start
+    requests = config.requests - requests_before
+    fallbacks = judge.fallbacks if judge is not None else 0
+    print(f"{framework:<10} {'batched' if batched else 'per-row':<8} {requests:>9} {elapsed:>9.2f} "
+          f"{elapsed / len(frame) * 1000:>11.1f} {fallbacks:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="deep_eval_data/amnesty_qa_sample.csv")
+    parser.add_argument("--frameworks", nargs="+", default=["DeepEval", "RAGAs"])
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--context-tokens", type=int, default=8192)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, "lognormal")
+    server = start_stub_server(0, config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+                      DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+
+    from eval import DataHandler
+
+    frame = DataHandler(args.data).get_data()
+    print(f"{len(frame)} rows, metrics {', '.join(args.metrics)}, stub latency {args.latency_ms:.0f} ms")
+    print(f"{'framework':<10} {'mode':<8} {'requests':>9} {'seconds':>9} {'ms per row':>11} {'fallbacks':>10}")
+    for framework in args.frameworks:
+        for batched in (False, True):
+            run_case(framework, frame, args.metrics, config, batched, args)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Judge calls saved by the cascade tier, and its agreement with a full-judge run.
+
+Without --judge-results only the escalation rate is reported (no judge is called).
+With the per-row output of a run without the cascade (CSV/JSONL/Parquet with the metric
+columns), the pass/fail agreement and error on locally resolved rows are reported too.
+
+Run from the repository root:
+    python benchmarks/bench_cascade.py --data deep_eval_data/amnesty_qa_sample.csv
+    python benchmarks/bench_cascade.py --judge-results results/ragas_full.csv --threshold 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascade import Cascade, agreement_report
+from eval import DataHandler
+from synthetic import synthetic_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="deep_eval_data/amnesty_qa_sample.csv")
+    parser.add_argument("--judge-results", help="per-row scores from a full-judge run")
+    parser.add_argument("--synthetic-rows", type=int, default=100000, help="rows for the timing run")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    args = parser.parse_args()
+
+    cascade = Cascade()
+    if args.judge_results:
+        handler = DataHandler(args.judge_results)
+        print(agreement_report(handler.get_data(), cascade, args.threshold).to_string(index=False))
+    else:
+        handler = DataHandler(args.data)
+        rows = handler.get_data().to_dict("records")
+        cheap = cascade.score(rows)
+        for name in cascade.bands:
+            cascade.route(name, cheap, range(len(rows)))
+        print(f"{len(rows)} rows from {args.data}")
+        cascade.print_summary()
+        total = sum(s["resolved"] + s["escalated"] for s in cascade.stats.values())
+        escalated = sum(s["escalated"] for s in cascade.stats.values())
+        print(f"Judge calls: {escalated} of {total} ({1 - escalated / total:.0%} saved)")
+
+    rows = synthetic_frame(args.synthetic_rows).to_dict("records")
+    start = time.perf_counter()
+    cascade.score(rows)
+    elapsed = time.perf_counter() - start
+    print(f"Cheap tier on {len(rows)} synthetic rows: {elapsed:.2f}s ({len(rows) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Judge connections and per-row latency with the pooled client registry, over repeated evaluate() calls.
+
+The stub judge charges --connect-ms for every new connection, standing in for TCP and TLS setup.
+Short rows make client setup and handshakes a large share of each judge call.
+Run from the repository root:
+    python benchmarks/bench_client_pool.py --rows 40 --repeats 3 --connect-ms 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_judge_server import StubConfig, start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--framework", default="DeepEval")
+    parser.add_argument("--metrics", nargs="+", default=["faithfulness", "answer_relevancy"])
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--connect-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, "fixed", connect_ms=args.connect_ms)
+    server = start_stub_server(0, config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+                      DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+
+    import pandas as pd
+    from client_registry import get_registry
+    from eval import FrameworkFactory
+    from scheduler import JudgeScheduler, RateLimits
+
+    frame = pd.DataFrame({
+        "question": [f"What is fact {i}?" for i in range(args.rows)],
+        "answer": [f"Fact {i} is short." for i in range(args.rows)],
+        "contexts": [[f"Fact {i} is short and true."] for i in range(args.rows)],
+        "ground_truth": [f"Fact {i} is short." for i in range(args.rows)],
+    })
+    print(f"{args.rows} rows, stub latency {args.latency_ms:.0f} ms, connection setup {args.connect_ms:.0f} ms")
+    print(f"{'run':>4} {'requests':>9} {'connections':>12} {'seconds':>8} {'ms per row':>11}")
+    for run in range(args.repeats):
+        # A fresh evaluator per run, like a UI rerun; the registry outlives it
+        evaluator = FrameworkFactory.get_evaluator(args.framework)
+        evaluator.load_frame(frame)
+        evaluator.set_metrics(args.metrics)
+        evaluator.set_scheduler(JudgeScheduler(RateLimits(concurrency=args.concurrency)))
+        requests, connections = config.requests, config.connections
+        start = time.perf_counter()
+        evaluator.evaluate()
+        elapsed = time.perf_counter() - start
+        print(f"{run:>4} {config.requests - requests:>9} {config.connections - connections:>12} "
+              f"{elapsed:>8.2f} {elapsed / args.rows * 1000:>11.1f}")
+    print(f"Registry: {get_registry().stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Import-time and memory cost of eval.py with lazy framework imports.
+
+Each scenario runs in a fresh interpreter. The "eager" scenario imports the framework
+packages up front, as eval.py used to at module level.
+Run from the repository root:
+    python benchmarks/bench_import_time.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("pandas", "pyarrow", "datasets", "ragas", "deepeval") if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "loaded": heavy}}))
+"""
+
+SCENARIOS = {
+    "eager (previous eval.py)": (
+        "import pandas, datasets, ragas, ragas.metrics, deepeval, deepeval.metrics, deepeval.dataset\n"
+        "import eval"
+    ),
+    "import eval": "import eval",
+    "get_evaluator('RAGAs') + set_metrics": (
+        "import eval\n"
+        "eval.FrameworkFactory.get_evaluator('RAGAs').set_metrics(['faithfulness'])"
+    ),
+    "get_evaluator('DeepEval') + set_metrics": (
+        "import eval\n"
+        "eval.FrameworkFactory.get_evaluator('DeepEval').set_metrics(['faithfulness'])"
+    ),
+}
+
+
+def run(code):
+    env = dict(os.environ, DEEPEVAL_TELEMETRY_OPT_OUT="YES", OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "stub"))
+    completed = subprocess.run([sys.executable, "-c", PROBE.format(code=code)], cwd=ROOT, env=env,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip()[-500:])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'scenario':<42} {'median s':>9} {'RSS MiB':>9}  modules loaded")
+    for name, code in SCENARIOS.items():
+        samples = [run(code) for _ in range(args.repeat)]
+        seconds = statistics.median(s["seconds"] for s in samples)
+        rss = statistics.median(s["rss_mib"] for s in samples)
+        print(f"{name:<42} {seconds:>9.3f} {rss:>9.1f}  {', '.join(samples[-1]['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Two frameworks run one after the other versus concurrently through MultiFrameworkEvaluator.
+
+Both modes use the same total judge concurrency against the offline stub judge; the concurrent run
+should take about as long as the slower framework rather than the sum of both.
+Run from the repository root:
+    python benchmarks/bench_multi_framework.py --latency-ms 300 --concurrency 16
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_judge_server import StubConfig, start_stub_server
+
+METRICS = ["faithfulness", "context_recall", "context_precision", "answer_relevancy"]
+
+
+def run_sequential(frame, args):
+    from eval import FrameworkFactory
+    from scheduler import JudgeScheduler, RateLimits
+
+    timings = {}
+    for framework in args.frameworks:
+        evaluator = FrameworkFactory.get_evaluator(framework)
+        evaluator.load_frame(frame)
+        evaluator.set_metrics(args.metrics)
+        evaluator.set_scheduler(JudgeScheduler(RateLimits(concurrency=args.concurrency)))
+        start = time.perf_counter()
+        evaluator.evaluate()
+        timings[framework] = time.perf_counter() - start
+    return timings
+
+
+def run_concurrent(frame, args):
+    from multi_framework import MultiFrameworkEvaluator
+    from scheduler import JudgeScheduler, RateLimits
+
+    evaluator = MultiFrameworkEvaluator(args.frameworks, JudgeScheduler(RateLimits(concurrency=args.concurrency)))
+    evaluator.load_frame(frame)
+    evaluator.set_metrics(args.metrics)
+    start = time.perf_counter()
+    evaluator.evaluate()
+    elapsed = time.perf_counter() - start
+    print(evaluator.summary().to_string(index=False))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="deep_eval_data/amnesty_qa_sample.csv")
+    parser.add_argument("--frameworks", nargs="+", default=["RAGAs", "DeepEval"])
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, "lognormal")
+    server = start_stub_server(0, config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+                      DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+
+    from eval import DataHandler
+
+    frame = DataHandler(args.data).get_data()
+    print(f"{len(frame)} rows, metrics {', '.join(args.metrics)}, stub latency {args.latency_ms:.0f} ms")
+    timings = run_sequential(frame, args)
+    concurrent = run_concurrent(frame, args)
+    for framework, seconds in timings.items():
+        print(f"{framework:<12} alone      {seconds:>8.2f}s")
+    print(f"{'sequential':<12} sum        {sum(timings.values()):>8.2f}s")
+    print(f"{'concurrent':<12} composite  {concurrent:>8.2f}s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Wall-clock time with and without per-call deadlines and hedging, against a stub judge with a heavy tail.
+
+A small fraction of stub requests hang for --stall-ms and some fail outright. Without deadlines, the
+slowest call sets the run's wall-clock time. Deadlines with retries bound it, and hedging the slowest
+calls cuts the remaining tail. Rows that still fail are reported as unscored instead of failing the run.
+Run from the repository root:
+    python benchmarks/bench_tail_latency.py --rows 60 --stall-rate 0.02 --stall-ms 20000 --error-rate 0.02
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_judge_server import StubConfig, start_stub_server
+
+MODES = {
+    "no deadline": {"retries": 0},
+    "deadline": {"timeout": 3.0, "retries": 2, "base_backoff": 0.2},
+    "deadline+hedge": {"timeout": 3.0, "retries": 2, "base_backoff": 0.2, "hedge_percentile": 90},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--framework", default="DeepEval")
+    parser.add_argument("--metrics", nargs="+", default=["faithfulness", "context_recall"])
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--stall-rate", type=float, default=0.02)
+    parser.add_argument("--stall-ms", type=float, default=20000.0)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, "lognormal", error_rate=args.error_rate, stall_rate=args.stall_rate,
+                        stall_ms=args.stall_ms)
+    server = start_stub_server(0, config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+                      DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+
+    import pandas as pd
+    from eval import FrameworkFactory
+    from scheduler import JudgeScheduler, RateLimits
+    from synthetic import synthetic_frame
+
+    frame = synthetic_frame(args.rows, context_words=30)
+    print(f"{args.rows} rows, stub median {args.latency_ms:.0f} ms, {args.stall_rate:.0%} of requests hang "
+          f"{args.stall_ms / 1000:.0f}s, {args.error_rate:.0%} fail")
+    report = []
+    for mode, options in MODES.items():
+        evaluator = FrameworkFactory.get_evaluator(args.framework)
+        evaluator.load_frame(frame)
+        evaluator.set_metrics(args.metrics)
+        scheduler = JudgeScheduler(RateLimits(concurrency=args.concurrency), **options)
+        evaluator.set_scheduler(scheduler)
+        start = time.perf_counter()
+        result = evaluator.evaluate()
+        stats = scheduler.stats()
+        report.append({
+            "mode": mode,
+            "seconds": time.perf_counter() - start,
+            "p50_unit_s": stats["p50_s"],
+            "p99_unit_s": stats["p99_s"],
+            "timeouts": stats["timeouts"],
+            "hedges": stats["hedges"],
+            "hedge_wins": stats["hedge_wins"],
+            "unscored": len(result.unscored),
+            "min_coverage": min(result.coverage.values()),
+        })
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:.2f}"))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Memory held by an evaluator's rows: pandas object columns + Python lists + per-row test cases, against the
+compact TestCaseStore, on a synthetic dataset written to Parquet.
+
+Each path runs in a fresh process and reports its peak and retained resident memory above the interpreter
+baseline, plus the time to load and to iterate every row as a DeepEval test case.
+Run from the repository root:
+    python benchmarks/bench_testcase_store.py --rows 1000000
+    python benchmarks/bench_testcase_store.py --rows 1000000 --paths store-frame store-parquet
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATHS = {
+    "lists": "DataFrame + Python lists + LLMTestCase per row (previous DeepEval path)",
+    "store-frame": "DataFrame -> TestCaseStore",
+    "store-parquet": "Parquet -> TestCaseStore (no DataFrame)",
+}
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def write_dataset(path, rows, context_words, context_pool, chunk_rows=100000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from synthetic import synthetic_frame
+    writer = None
+    for chunk, start in enumerate(range(0, rows, chunk_rows)):
+        frame = synthetic_frame(min(chunk_rows, rows - start), context_words=context_words, seed=chunk,
+                                context_pool=context_pool)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        writer = writer or pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+
+def previous_rows(frame):
+    # What DeepEval's load_frame() held before: the context store's chunks, the Arrow copy's columns as
+    # Python lists, one LLMTestCase per row and the normalized row dicts from get_rows()
+    from deepeval.test_case import LLMTestCase
+    from context_store import ContextStore
+    from eval import DatasetAdapter
+    from score_cache import normalize_row
+    store = ContextStore()
+    table = DatasetAdapter.to_arrow(frame, store)
+    columns = {name: table.column(name).to_pylist() for name in table.column_names if name != "contexts"}
+    columns["contexts"] = store.decode(table.column("contexts"))
+    test_cases = [
+        LLMTestCase(input=q, actual_output=a, expected_output=g, retrieval_context=c or None)
+        for q, a, c, g in zip(columns["question"], columns["answer"], columns["contexts"], columns["ground_truth"])
+    ]
+    del table, columns
+    rows = [normalize_row({"question": t.input, "answer": t.actual_output, "contexts": t.retrieval_context,
+                           "ground_truth": t.expected_output}) for t in test_cases]
+    return rows, test_cases, store
+
+
+def worker(kind, path):
+    import pandas as pd
+    # Imported up front so the library itself counts towards the baseline, not towards the rows
+    importlib.import_module("deepeval.test_case")
+    from context_store import ContextStore
+    from eval import DatasetAdapter
+    gc.collect()
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    if kind == "lists":
+        frame = pd.read_parquet(path)
+        rows, test_cases, _ = previous_rows(frame)
+        iterate = lambda: sum(1 for _ in test_cases)
+    elif kind == "store-frame":
+        frame = pd.read_parquet(path)
+        rows = DatasetAdapter(ContextStore()).to_store(frame)
+        iterate = lambda: sum(1 for _ in rows.iter_test_cases())
+    else:
+        rows = DatasetAdapter(ContextStore()).to_store(None, path)
+        iterate = lambda: sum(1 for _ in rows.iter_test_cases())
+    load_seconds = time.perf_counter() - start
+    gc.collect()
+    retained = rss_bytes() - baseline
+    start = time.perf_counter()
+    count = iterate()
+    iterate_seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - baseline
+    print(json.dumps({"path": kind, "rows": count, "load_s": load_seconds, "iterate_s": iterate_seconds,
+                      "retained_mib": retained / 2**20, "peak_mib": peak / 2**20,
+                      "retained_bytes_per_row": retained / max(count, 1),
+                      "store_mib": rows.nbytes / 2**20 if hasattr(rows, "nbytes") else None}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--context-words", type=int, default=20)
+    parser.add_argument("--context-pool", type=int, default=None, help="draw contexts from this many shared passages")
+    parser.add_argument("--paths", nargs="+", choices=list(PATHS), default=list(PATHS))
+    parser.add_argument("--worker", nargs=2, metavar=("PATH_KIND", "PARQUET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    import pandas as pd
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rows.parquet")
+        start = time.perf_counter()
+        write_dataset(path, args.rows, args.context_words, args.context_pool)
+        print(f"Wrote {args.rows} synthetic rows ({os.path.getsize(path) / 2**20:.0f} MiB Parquet) "
+              f"in {time.perf_counter() - start:.0f}s")
+        report = []
+        for kind in args.paths:
+            print(f"Measuring {PATHS[kind]}...")
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", kind, path],
+                                    capture_output=True, text=True)
+            lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+            if output.returncode != 0 or not lines:
+                print(f"  failed (exit {output.returncode}): {output.stderr.strip().splitlines()[-1:] or ''}")
+                continue
+            report.append(json.loads(lines[-1]))
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
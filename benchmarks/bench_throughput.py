@@ -0,0 +1,101 @@
+"""Throughput baseline for FrameworkFactory evaluators against the offline stub judge.
+
+Each (framework, metric, size) case runs in a fresh subprocess so peak RSS is per case.
+Run from the repository root:
+    python benchmarks/bench_throughput.py --sizes 100 1000 10000 100000 --latency-ms 50 --concurrency 64
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+METRICS = ["faithfulness", "context_recall", "context_precision", "answer_relevancy"]
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+def run_case(framework, metric, rows, concurrency):
+    """Evaluate one case in this process and return its measurements."""
+    from eval import FrameworkFactory
+    from scheduler import JudgeScheduler, RateLimits
+    from synthetic import synthetic_frame
+
+    frame = synthetic_frame(rows)
+    evaluator = FrameworkFactory.get_evaluator(framework)
+    evaluator.load_frame(frame)
+    evaluator.set_metrics([metric])
+    scheduler = JudgeScheduler(RateLimits(concurrency=concurrency))
+    evaluator.set_scheduler(scheduler)
+    start = time.perf_counter()
+    evaluator.evaluate()
+    elapsed = time.perf_counter() - start
+    return {
+        "framework": framework,
+        "metric": metric,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("inf"),
+        "p50_row_latency_ms": percentile(scheduler.latencies, 50) * 1000,
+        "p99_row_latency_ms": percentile(scheduler.latencies, 99) * 1000,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frameworks", nargs="+", default=["RAGAs", "DeepEval"])
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-dist", choices=["fixed", "exponential", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", default="bench_throughput.jsonl")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        result = run_case(args.frameworks[0], args.metrics[0], args.sizes[0], args.concurrency)
+        print("RESULT " + json.dumps(result))
+        return
+
+    from stub_judge_server import StubConfig, start_stub_server
+
+    server = start_stub_server(0, StubConfig(args.latency_ms, args.latency_dist, args.error_rate))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    env = dict(os.environ, OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+               DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+    print(f"{'framework':<10} {'metric':<18} {'rows':>7} {'rows/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'RSS MiB':>9}")
+    with open(args.output, "w", encoding="utf-8") as out:
+        for framework in args.frameworks:
+            for metric in args.metrics:
+                for rows in args.sizes:
+                    command = [sys.executable, os.path.abspath(__file__), "--single", "--frameworks", framework,
+                               "--metrics", metric, "--sizes", str(rows), "--concurrency", str(args.concurrency)]
+                    completed = subprocess.run(command, env=env, capture_output=True, text=True, cwd=ROOT)
+                    lines = [l for l in completed.stdout.splitlines() if l.startswith("RESULT ")]
+                    if completed.returncode != 0 or not lines:
+                        print(f"{framework:<10} {metric:<18} {rows:>7} failed: {completed.stderr.strip()[-200:]}")
+                        continue
+                    result = json.loads(lines[-1][len("RESULT "):])
+                    out.write(json.dumps(result) + "\n")
+                    print(f"{framework:<10} {metric:<18} {rows:>7} {result['rows_per_sec']:>9.1f} "
+                          f"{result['p50_row_latency_ms']:>9.1f} {result['p99_row_latency_ms']:>9.1f} "
+                          f"{result['peak_rss_mib']:>9.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Synthetic evaluation datasets shared by the benchmark scripts."""
+import random
+
+import pandas as pd
+
+WORDS = ("policy court ruling access health rights state women global impact report evidence "
+         "government law region data study reform public support risk care").split()
+
+
+def synthetic_frame(rows, contexts_per_row=3, context_words=100, seed=0, context_pool=None):
+    """RAGAs-schema DataFrame with list-valued contexts; the same seed gives the same rows.
+
+    With context_pool, contexts are drawn from that many shared passages, like overlapping retrieval sets.
+    """
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    if context_pool:
+        pool = [sentence(context_words) for _ in range(context_pool)]
+        contexts = [rng.sample(pool, contexts_per_row) for _ in range(rows)]
+    else:
+        contexts = [[sentence(context_words) for _ in range(contexts_per_row)] for _ in range(rows)]
+    return pd.DataFrame({
+        "question": [f"{sentence(8)[:-1]}? ({i})" for i in range(rows)],
+        "answer": [sentence(30) for _ in range(rows)],
+        "contexts": contexts,
+        "ground_truth": [sentence(25) for _ in range(rows)],
+    })
@@ -0,0 +1,186 @@
+import re
+import zlib
+from typing import List, Dict, Any, Optional, Set
+
+import numpy as np
+
+from score_cache import normalize_row
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Function words carry no evidence of overlap and would inflate every lexical score
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can did do does for from had has have how in is it its of on or "
+    "that the their there these they this to was were what when where which who why will with would".split()
+)
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """Distinct lowercased alphanumeric tokens without stopwords."""
+    if not text:
+        return set()
+    return set(_TOKEN_PATTERN.findall(text.lower())) - STOPWORDS
+
+
+def hashed_presence(token_sets: List[Set[str]], buckets: int, bucket_of: Dict[str, int]) -> np.ndarray:
+    """Boolean (rows, buckets) matrix marking which hashed tokens occur in each row."""
+    row_ids, columns = [], []
+    for row, tokens in enumerate(token_sets):
+        for token in tokens:
+            bucket = bucket_of.get(token)
+            if bucket is None:
+                # crc32 rather than hash() so cheap scores are identical across processes and runs
+                bucket = bucket_of[token] = zlib.crc32(token.encode("utf-8")) % buckets
+            columns.append(bucket)
+        row_ids.extend([row] * len(tokens))
+    presence = np.zeros((len(token_sets), buckets), dtype=bool)
+    presence[np.asarray(row_ids, dtype=np.int64), np.asarray(columns, dtype=np.int64)] = True
+    return presence
+
+
+def coverage(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Share of each row's source tokens found in its target tokens; NaN when the source is empty."""
+    counts = source.sum(axis=1)
+    shared = (source & target).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, shared / counts, np.nan)
+
+
+def token_f1(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Token-set F1 between two texts per row; NaN when either side is empty."""
+    left_counts = left.sum(axis=1)
+    right_counts = right.sum(axis=1)
+    shared = (left & right).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((left_counts > 0) & (right_counts > 0), 2 * shared / (left_counts + right_counts), np.nan)
+
+
+def cheap_scores(rows: List[Dict[str, Any]], buckets: int = 4096, chunk_size: int = 2048) -> Dict[str, np.ndarray]:
+    """Local lexical metrics for every row, computed in vectorized chunks of the batch."""
+    names = ["context_token_recall", "answer_context_support", "question_answer_overlap",
+             "answer_similarity", "context_tokens"]
+    results = {name: np.full(len(rows), np.nan) for name in names}
+    # Token buckets are memoized for the batch; the vocabulary repeats heavily across rows
+    bucket_of = {}
+    # Chunks bound the presence matrices to chunk_size * buckets bytes each
+    for start in range(0, len(rows), chunk_size):
+        chunk = [normalize_row(row) for row in rows[start:start + chunk_size]]
+        end = start + len(chunk)
+        question_tokens = [tokenize(row["question"]) for row in chunk]
+        answer_tokens = [tokenize(row["answer"]) for row in chunk]
+        truth_tokens = [tokenize(row["ground_truth"]) for row in chunk]
+        context_tokens = [tokenize(" ".join(row["contexts"])) for row in chunk]
+        question = hashed_presence(question_tokens, buckets, bucket_of)
+        answer = hashed_presence(answer_tokens, buckets, bucket_of)
+        truth = hashed_presence(truth_tokens, buckets, bucket_of)
+        contexts = hashed_presence(context_tokens, buckets, bucket_of)
+        results["context_token_recall"][start:end] = coverage(truth, contexts)
+        results["answer_context_support"][start:end] = coverage(answer, contexts)
+        results["question_answer_overlap"][start:end] = coverage(question, answer)
+        results["answer_similarity"][start:end] = token_f1(answer, truth)
+        results["context_tokens"][start:end] = [len(tokens) for tokens in context_tokens]
+    return results
+
+
+class CascadeBand:
+    """Uncertain band of a cheap score: rows scoring inside [low, high] are escalated to the judge."""
+
+    def __init__(self, cheap_metric: str, low: float, high: float, requires_context: bool = True) -> None:
+        if low > high:
+            raise ValueError(f"Cascade band low ({low}) must not exceed high ({high}).")
+        self.cheap_metric = cheap_metric
+        self.low = low
+        self.high = high
+        # Metrics judged against the contexts score 0 without calling the judge when there are none
+        self.requires_context = requires_context
+
+    def __repr__(self) -> str:
+        return f"CascadeBand({self.cheap_metric!r}, low={self.low}, high={self.high})"
+
+
+# Judge metric -> cheap proxy and band; lexical overlap is a weak signal for answer relevancy, so its band is wide
+DEFAULT_BANDS = {
+    "context_recall": CascadeBand("context_token_recall", 0.2, 0.8),
+    "context_precision": CascadeBand("context_token_recall", 0.1, 0.9),
+    "faithfulness": CascadeBand("answer_context_support", 0.25, 0.85),
+    "answer_relevancy": CascadeBand("question_answer_overlap", 0.05, 0.95, requires_context=False),
+}
+
+
+class Cascade:
+    """First evaluation tier: resolves rows with confident cheap scores and escalates the rest."""
+
+    def __init__(self, bands: Optional[Dict[str, CascadeBand]] = None, buckets: int = 4096) -> None:
+        self.bands = dict(DEFAULT_BANDS if bands is None else bands)
+        self.buckets = buckets
+        self.stats = {}
+
+    def score(self, rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        return cheap_scores(rows, self.buckets)
+
+    def route(self, metric_name: str, cheap: Dict[str, np.ndarray], indices: List[int]) -> tuple:
+        """Split indices into ({row: cheap score} resolved locally, [rows] escalated to the judge)."""
+        band = self.bands.get(metric_name)
+        if band is None:
+            return {}, list(indices)
+        indices = np.asarray(list(indices), dtype=np.int64)
+        values = cheap[band.cheap_metric][indices]
+        if band.requires_context:
+            values = np.where(cheap["context_tokens"][indices] == 0, 0.0, values)
+        uncertain = np.isnan(values) | ((values >= band.low) & (values <= band.high))
+        resolved = dict(zip(indices[~uncertain].tolist(), values[~uncertain].tolist()))
+        escalated = indices[uncertain].tolist()
+        stats = self.stats.setdefault(metric_name, {"resolved": 0, "escalated": 0})
+        stats["resolved"] += len(resolved)
+        stats["escalated"] += len(escalated)
+        return resolved, escalated
+
+    def print_summary(self) -> None:
+        for name, stats in self.stats.items():
+            total = stats["resolved"] + stats["escalated"]
+            share = stats["escalated"] / total if total else 0.0
+            print(f"Cascade {name}: {stats['resolved']} rows resolved locally, "
+                  f"{stats['escalated']} escalated to the judge ({share:.0%})")
+
+
+def agreement_report(results: Any, cascade: Optional[Cascade] = None, threshold: float = 0.5):
+    """Compare the cascade against a full-judge run.
+
+    results is the per-row table of a run without the cascade (EvaluationResult.to_pandas()).
+    Reports per metric the escalation rate, pass/fail agreement and mean absolute error on the
+    rows the cascade would have resolved locally, and the correlation of the cheap proxy overall.
+    """
+    import pandas as pd
+
+    cascade = cascade or Cascade()
+    rows = results.to_dict("records")
+    cheap = cascade.score(rows)
+    report = []
+    for name, band in cascade.bands.items():
+        if name not in results.columns:
+            continue
+        judge = pd.to_numeric(results[name], errors="coerce").to_numpy(dtype=float)
+        if f"{name}_source" in results.columns:
+            # Rows the run itself resolved locally hold cheap scores, not judge scores
+            judge[(results[f"{name}_source"] == "cascade").to_numpy()] = np.nan
+        # A fresh cascade keeps the report's routing counts out of the caller's run statistics
+        resolved, escalated = Cascade({name: band}, cascade.buckets).route(name, cheap, range(len(rows)))
+        local = np.array(list(resolved.keys()), dtype=np.int64)
+        local_scores = np.array(list(resolved.values()), dtype=float)
+        judged = ~np.isnan(judge[local]) if len(local) else np.zeros(0, dtype=bool)
+        local, local_scores = local[judged], local_scores[judged]
+        proxy = cheap[band.cheap_metric]
+        both = ~np.isnan(proxy) & ~np.isnan(judge)
+        report.append({
+            "metric": name,
+            "cheap_metric": band.cheap_metric,
+            "rows": len(rows),
+            "resolved": len(resolved),
+            "escalation_rate": len(escalated) / len(rows) if rows else float("nan"),
+            "pass_agreement": float(np.mean((local_scores >= threshold) == (judge[local] >= threshold)))
+            if len(local) else float("nan"),
+            "mae_resolved": float(np.mean(np.abs(local_scores - judge[local]))) if len(local) else float("nan"),
+            "proxy_correlation": float(np.corrcoef(proxy[both], judge[both])[0, 1])
+            if both.sum() > 1 else float("nan"),
+        })
+    return pd.DataFrame(report)
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from instrumentation import usage_forwarder
+
+DEFAULT_ENDPOINT = "https://api.openai.com/v1"
+
+
+def judge_endpoint() -> str:
+    """Base URL of the OpenAI-compatible judge endpoint the clients talk to."""
+    return (os.environ.get("OPENAI_BASE_URL") or os.environ.get("OPENAI_API_BASE") or DEFAULT_ENDPOINT).rstrip("/")
+
+
+def _freeze(options: Dict[str, Any]) -> tuple:
+    return tuple(sorted((key, repr(value)) for key, value in options.items()))
+
+
+class ClientRegistry:
+    """Process-wide judge clients and configured metrics, built once and shared by every evaluator.
+
+    Each judge endpoint gets one keep-alive connection pool. httpx async pools are bound to the event
+    loop that opened them, so async requests go through a pool per (endpoint, event loop); evaluations
+    run with run() share one long-lived loop and therefore one warm pool across evaluate() calls.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 60.0) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._lock = threading.RLock()
+        self._objects = {}
+        self._loop_pools = weakref.WeakKeyDictionary()
+        self._loop = None
+        self._thread = None
+        self.hits = 0
+        self.builds = 0
+
+    def _limits(self) -> Any:
+        import httpx
+        return httpx.Limits(max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive_connections,
+                            keepalive_expiry=self.keepalive_expiry)
+
+    def shared(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """The object registered under key, built on first use."""
+        with self._lock:
+            if key in self._objects:
+                self.hits += 1
+            else:
+                self._objects[key] = build()
+                self.builds += 1
+            return self._objects[key]
+
+    def http_client(self, endpoint: Optional[str] = None) -> Any:
+        """Keep-alive httpx.Client for synchronous judge calls to one endpoint."""
+        import httpx
+        endpoint = endpoint or judge_endpoint()
+        return self.shared(("http", endpoint), lambda: httpx.Client(limits=self._limits(), timeout=None))
+
+    def async_http_client(self, endpoint: Optional[str] = None) -> Any:
+        """httpx.AsyncClient for one endpoint that works from any event loop."""
+        endpoint = endpoint or judge_endpoint()
+        return self.shared(("async_http", endpoint), lambda: _loop_local_client_class()(self, endpoint))
+
+    def loop_pool(self, endpoint: str) -> Any:
+        """The running event loop's connection pool for an endpoint."""
+        import httpx
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._loop_pools.setdefault(loop, {})
+            if endpoint not in pools:
+                pools[endpoint] = httpx.AsyncClient(limits=self._limits(), timeout=None)
+            return pools[endpoint]
+
+    def chat_model(self, model: Optional[str] = None, **options: Any) -> Any:
+        """langchain ChatOpenAI on the shared connection pools; one instance per model and options.
+
+        Replies are reported to the enclosing token_usage() block even when the framework opens its own callback.
+        """
+        from langchain_openai import ChatOpenAI
+        endpoint = judge_endpoint()
+        if model is not None:
+            options["model"] = model
+        return self.shared(("chat", endpoint, _freeze(options)), lambda: ChatOpenAI(
+            http_client=self.http_client(endpoint), http_async_client=self.async_http_client(endpoint),
+            callbacks=[usage_forwarder()], **options))
+
+    def embeddings(self, model: str = "text-embedding-ada-002") -> Any:
+        """langchain OpenAIEmbeddings on the shared connection pools.
+
+        Inputs are only split to the model's context length against OpenAI itself: the check needs tiktoken's
+        encodings, downloaded on first use, which OpenAI-compatible endpoints such as the offline stub do not share.
+        """
+        from langchain_openai import OpenAIEmbeddings
+        endpoint = judge_endpoint()
+        return self.shared(("embeddings", endpoint, model), lambda: OpenAIEmbeddings(
+            model=model, http_client=self.http_client(endpoint), http_async_client=self.async_http_client(endpoint),
+            check_embedding_ctx_length=endpoint == DEFAULT_ENDPOINT))
+
+    def deepeval_model(self, model: Optional[str] = None) -> Any:
+        """DeepEval GPT judge that reuses one chat model instead of building a client per call."""
+        return self.shared(("deepeval_model", judge_endpoint(), model), lambda: _pooled_gpt_model_class()(self, model))
+
+    def metric(self, framework: str, name: str, build: Callable[[], Any], **config: Any) -> Any:
+        """A configured metric instance, built once per process for each framework, name and config."""
+        return self.shared(("metric", framework, name, _freeze(config)), build)
+
+    def run(self, coroutine: Any) -> Any:
+        """Run a coroutine to completion on the registry's long-lived event loop and return its result."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="judge-client-loop", daemon=True)
+                self._thread.start()
+        if threading.current_thread() is self._thread:
+            raise ValueError("ClientRegistry.run() cannot be called from inside its own event loop.")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            # An interrupted caller (e.g. Ctrl-C) cancels the coroutine, whose scheduler cancels the calls in flight;
+            # a coroutine that already failed has cancelled them itself
+            future.cancel()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        pools = sum(len(p) for p in list(self._loop_pools.values()))
+        return {"objects": len(self._objects), "builds": self.builds, "reuses": self.hits, "loop_pools": pools}
+
+
+@lru_cache(maxsize=None)
+def _loop_local_client_class() -> type:
+    import httpx
+
+    class LoopLocalAsyncClient(httpx.AsyncClient):
+        """AsyncClient that sends every request through the running loop's pool for its endpoint."""
+
+        def __init__(self, registry: ClientRegistry, endpoint: str) -> None:
+            super().__init__()
+            self.registry = registry
+            self.endpoint = endpoint
+
+        async def send(self, request: Any, **kwargs: Any) -> Any:
+            return await self.registry.loop_pool(self.endpoint).send(request, **kwargs)
+
+    return LoopLocalAsyncClient
+
+
+@lru_cache(maxsize=None)
+def _pooled_gpt_model_class() -> type:
+    from deepeval.models import GPTModel
+
+    class PooledGPTModel(GPTModel):
+        """GPTModel whose load_model() returns the registry's chat model; DeepEval calls it on every generate."""
+
+        def __init__(self, registry: ClientRegistry, model: Optional[str] = None) -> None:
+            self.registry = registry
+            super().__init__(model)
+
+        def load_model(self) -> Any:
+            if self.should_use_azure_openai():
+                return super().load_model()
+            return self.registry.chat_model(self.model_name, openai_api_key=self._openai_api_key)
+
+    return PooledGPTModel
+
+
+# The process-wide registry; Streamlit reruns and repeated evaluate() calls all reuse it
+_registry = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    return _registry
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+
+
+def chunk_id(text: str) -> str:
+    """Content hash identifying a context chunk."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ContextStore:
+    """Content-hashed store holding each unique context chunk once; rows reference chunks by ID."""
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.chunks = {}
+        self.counts = {}
+        self.set_counts = {}
+        self._ids = {}
+        self.references = 0
+        # Chunks registered from a TestCaseStore that no other row uses; counted, not kept
+        self.unshared = 0
+        self.unshared_bytes = 0
+
+    def id_of(self, text: str) -> str:
+        identifier = self._ids.get(text)
+        if identifier is None:
+            identifier = self._ids[text] = chunk_id(text)
+            self.chunks.setdefault(identifier, text)
+        return identifier
+
+    def intern(self, text: str) -> str:
+        """Add one row's reference to a chunk and return its ID."""
+        identifier = self.id_of(text)
+        self.references += 1
+        self.counts[identifier] = self.counts.get(identifier, 0) + 1
+        return identifier
+
+    def canonical(self, text: str) -> str:
+        """The stored copy of a chunk, so every row shares one string object per unique passage."""
+        return self.chunks[self.id_of(text)]
+
+    def memo_key(self, contexts: List[str]) -> Optional[tuple]:
+        """Chunk IDs of a context list repeated across rows, or None when no other row has the same list.
+
+        Only whole, identical lists share context-only work, so a row's prompts never depend on which
+        other rows happen to be in the dataset, shard or batch.
+        """
+        # Chunks seen only once are hashed without being stored
+        ids = tuple(self._ids.get(text) or chunk_id(text) for text in contexts)
+        return ids if self.set_counts.get(ids, 0) > 1 else None
+
+    def text(self, identifier: str) -> str:
+        return self.chunks[identifier]
+
+    def encode(self, contexts: List[List[str]]):
+        """Intern a column of context lists as Arrow list<dictionary<int32, string>>.
+
+        The dictionary holds each unique chunk of the column once and rows store int32 indices into it.
+        """
+        import pyarrow as pa
+
+        positions, dictionary, offsets, indices = {}, [], [0], []
+        for row in contexts:
+            ids = tuple(self.intern(text) for text in row)
+            self.set_counts[ids] = self.set_counts.get(ids, 0) + 1
+            for text in row:
+                position = positions.get(text)
+                if position is None:
+                    position = positions[text] = len(dictionary)
+                    dictionary.append(text)
+                indices.append(position)
+            offsets.append(len(indices))
+        values = pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), pa.array(dictionary, type=pa.string()))
+        return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), values)
+
+    def decode(self, column: Any) -> List[List[str]]:
+        """Context lists from an encode()d column, sharing the stored string object per chunk."""
+        column = column.combine_chunks() if hasattr(column, "combine_chunks") else column
+        values = column.values
+        texts = [self.canonical(text) for text in values.dictionary.to_pylist()]
+        indices = values.indices.to_pylist()
+        offsets = column.offsets.to_pylist()
+        return [[texts[j] for j in indices[start:end]] for start, end in zip(offsets, offsets[1:])]
+
+    def register(self, store: Any) -> None:
+        """Count the context references of a TestCaseStore, which already holds each passage once.
+
+        Only chunks and context lists used by more than one row are kept here; memo_key() treats the rest as unique.
+        """
+        import numpy as np
+
+        counts = store.passage_counts()
+        identifiers = {}
+        for j in np.flatnonzero(counts > 1).tolist():
+            identifier = identifiers[j] = self.id_of(store.passages.get(j))
+            self.counts[identifier] = self.counts.get(identifier, 0) + int(counts[j])
+        unshared = counts == 1
+        self.unshared += int(unshared.sum())
+        self.unshared_bytes += int(np.diff(store.passages.offsets)[unshared].sum())
+        self.references += len(store.context_ids)
+        # Only a row whose chunks are all shared can repeat another row's context list
+        ids, offsets = store.context_ids, store.context_offsets
+        unique_refs = np.concatenate([[0], np.cumsum(unshared[ids])])
+        candidates = (unique_refs[offsets[1:]] == unique_refs[offsets[:-1]]) & (offsets[1:] > offsets[:-1])
+        for i in np.flatnonzero(candidates).tolist():
+            key = tuple(identifiers[j] for j in ids[offsets[i]:offsets[i + 1]].tolist())
+            self.set_counts[key] = self.set_counts.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "unique_chunks": len(self.chunks) + self.unshared,
+            "references": self.references,
+            "unique_bytes": sum(len(text.encode("utf-8")) for text in self.chunks.values()) + self.unshared_bytes,
+        }
+
+
+class ContextMemo:
+    """Per-run memo of intermediate results that depend only on context chunks (DeepEval faithfulness truths)."""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Drop the memoized results; called at the start of every run so the memo stays bounded."""
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        if key in self.values:
+            self.hits += 1
+            return self.values[key]
+        self.misses += 1
+        value = self.values[key] = compute()
+        return value
+
+    async def aget(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if key in self.values:
+            self.hits += 1
+            return self.values[key]
+        # Concurrent rows sharing a chunk wait for the call already in flight instead of repeating it
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        task = self._pending[key] = asyncio.ensure_future(compute())
+        try:
+            value = self.values[key] = await asyncio.shield(task)
+        finally:
+            self._pending.pop(key, None)
+        return value
+
+
+def memoize_context_truths(metric: Any, memo: ContextMemo, store: ContextStore) -> Any:
+    """Make a DeepEval FaithfulnessMetric extract truths once per context list repeated across rows.
+
+    Truths are always extracted from a row's whole context list, as DeepEval does, so a row scores the
+    same whichever other rows it is evaluated with; rows with an identical list reuse the first one's truths.
+    """
+    from deepeval.metrics import FaithfulnessMetric
+
+    if not isinstance(metric, FaithfulnessMetric) or getattr(metric, "context_memo", None) is not None:
+        return metric
+    base = type(metric)
+
+    async def _a_generate_truths(self, retrieval_context: List[str]) -> List[str]:
+        ids = store.memo_key(retrieval_context)
+        if ids is None:
+            return await base._a_generate_truths(self, retrieval_context)
+        key = ("truths", self.evaluation_model, ids)
+        return await memo.aget(key, lambda: base._a_generate_truths(self, retrieval_context))
+
+    def _generate_truths(self, retrieval_context: List[str]) -> List[str]:
+        ids = store.memo_key(retrieval_context)
+        if ids is None:
+            return base._generate_truths(self, retrieval_context)
+        key = ("truths", self.evaluation_model, ids)
+        return memo.get(key, lambda: base._generate_truths(self, retrieval_context))
+
+    # A subclass rather than instance attributes, so copies of the metric keep the memoized methods
+    metric.__class__ = type(base.__name__, (base,), {
+        "context_memo": memo,
+        "_a_generate_truths": _a_generate_truths,
+        "_generate_truths": _generate_truths,
+    })
+    return metric
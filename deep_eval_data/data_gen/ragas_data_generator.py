@@ -1,47 +1,331 @@
+"""Synthetic RAGAs testset generation with parallel loading and chunking, cached chunk embeddings and
+keyphrases, and incremental, resumable output.
+
+Each run tops the output file up to the target size and evolution mix, appending one round of
+questions at a time, so an interrupted run resumes where it stopped. Run from the repository root:
+    python deep_eval_data/data_gen/ragas_data_generator.py --docs ./corpus --size 2000 \\
+        --output ./synthetic_data/ragas_dataset.jsonl --distribution simple=0.5 reasoning=0.25 multi_context=0.25
+"""
+import argparse
+import json
 import os
-from dotenv import load_dotenv
-load_dotenv()
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from embedding_cache import EmbeddingCache, text_hash
+
+DOCUMENT_EXTENSIONS = (".txt", ".md", ".markdown", ".pdf")
+DEFAULT_DISTRIBUTION = {"simple": 0.4, "multi_context": 0.3, "reasoning": 0.3}
+
+
+def read_document(path: str) -> str:
+    """Text of a txt/markdown file, or of every page of a PDF."""
+    if path.lower().endswith(".pdf"):
+        try:
+            from pypdf import PdfReader
+        except ImportError as error:
+            raise ValueError(f"Reading {path} needs the pypdf package.") from error
+        return "\n\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def split_text(text: str, chunk_tokens: int = 512) -> List[str]:
+    """Pack paragraphs into chunks of about chunk_tokens tokens (four characters per token)."""
+    limit = chunk_tokens * 4
+    chunks, current = [], ""
+    for paragraph in (p.strip() for p in text.split("\n\n")):
+        if not paragraph:
+            continue
+        # Paragraphs longer than a chunk are cut at the last space before the limit
+        while len(paragraph) > limit:
+            cut = paragraph.rfind(" ", 0, limit)
+            cut = cut if cut > 0 else limit
+            pieces = [current, paragraph[:cut]] if current else [paragraph[:cut]]
+            chunks.extend(pieces)
+            current, paragraph = "", paragraph[cut:].strip()
+        if current and len(current) + len(paragraph) + 2 > limit:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _chunk(text: str, metadata: Dict[str, Any], chunk_tokens: int) -> List[tuple]:
+    return [(chunk, dict(metadata)) for chunk in split_text(text, chunk_tokens)]
+
+
+def _load_and_chunk(path: str, chunk_tokens: int) -> List[tuple]:
+    # Runs in a worker process; only the chunks travel back to the parent
+    return _chunk(read_document(path), {"filename": path, "source": path}, chunk_tokens)
+
+
+def load_chunks(directory: str, chunk_tokens: int = 512, workers: Optional[int] = None) -> List[tuple]:
+    """(text, metadata) chunks of every supported document under directory, loaded in parallel."""
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names if name.lower().endswith(DOCUMENT_EXTENSIONS)
+    )
+    if not paths:
+        raise ValueError(f"No {', '.join(DOCUMENT_EXTENSIONS)} documents found under {directory}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        per_file = list(pool.map(_load_and_chunk, paths, [chunk_tokens] * len(paths),
+                                 chunksize=max(1, len(paths) // (4 * (workers or os.cpu_count() or 1)))))
+    chunks = [chunk for file_chunks in per_file for chunk in file_chunks]
+    print(f"Loaded {len(paths)} documents into {len(chunks)} chunks")
+    return chunks
+
+
+def chunk_documents(documents: List[Any], chunk_tokens: int = 512, workers: Optional[int] = None) -> List[tuple]:
+    """(text, metadata) chunks of already loaded langchain documents, split in parallel."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        per_doc = list(pool.map(_chunk, [d.page_content for d in documents],
+                                [{"filename": d.metadata.get("source", str(i)), **d.metadata} for i, d in enumerate(documents)],
+                                [chunk_tokens] * len(documents)))
+    return [chunk for doc_chunks in per_doc for chunk in doc_chunks]
+
+
+class KeyphraseCache:
+    """Append-only JSONL of keyphrases extracted per chunk, keyed by text hash."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.values = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    self.values[entry["key"]] = entry["keyphrases"]
+
+    def get(self, text: str) -> List[str]:
+        return self.values.get(text_hash(text), [])
+
+    def put_many(self, items: List[tuple]) -> None:
+        fresh = [(text_hash(text), phrases) for text, phrases in items if phrases and text_hash(text) not in self.values]
+        if not fresh:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps({"key": key, "keyphrases": phrases}) + "\n" for key, phrases in fresh))
+        self.values.update(fresh)
+
+
+def _add_cached_nodes(docstore: Any, nodes: List[Any]) -> None:
+    """Add nodes that already carry embeddings and keyphrases to the docstore.
+
+    ragas 0.1.x add_nodes() raises when it has nothing to embed or extract, so on that release line
+    the nodes go in through the docstore's own fields and helpers; any other release uses add_nodes().
+    """
+    import ragas
+    if not ragas.__version__.startswith("0.1."):
+        docstore.add_nodes(nodes)
+        return
+    for node in nodes:
+        docstore.nodes.append(node)
+        docstore.node_map[node.doc_id] = node
+        docstore.node_embeddings_list.append(node.embedding)
+    docstore.calculate_nodes_docs_similarity()
+    docstore.set_node_relataionships()
+
+
+def build_generator(chunks: List[tuple], cache_dir: str = "./.eval_cache/testset",
+                    generator_model: str = "gpt-3.5-turbo-16k", critic_model: str = "gpt-4",
+                    embedding_model: str = "text-embedding-ada-002", max_workers: int = 16) -> Any:
+    """A TestsetGenerator whose docstore holds the chunks, reusing cached embeddings and keyphrases."""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+    from ragas.llms import LangchainLLMWrapper
+    from ragas.run_config import RunConfig
+    from ragas.testset.docstore import InMemoryDocumentStore, Node
+    from ragas.testset.extractor import KeyphraseExtractor
+    from ragas.testset.generator import TestsetGenerator
+
+    embeddings = OpenAIEmbeddings(model=embedding_model)
+    generator_llm = ChatOpenAI(model=generator_model)
+    # Chunks are added as ready-made nodes, so the docstore's splitter only serves add_documents()
+    docstore = InMemoryDocumentStore(
+        splitter=RecursiveCharacterTextSplitter(chunk_size=2048, chunk_overlap=0),
+        embeddings=LangchainEmbeddingsWrapper(embeddings),
+        extractor=KeyphraseExtractor(llm=LangchainLLMWrapper(generator_llm)),
+        run_config=RunConfig(max_workers=max_workers),
+    )
+    generator = TestsetGenerator.from_langchain(generator_llm, ChatOpenAI(model=critic_model), embeddings,
+                                                docstore=docstore)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Chunk hashes are the docstore node IDs, so repeated passages are added once
+    unique = {}
+    for text, metadata in chunks:
+        unique.setdefault(text, metadata)
+    chunks = list(unique.items())
+    texts = [text for text, _ in chunks]
+    embedding_cache = EmbeddingCache(os.path.join(cache_dir, "embeddings"))
+    # Uncached chunks are embedded in batched requests instead of one request per chunk
+    vectors = embedding_cache.embed(embedding_model, texts, embeddings.embed_documents)
+    keyphrases = KeyphraseCache(os.path.join(cache_dir, "keyphrases.jsonl"))
+    nodes = [
+        Node(page_content=text, metadata=metadata, doc_id=text_hash(text),
+             embedding=vector.tolist(), keyphrases=keyphrases.get(text))
+        for (text, metadata), vector in zip(chunks, vectors)
+    ]
+    stats = embedding_cache.stats()
+    missing = sum(1 for node in nodes if not node.keyphrases)
+    print(f"Chunk embeddings: {stats['hits']} cached, {stats['misses']} computed; "
+          f"keyphrases: {len(nodes) - missing} cached, {missing} to extract")
+    if missing:
+        # The docstore only runs keyphrase extraction for nodes that arrive without keyphrases
+        docstore.add_nodes(nodes)
+    else:
+        _add_cached_nodes(docstore, nodes)
+    keyphrases.put_many([(node.page_content, node.keyphrases) for node in nodes])
+    return generator
+
+
+def read_testset(path: str) -> Any:
+    """Rows already generated into a CSV or JSONL testset, skipping a torn final record."""
+    import pandas as pd
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame(columns=["question", "evolution_type"])
+    if path.endswith(".jsonl"):
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return pd.DataFrame(records)
+    if path.endswith(".csv"):
+        return pd.read_csv(path, on_bad_lines="skip")
+    raise ValueError("Testsets can only be written as CSV or JSONL files.")
+
+
+def append_testset(path: str, frame: Any) -> None:
+    """Append rows in one write and fsync, so a crash loses at most the round in flight."""
+    if path.endswith(".jsonl"):
+        payload = frame.to_json(orient="records", lines=True, force_ascii=False)
+        payload = payload if payload.endswith("\n") else payload + "\n"
+    else:
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        payload = frame.to_csv(index=False, header=new_file)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def target_counts(size: int, distribution: Dict[str, float]) -> Dict[str, int]:
+    """Rows per evolution type, rounded so they add up to size."""
+    total = sum(distribution.values())
+    exact = {name: size * share / total for name, share in distribution.items()}
+    counts = {name: int(value) for name, value in exact.items()}
+    for name in sorted(exact, key=lambda n: exact[n] - counts[n], reverse=True)[:size - sum(counts.values())]:
+        counts[name] += 1
+    return counts
 
-from ragas.testset.generator import TestsetGenerator
-from ragas.testset.evolutions import simple, reasoning, multi_context
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
-os.environ["OPENAI_API_KEY"]
+def _question_key(question: Any) -> str:
+    return " ".join(str(question).lower().split())
 
-from langchain_community.document_loaders import PubMedLoader
 
-print("document loading starts...")
+def top_up(generator: Any, output: str, size: int, distribution: Optional[Dict[str, float]] = None,
+           batch_size: int = 50, max_empty_rounds: int = 3) -> Any:
+    """Generate only the rows missing from output to reach size and the evolution mix, one round at a time."""
+    from ragas.exceptions import ExceptionInRunner
+    from ragas.testset.evolutions import conditional, multi_context, reasoning, simple
 
-loader = PubMedLoader("liver", load_max_docs=10)
-documents = loader.load()
+    evolutions = {"simple": simple, "multi_context": multi_context, "reasoning": reasoning, "conditional": conditional}
+    distribution = distribution or DEFAULT_DISTRIBUTION
+    unknown = set(distribution) - set(evolutions)
+    if unknown:
+        raise ValueError(f"Unknown evolution types: {', '.join(sorted(unknown))}")
+    targets = target_counts(size, distribution)
+    existing = read_testset(output)
+    seen = {_question_key(q) for q in existing["question"]}
+    have = existing["evolution_type"].value_counts().to_dict() if len(existing) else {}
+    empty_rounds = 0
+    while True:
+        deficits = {name: targets[name] - have.get(name, 0) for name in targets if targets[name] > have.get(name, 0)}
+        missing = sum(deficits.values())
+        print(f"Testset {output}: {sum(have.values())} rows, {missing} missing "
+              f"({', '.join(f'{name} {count}' for name, count in deficits.items()) or 'complete'})")
+        if not missing or empty_rounds >= max_empty_rounds:
+            break
+        round_size = min(batch_size, missing)
+        try:
+            testset = generator.generate(
+                test_size=round_size,
+                distributions={evolutions[name]: count / missing for name, count in deficits.items()},
+                raise_exceptions=False,
+            )
+            frame = testset.to_pandas()
+        except ExceptionInRunner:
+            frame = existing.iloc[:0]
+        # Repeated questions and rows beyond an evolution type's target are not kept
+        keep = []
+        for question, kind in zip(frame.get("question", []), frame.get("evolution_type", [])):
+            key = _question_key(question)
+            fresh = key not in seen and deficits.get(kind, 0) > 0
+            if fresh:
+                seen.add(key)
+                deficits[kind] -= 1
+                have[kind] = have.get(kind, 0) + 1
+            keep.append(fresh)
+        frame = frame[keep] if len(frame) else frame
+        empty_rounds = 0 if len(frame) else empty_rounds + 1
+        if len(frame):
+            append_testset(output, frame)
+    return read_testset(output)
 
-# for document in documents:
-#     document.metadata['filename'] = document.metadata['source']
-print("document loaded.")
 
-# generator with openai models
-generator_llm = ChatOpenAI(model="gpt-3.5-turbo-16k")
-critic_llm = ChatOpenAI(model="gpt-4")
-embeddings = OpenAIEmbeddings()
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
 
-generator = TestsetGenerator.from_langchain(
-    generator_llm,
-    critic_llm,
-    embeddings
-)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", help="directory of txt, markdown and PDF documents")
+    parser.add_argument("--pubmed", default="liver", help="PubMed query used when --docs is not given")
+    parser.add_argument("--pubmed-docs", type=int, default=10)
+    parser.add_argument("--output", default="./synthetic_data/ragas_dataset.csv", help="CSV or JSONL testset")
+    parser.add_argument("--size", type=int, default=10, help="target number of rows in the output")
+    parser.add_argument("--distribution", nargs="+", metavar="EVOLUTION=SHARE",
+                        help="evolution mix, e.g. simple=0.4 multi_context=0.3 reasoning=0.3")
+    parser.add_argument("--chunk-tokens", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=None, help="processes for loading and chunking")
+    parser.add_argument("--max-workers", type=int, default=16, help="concurrent generation requests")
+    parser.add_argument("--batch-size", type=int, default=50, help="rows generated per resumable round")
+    parser.add_argument("--cache-dir", default="./.eval_cache/testset")
+    args = parser.parse_args()
 
-distributions = {
-    simple: 0.4,
-    multi_context: 0.3,
-    reasoning: 0.3
-}
+    distribution = DEFAULT_DISTRIBUTION
+    if args.distribution:
+        distribution = {name: float(share) for name, share in (item.split("=", 1) for item in args.distribution)}
 
-print("generate testset")
-testset = generator.generate_with_langchain_docs(
-    documents, test_size=10, distributions=distributions)
+    print("document loading starts...")
+    if args.docs:
+        chunks = load_chunks(args.docs, args.chunk_tokens, args.workers)
+    else:
+        from langchain_community.document_loaders import PubMedLoader
+        documents = PubMedLoader(args.pubmed, load_max_docs=args.pubmed_docs).load()
+        chunks = chunk_documents(documents, args.chunk_tokens, args.workers)
+    print("document loaded.")
 
-results_df = testset.to_pandas()
+    generator = build_generator(chunks, args.cache_dir, max_workers=args.max_workers)
+    print("generate testset")
+    testset = top_up(generator, args.output, args.size, distribution, args.batch_size)
+    print(f"results generated: {len(testset)} rows in {args.output}")
 
-print("results generated")
 
-results_df.to_csv("./synthetic_data/ragas_dataset.csv", index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
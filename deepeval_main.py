@@ -1,6 +1,14 @@
 
 from eval import FrameworkFactory
-from datasets import load_dataset
+from score_cache import ScoreCache
+from incremental import RunManifest
+from checkpoint import Checkpoint
+from cascade import Cascade
+from batch_judge import BatchJudge
+from scheduler import JudgeScheduler, RateLimits
+from instrumentation import Tracer, set_tracer
+from results_store import ResultsStore
+from analysis import analyze
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,6 +17,10 @@ os.environ["OPENAI_API_KEY"]
 
 # Example Usage
 if __name__ == "__main__":
+    # Record stage timings and per-row judge calls for this run
+    tracer = Tracer()
+    set_tracer(tracer)
+
     # User selects the framework they want to use
     framework_name =  "DeepEval"
 
@@ -34,11 +46,35 @@ if __name__ == "__main__":
     # Set metrics and run the evaluation
     evaluator.set_metrics(metrics)
 
+    # Reuse judge scores from previous runs for rows that have not changed
+    evaluator.set_cache(ScoreCache("./.eval_cache/scores.sqlite", max_age_seconds=30 * 24 * 3600))
+    # Only score rows added or modified since the previous run of this dataset
+    # evaluator.set_manifest(RunManifest("./.eval_cache/deepeval_manifest.json"))
+    # Resume an interrupted run without re-scoring rows it already finished
+    # evaluator.set_checkpoint(Checkpoint("./.eval_cache/deepeval_checkpoint.jsonl", run_id="deepeval-nightly"))
+    # Only send rows whose cheap lexical scores are uncertain to the judge model
+    # evaluator.set_cascade(Cascade())
+    # Pack several rows into each judge request, scored into <metric>_batched columns by a one-number rubric
+    # evaluator.set_batch_judge(BatchJudge(model="gpt-4", context_tokens=8192, max_batch=8))
+
+    # Control judge concurrency and throughput instead of the framework defaults; calls past the 60s deadline
+    # are retried, calls slower than the p95 latency are hedged, and rows that still fail are left unscored
+    # evaluator.set_scheduler(JudgeScheduler(
+    #     RateLimits(concurrency=16),
+    #     {"gpt-4": RateLimits(concurrency=8, requests_per_minute=500, tokens_per_minute=300000)},
+    #     timeout=60, hedge_percentile=95,
+    # ))
+
     # Run the evaluator to generate score for each metrics
     results = evaluator.evaluate()
+    tracer.print_summary()
+    tracer.export_jsonl("./results/deepeval_trace.jsonl")
+    # Keep per-row scores for cross-run queries: python results_store.py runs | aggregate | diff | slices
+    ResultsStore("./results/store").write_run(results, "DeepEval", tracer=tracer)
     
-    for r in results:
-        print(r)
+    print(results)
+    # Means with bootstrap intervals and pass rates at each metric's threshold; add by=[...] for slices
+    print(analyze(results).to_string(index=False))
 
     # df = results.to_pandas()
     # print(df.head())
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import re
+from typing import List, Dict, Any, Callable, Awaitable
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends from concurrent processes are not serialized
+    fcntl = None
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class _ModelStore:
+    """Vectors of one embedding model: a float32 matrix file plus an index of (text hash, row) records."""
+
+    def __init__(self, directory: str, model: str) -> None:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        self.model = model
+        self.vectors_path = os.path.join(directory, f"{slug}.f32")
+        self.index_path = os.path.join(directory, f"{slug}.idx")
+        self.meta_path = os.path.join(directory, f"{slug}.json")
+        self.dim = None
+        self.rows = {}
+        # Rows of the vectors file in use: one past the highest indexed row
+        self.size = 0
+        self._matrix = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+            self._load_index()
+
+    def _load_index(self) -> None:
+        # Vectors are written before their index records, so a record pointing past the vector file is never
+        # used; torn records from a crash (no newline, or unparseable) are skipped, not the records after them
+        complete_rows = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        self.rows = {}
+        self.size = 0
+        self._matrix = None
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    continue
+                fields = line.split()
+                if len(fields) != 2 or len(fields[0]) != 32 or not fields[1].isdigit():
+                    continue
+                row = int(fields[1])
+                if row < complete_rows:
+                    self.rows.setdefault(fields[0], row)
+                    self.size = max(self.size, row + 1)
+
+    def matrix(self) -> np.ndarray:
+        """Read-only memory map over the vectors file; pages are loaded only for the rows read."""
+        if self._matrix is None or len(self._matrix) < self.size:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.size, self.dim))
+        return self._matrix
+
+    def append(self, keys: List[str], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model, "dim": self.dim}, f)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding model {self.model} returned {vectors.shape[1]} dimensions, cache holds {self.dim}.")
+        with open(self.index_path, "a+b") as index:
+            if fcntl is not None:
+                fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since this one loaded the index
+                self._load_index()
+                fresh = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.rows]
+                if not fresh:
+                    return
+                with open(self.vectors_path, "ab") as f:
+                    # Vectors written before a crash but never indexed are dropped, so new rows line up with
+                    # the offsets recorded for them
+                    f.truncate(self.size * self.dim * 4)
+                    f.write(np.asarray([v for _, v in fresh], dtype=np.float32).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                records = "".join(f"{key} {self.size + i}\n" for i, (key, _) in enumerate(fresh))
+                index.seek(0, os.SEEK_END)
+                if index.tell():
+                    index.seek(-1, os.SEEK_END)
+                    # A torn last record gets its own line instead of swallowing the first new one
+                    if index.read(1) != b"\n":
+                        records = "\n" + records
+                index.write(records.encode("utf-8"))
+                index.flush()
+                for key, _ in fresh:
+                    self.rows[key] = self.size
+                    self.size += 1
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (embedding model, text hash), one memory-mapped matrix per model."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._stores = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, model: str) -> _ModelStore:
+        if model not in self._stores:
+            self._stores[model] = _ModelStore(self.directory, model)
+        return self._stores[model]
+
+    def get_many(self, model: str, texts: List[str]) -> tuple:
+        """Return (float32 matrix with one row per text, indices of texts not cached); missing rows are zero."""
+        store = self._store(model)
+        keys = [text_hash(text) for text in texts]
+        rows = [store.rows.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if store.dim is None:
+            return np.zeros((len(texts), 0), dtype=np.float32), missing
+        vectors = np.zeros((len(texts), store.dim), dtype=np.float32)
+        found = [i for i, row in enumerate(rows) if row is not None]
+        if found:
+            # One fancy-indexed read from the memory map for the whole batch
+            vectors[found] = store.matrix()[[rows[i] for i in found]]
+        return vectors, missing
+
+    def put_many(self, model: str, texts: List[str], vectors: Any) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts):
+            self._store(model).append([text_hash(text) for text in texts], vectors.reshape(len(texts), -1))
+
+    def _merge(self, model: str, texts: List[str], vectors: np.ndarray, missing: List[int],
+               unique: List[str], fresh: Any) -> np.ndarray:
+        fresh = np.asarray(fresh, dtype=np.float32).reshape(len(unique), -1)
+        self.put_many(model, unique, fresh)
+        if vectors.shape[1] == 0:
+            vectors = np.zeros((len(texts), fresh.shape[1]), dtype=np.float32)
+        position = {text: i for i, text in enumerate(unique)}
+        vectors[missing] = fresh[[position[texts[i]] for i in missing]]
+        return vectors
+
+    def embed(self, model: str, texts: List[str], backend: Callable[[List[str]], Any]) -> np.ndarray:
+        """Vectors for texts, sending only the distinct uncached texts to backend in one batch."""
+        vectors, missing = self.get_many(model, texts)
+        if not missing:
+            return vectors
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        return self._merge(model, texts, vectors, missing, unique, backend(unique))
+
+    async def aembed(self, model: str, texts: List[str], backend: Callable[[List[str]], Awaitable[Any]]) -> np.ndarray:
+        vectors, missing = self.get_many(model, texts)
+        if not missing:
+            return vectors
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        return self._merge(model, texts, vectors, missing, unique, await backend(unique))
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "vectors": sum(len(store.rows) for store in self._stores.values())}
+
+
+class CachedEmbeddings:
+    """Embeddings client (langchain interface) that consults an EmbeddingCache before the wrapped client."""
+
+    def __init__(self, inner: Any, cache: EmbeddingCache, model: str) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return self.cache.embed(self.model, list(texts), self.inner.embed_documents)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.cache.embed(self.model, [text], lambda texts: [self.inner.embed_query(texts[0])])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> np.ndarray:
+        return await self.cache.aembed(self.model, list(texts), self.inner.aembed_documents)
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        async def backend(texts):
+            return [await self.inner.aembed_query(texts[0])]
+        return (await self.cache.aembed(self.model, [text], backend))[0]
@@ -1,67 +1,157 @@
+from __future__ import annotations
+
+import copy
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-
-from deepeval.dataset import EvaluationDataset
-from deepeval import evaluate
-from deepeval.metrics import (
-    HallucinationMetric, 
-    AnswerRelevancyMetric, 
-    FaithfulnessMetric,
-    ContextualRecallMetric, 
-    ContextualPrecisionMetric
-)
+from functools import partial
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
-from datasets import Dataset
-from ragas import evaluate
-import pandas as pd
-from ragas.metrics import (
-    answer_relevancy,
-    faithfulness,
-    context_recall,
-    context_precision,
+# Framework, dataset and dataframe libraries are imported inside the methods that use them,
+# so importing this module is cheap and only the selected framework is ever loaded.
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from datasets import Dataset
+    from deepeval.dataset import EvaluationDataset
+    from cascade import Cascade
+    from batch_judge import BatchJudge
+    from embedding_cache import EmbeddingCache
+
+from score_cache import (
+    ROW_COLUMN_ALIASES,
+    ScoreCache,
+    metric_config,
+    normalize_row,
+    parse_contexts,
+    parse_ground_truth,
+    row_fingerprint,
 )
+from checkpoint import Checkpoint
+from client_registry import get_registry
+from context_store import ContextMemo, ContextStore
+from incremental import RunManifest
+from scheduler import JudgeScheduler, JudgeUnit, RateLimits, estimate_tokens
+from instrumentation import TokenUsage, get_tracer, stage, token_usage
+from testcase_store import TestCaseStore
 
 class DataHandler:
-    def __init__(self, file_path):
+    def __init__(self, file_path, stream=False):
         self.file_path = file_path
         self.data = None
-        self.load_data()
+        # In streaming mode nothing is read up front; use iter_batches() instead
+        if not stream:
+            self.load_data()
 
     def load_data(self):
         """Load data based on the file extension."""
+        import pandas as pd
+        with stage("load", path=self.file_path):
+            if self.file_path.endswith('.csv'):
+                self.data = pd.read_csv(self.file_path)
+            elif self.file_path.endswith('.jsonl'):
+                self.data = pd.read_json(self.file_path, lines=True)
+            elif self.file_path.endswith('.json'):
+                self.data = pd.read_json(self.file_path)
+            elif self.file_path.endswith('.parquet'):
+                self.data = pd.read_parquet(self.file_path)
+            elif self.file_path.endswith('.xlsx') or self.file_path.endswith('.xls'):
+                self.data = pd.read_excel(self.file_path)
+            else:
+                raise ValueError("Unsupported file format. Please use CSV, JSON, JSONL, Parquet or Excel files.")
+
+    def iter_batches(self, batch_size=1000):
+        """Yield the file as DataFrames of at most batch_size rows without loading it whole."""
+        import pandas as pd
         if self.file_path.endswith('.csv'):
-            self.data = pd.read_csv(self.file_path)
-        elif self.file_path.endswith('.json'):
-            self.data = pd.read_json(self.file_path)
-        elif self.file_path.endswith('.xlsx') or self.file_path.endswith('.xls'):
-            self.data = pd.read_excel(self.file_path)
+            yield from pd.read_csv(self.file_path, chunksize=batch_size)
+        elif self.file_path.endswith('.jsonl'):
+            yield from pd.read_json(self.file_path, lines=True, chunksize=batch_size)
+        elif self.file_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            # Memory-mapped so only the row groups being decoded are paged in
+            parquet_file = pq.ParquetFile(self.file_path, memory_map=True)
+            for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+                yield record_batch.to_pandas()
         else:
-            raise ValueError("Unsupported file format. Please use CSV, JSON, or Excel files.")
+            raise ValueError("Streaming is only supported for CSV, JSONL and Parquet files.")
 
     def get_data(self):
         """Return the loaded data."""
         return self.data
 
+    def get_table(self):
+        """Return the data as an Arrow table; Parquet files are read straight into Arrow, never into pandas."""
+        import pyarrow as pa
+        if self.data is None and self.file_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            with stage("load", path=self.file_path):
+                return pq.read_table(self.file_path)
+        if self.data is None:
+            self.load_data()
+        return pa.Table.from_pandas(self.data, preserve_index=False)
+
     def get_columns(self):
         """Return the list of columns in the data."""
         return self.data.columns.tolist()
 
     def save_data(self, output_path):
         """Save the data to the specified output path based on the file extension."""
-        if output_path.endswith('.csv'):
-            self.data.to_csv(output_path, index=False)
-        elif output_path.endswith('.json'):
-            self.data.to_json(output_path, orient='records', lines=True)
-        elif output_path.endswith('.xlsx') or output_path.endswith('.xls'):
-            self.data.to_excel(output_path, index=False)
-        else:
-            raise ValueError("Unsupported output file format. Please use CSV, JSON, or Excel files.")
+        with stage("save", path=output_path, rows=len(self.data)):
+            if output_path.endswith('.csv'):
+                self.data.to_csv(output_path, index=False)
+            elif output_path.endswith('.json') or output_path.endswith('.jsonl'):
+                self.data.to_json(output_path, orient='records', lines=True)
+            elif output_path.endswith('.parquet'):
+                self.data.to_parquet(output_path, index=False)
+            elif output_path.endswith('.xlsx') or output_path.endswith('.xls'):
+                self.data.to_excel(output_path, index=False)
+            else:
+                raise ValueError("Unsupported output file format. Please use CSV, JSON, JSONL, Parquet or Excel files.")
+
+# Writes DataFrame batches to one output file as they are produced
+class BatchWriter:
+    def __init__(self, output_path):
+        if not output_path.endswith(('.csv', '.jsonl', '.parquet')):
+            raise ValueError("Incremental output is only supported for CSV, JSONL and Parquet files.")
+        self.output_path = output_path
+        self.rows_written = 0
+        self._parquet_writer = None
+
+    def write(self, batch):
+        """Append a batch to the output file."""
+        with stage("save", path=self.output_path, rows=len(batch)):
+            if self.output_path.endswith('.csv'):
+                batch.to_csv(self.output_path, mode='w' if self.rows_written == 0 else 'a',
+                             header=self.rows_written == 0, index=False)
+            elif self.output_path.endswith('.jsonl'):
+                text = batch.to_json(orient='records', lines=True, force_ascii=False)
+                with open(self.output_path, 'w' if self.rows_written == 0 else 'a', encoding='utf-8') as f:
+                    f.write(text if text.endswith('\n') else text + '\n')
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                if self._parquet_writer is None:
+                    # The file schema is fixed by the first batch; a column that is all None there (an unscored
+                    # batch's <metric>_source, an empty attribute) is written as string so later values fit
+                    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                        for field in table.schema])
+                    self._parquet_writer = pq.ParquetWriter(self.output_path, schema)
+                self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        self.rows_written += len(batch)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
 
 # Example usage:
 # handler = DataHandler("data.csv")
 # data = handler.get_data()
 # filtered_data = handler.filter_data("age > 30")
 # handler.save_data("filtered_data.csv")
+#
+# Streaming usage for files too large to hold in memory:
+# evaluator.evaluate_stream(DataHandler("data.parquet", stream=True), BatchWriter("scores.parquet"))
 
 
 # Abstract Interface for Evaluation - Interface Abstraction (Abstract Class)
@@ -82,96 +172,711 @@ class EvaluationInterface(ABC):
         """Run the evaluation and return results."""
         pass
 
-# Concrete Class for RAGAs Framework - Implements EvaluationInterface
-class RAGAsEvaluator(EvaluationInterface):
+# Result container shared by both frameworks - aggregate scores plus per-row table
+class EvaluationResult(dict):
+
+    def __init__(self, scores: pd.DataFrame, metric_names: List[str],
+                 configs: Optional[Dict[str, Any]] = None, unscored: Optional[List[Dict[str, Any]]] = None) -> None:
+        super().__init__({
+            name: float(scores[name].mean()) for name in metric_names if name in scores
+        })
+        self.scores = scores
+        self.metric_names = metric_names
+        self.configs = configs or {}
+        # Rows whose judge calls failed for good: {"row", "metric", "error"}; the means exclude them
+        self.unscored = unscored or []
+        # Fraction of rows each mean is computed over
+        self.coverage = {name: float(scores[name].notna().mean()) if len(scores) else 1.0
+                         for name in metric_names if name in scores}
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Return the per-row score table."""
+        return self.scores
+
+class EvaluationCancelled(Exception):
+    """Raised when a run is stopped through the evaluator's cancel event."""
+
+# Template Method Pattern - shared row dispatch for the concrete evaluators
+class BaseEvaluator(EvaluationInterface):
 
     def __init__(self) -> None:
         super().__init__()
         self.dataset = None
+        # Rows loaded from files and frames live here; dataset is only set for framework-native datasets
+        self.store = None
         self.real_metrics = None
         self.results = None
+        self.cache = None
+        self.manifest = None
+        self.scheduler = None
+        self.progress_callback = None
+        self.cancel_event = None
+        self.checkpoint = None
+        self.cascade = None
+        self.batch_judge = None
+        self.judge_model = None
+        self.unscored = []
+        # Row/metric scores the last run had to send to the judge, after the caches and cascade
+        self.judge_units = 0
+        # Metric name -> {row: source} for scores not from the run's usual scorer, reported in <metric>_source
+        self.score_sources = {}
+        # Contexts repeated across rows are stored once, and DeepEval faithfulness extracts truths once per repeated
+        # context list. RAGAs 0.1 metrics have no context-only step to share: every prompt also carries the
+        # row's question, answer or ground truth
+        self.context_store = ContextStore()
+        self.context_memo = ContextMemo()
+
+    def set_cache(self, cache: ScoreCache) -> None:
+        """Attach a persistent score cache consulted before dispatching rows."""
+        self.cache = cache
+
+    def set_manifest(self, manifest: RunManifest) -> None:
+        """Enable incremental mode: only rows added or modified since the manifest's run are scored."""
+        self.manifest = manifest
+
+    def set_scheduler(self, scheduler: JudgeScheduler) -> None:
+        """Dispatch one judge call per (row, metric) through a rate-limited async scheduler."""
+        self.scheduler = scheduler
+
+    def set_checkpoint(self, checkpoint: Checkpoint) -> None:
+        """Append every finished score to a write-ahead log and, on resume, skip rows already in it."""
+        self.checkpoint = checkpoint
+
+    def set_cascade(self, cascade: Cascade) -> None:
+        """Score rows with cheap local metrics first and only send the uncertain band to the judge."""
+        self.cascade = cascade
+
+    def set_batch_judge(self, batch_judge: BatchJudge) -> None:
+        """Score supported metrics several rows per judge request instead of one row at a time."""
+        self.batch_judge = batch_judge
+
+    def set_judge_model(self, model: Optional[str]) -> None:
+        """Judge every metric with the given model instead of the framework defaults; call before set_metrics()."""
+        self.judge_model = model
+
+    def set_progress(self, callback: Optional[Any] = None, cancel_event: Optional[Any] = None) -> None:
+        """Report each score as callback(metric_name, row_index, score) and stop when cancel_event is set."""
+        self.progress_callback = callback
+        self.cancel_event = cancel_event
+
+    def _batched(self, metric: Any) -> bool:
+        return self.batch_judge is not None and self.batch_judge.supports(self.metric_name(metric))
+
+    def _score_name(self, metric: Any) -> str:
+        """Result column of a metric; batched scores come from a different rubric, so they get their own name."""
+        name = self.metric_name(metric)
+        return f"{name}_batched" if self._batched(metric) else name
+
+    def _metric_config(self, metric: Any) -> Dict[str, Any]:
+        config = metric_config(metric)
+        if self._batched(metric):
+            config.update(self.batch_judge.config())
+        return config
+
+    def _report(self, name: str, index: int, score: Any) -> None:
+        if self.progress_callback is not None:
+            self.progress_callback(name, index, score)
+
+    def _check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise EvaluationCancelled("Evaluation cancelled")
+
+    @abstractmethod
+    def load_frame(self, data: pd.DataFrame) -> None:
+        """Adapt an in-memory DataFrame (e.g. one streamed batch) as the current dataset."""
+        pass
+
+    @abstractmethod
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """Return the loaded rows normalized to question/answer/contexts/ground_truth."""
+        pass
+
+    @abstractmethod
+    def metric_name(self, metric: Any) -> str:
+        """Return the framework-independent name of a configured metric."""
+        pass
+
+    @abstractmethod
+    def score_rows(self, indices: List[int], metrics: List[Any]) -> pd.DataFrame:
+        """Score the given rows with the given metrics; one column per metric name, indexed by row."""
+        pass
+
+    @abstractmethod
+    async def ascore_unit(self, index: int, metric: Any) -> float:
+        """Score a single row with a single metric without blocking the event loop."""
+        pass
+
+    def _pending_rows(self, rows: List[Dict[str, Any]], scores: Dict[str, List[Any]],
+                      completed: Dict[tuple, float]) -> Dict[Any, List[int]]:
+        """Carry over unchanged rows, skip checkpointed ones, look up cached scores and group metrics by the rows that still need a judge call."""
+        groups = {}
+        fingerprints = [row_fingerprint(row) for row in rows] if completed else None
+        for metric in self.real_metrics:
+            name = self._score_name(metric)
+            config = self._metric_config(metric)
+            pending = list(range(len(rows)))
+            if self.manifest is not None:
+                carried = self.manifest.carried_scores(name, config, rows)
+                for i, score in carried.items():
+                    scores[name][i] = score
+                    self._report(name, i, score)
+                pending = [i for i in pending if i not in carried]
+            if completed:
+                still_pending = []
+                for i in pending:
+                    score = completed.get((fingerprints[i], name))
+                    if score is None:
+                        still_pending.append(i)
+                    else:
+                        scores[name][i] = score
+                        self._report(name, i, score)
+                pending = still_pending
+            if self.cache is not None and pending:
+                keys = [ScoreCache.make_key(name, config, rows[i]) for i in pending]
+                cached = self.cache.get_many(keys)
+                still_pending = []
+                for i, key in zip(pending, keys):
+                    if key in cached:
+                        scores[name][i] = cached[key]
+                        self._report(name, i, cached[key])
+                    else:
+                        still_pending.append(i)
+                pending = still_pending
+            if pending:
+                groups.setdefault(tuple(pending), []).append(metric)
+        return groups
+
+    def _gate(self, rows: List[Dict[str, Any]], groups: Dict[Any, List[Any]],
+              scores: Dict[str, List[Any]]) -> Dict[Any, List[Any]]:
+        """Resolve pending rows whose cheap scores are confident and regroup the escalated ones."""
+        if self.cascade is None or not groups:
+            return groups
+        with stage("cascade", rows=len(rows)):
+            cheap = self.cascade.score(rows)
+        escalated_groups = {}
+        for pending, metrics in groups.items():
+            for metric in metrics:
+                name = self._score_name(metric)
+                # Local scores are not cached, checkpointed or kept in the manifest; they are cheap to recompute
+                resolved, escalated = self.cascade.route(self.metric_name(metric), cheap, pending)
+                sources = self.score_sources.setdefault(name, {})
+                for i, score in resolved.items():
+                    scores[name][i] = score
+                    sources[i] = "cascade"
+                    self._report(name, i, score)
+                if escalated:
+                    escalated_groups.setdefault(tuple(escalated), []).append(metric)
+        return escalated_groups
+
+    def _record(self, rows: List[Dict[str, Any]], metric: Any, indices: List[int], values: List[Any],
+                scores: Dict[str, List[Any]], entries: List[tuple]) -> None:
+        """Store fresh scores in the result columns and queue them for the score cache."""
+        name = self._score_name(metric)
+        config = self._metric_config(metric)
+        for i, score in zip(indices, values):
+            scores[name][i] = score
+            self._report(name, i, score)
+            if self.cache is not None:
+                entries.append((ScoreCache.make_key(name, config, rows[i]), name, score))
+        if self.checkpoint is not None:
+            self.checkpoint.append([(row_fingerprint(rows[i]), i, name, score) for i, score in zip(indices, values)])
+
+    def _record_unscored(self, metric: Any, indices: List[int], error: Any) -> None:
+        """Leave rows whose judge calls failed unscored and keep the reason, instead of failing the run.
+
+        They are not cached or checkpointed, so the next run tries them again.
+        """
+        name = self._score_name(metric)
+        reason = error if isinstance(error, str) else repr(error)
+        for i in indices:
+            self.unscored.append({"row": i, "metric": name, "error": reason})
+            self._report(name, i, None)
+
+    async def _traced_unit(self, index: int, metric: Any) -> tuple:
+        # Token usage is collected per unit so it can be attributed to the row and metric
+        with token_usage() as usage:
+            score = await self.ascore_unit(index, metric)
+        return score, usage
+
+    async def _dispatch_units(self, rows: List[Dict[str, Any]], groups: Dict[Any, List[Any]],
+                              scores: Dict[str, List[Any]], entries: List[tuple], scheduler: JudgeScheduler) -> None:
+        # One unit per (row, metric) so the scheduler controls every judge call in flight
+        units = []
+        for pending, metrics in groups.items():
+            for metric in metrics:
+                model = metric_config(metric)["model"]
+                for i in pending:
+                    tokens = estimate_tokens(list(rows[i].values()))
+                    units.append(JudgeUnit((i, metric), partial(self._traced_unit, i, metric), model, tokens))
+
+        def on_result(unit: JudgeUnit, result: Any, error: Optional[BaseException]) -> None:
+            i, metric = unit.key
+            score, usage = result if error is None else (None, None)
+            tracer = get_tracer()
+            if tracer is not None:
+                tracer.record_call(i, self.metric_name(metric), unit.model, unit.latency,
+                                   unit.attempts - 1, usage, unit.tokens, error)
+            if error is not None:
+                self._record_unscored(metric, [i], error)
+            else:
+                self._record(rows, metric, [i], [score], scores, entries)
+            self._check_cancelled()
+            if self.cache is not None and len(entries) >= 100:
+                self.cache.put_many(entries)
+                entries.clear()
+
+        await scheduler.arun(units, on_result)
+
+    async def _dispatch_batched(self, rows: List[Dict[str, Any]], groups: Dict[Any, List[Any]],
+                                scores: Dict[str, List[Any]], entries: List[tuple],
+                                scheduler: JudgeScheduler) -> Dict[Any, List[Any]]:
+        """Score supported metrics K rows per request under <metric>_batched; return the groups left for per-row calls."""
+        from batch_judge import MalformedBatchError
+
+        judge = self.batch_judge
+        remaining = {}
+        pending_rows = []
+        for pending, metrics in groups.items():
+            for metric in metrics:
+                if judge.supports(self.metric_name(metric)):
+                    pending_rows.append((metric, list(pending)))
+                else:
+                    remaining.setdefault(pending, []).append(metric)
+
+        # Rows of a malformed reply are re-packed at half the batch size for the rest of this run; the shared
+        # judge's max_batch is left as configured
+        max_batch = judge.max_batch
+        while pending_rows:
+            units = []
+            for metric, indices in pending_rows:
+                name = self.metric_name(metric)
+                for batch in judge.pack(rows, indices, name, max_batch):
+                    tokens = sum(estimate_tokens(list(rows[i].values())) for i in batch)
+                    units.append(JudgeUnit((batch, metric), partial(judge.score_batch, rows, batch, name),
+                                           judge.model, tokens))
+            malformed = {}
+
+            def on_result(unit: JudgeUnit, result: Any, error: Optional[BaseException]) -> None:
+                batch, metric = unit.key
+                name = self._score_name(metric)
+                if isinstance(error, MalformedBatchError):
+                    retry = f"retrying in batches of {max_batch // 2}" if max_batch > 1 else "leaving them unscored"
+                    print(f"Malformed batched reply for {name} ({len(batch)} rows): {error}; {retry}")
+                    judge.malformed()
+                    malformed.setdefault(name, (metric, []))[1].extend(batch)
+                    return
+                batch_scores, usage = result if error is None else ({}, None)
+                tracer = get_tracer()
+                if tracer is not None:
+                    # The request's latency and tokens are shared evenly across the rows it scored
+                    share = TokenUsage()
+                    if usage is not None:
+                        share.prompt_tokens = usage.prompt_tokens // len(batch)
+                        share.completion_tokens = usage.completion_tokens // len(batch)
+                        share.cost = usage.cost / len(batch)
+                    for i in batch:
+                        tracer.record_call(i, name, unit.model, (unit.latency or 0.0) / len(batch),
+                                           unit.attempts - 1, share, unit.tokens // len(batch), error)
+                if error is not None:
+                    self._record_unscored(metric, batch, error)
+                else:
+                    self._record(rows, metric, batch, [batch_scores[i] for i in batch], scores, entries)
+                self._check_cancelled()
+                if self.cache is not None and len(entries) >= 100:
+                    self.cache.put_many(entries)
+                    entries.clear()
+
+            print(f"Batched judging: {len(units)} requests for {sum(len(u.key[0]) for u in units)} row/metric scores")
+            await scheduler.arun(units, on_result)
+            pending_rows = [(metric, sorted(indices)) for metric, indices in malformed.values()]
+            if max_batch == 1:
+                break
+            max_batch //= 2
+        for metric, indices in pending_rows:
+            # The framework metric's score is not comparable with the rubric's, so it is not used in its place
+            self._record_unscored(metric, indices, "malformed batched reply")
+        return remaining
+
+    async def _adispatch(self, rows: List[Dict[str, Any]], groups: Dict[Any, List[Any]],
+                         scores: Dict[str, List[Any]]) -> None:
+        """Scheduled dispatch inside the running event loop, so several evaluators can share one scheduler."""
+        entries = []
+        try:
+            if self.batch_judge is not None:
+                groups = await self._dispatch_batched(rows, groups, scores, entries, self.scheduler)
+            await self._dispatch_units(rows, groups, scores, entries, self.scheduler)
+        finally:
+            if self.cache is not None:
+                self.cache.put_many(entries)
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+
+    def _dispatch(self, rows: List[Dict[str, Any]], groups: Dict[Any, List[Any]], scores: Dict[str, List[Any]]) -> None:
+        if self.scheduler is not None:
+            # The registry's long-lived loop keeps judge connections warm across evaluate() calls
+            get_registry().run(self._adispatch(rows, groups, scores))
+            return
+        entries = []
+        try:
+            if self.batch_judge is not None:
+                scheduler = JudgeScheduler(RateLimits(concurrency=self.batch_judge.concurrency))
+                groups = get_registry().run(self._dispatch_batched(rows, groups, scores, entries, scheduler))
+            # Metrics missing the same rows are dispatched together in one framework call
+            chunk_size = self.checkpoint.chunk_size if self.checkpoint is not None else None
+            for pending, metrics in groups.items():
+                names = [self.metric_name(m) for m in metrics]
+                # With a checkpoint, rows go out in chunks so a failure only loses the chunk in flight
+                step = chunk_size or len(pending)
+                for start in range(0, len(pending), step):
+                    self._check_cancelled()
+                    chunk = list(pending[start:start + step])
+                    try:
+                        with stage("score_rows", metrics=names, rows=len(chunk)) as attributes, \
+                                token_usage() as usage:
+                            frame = self.score_rows(chunk, metrics)
+                    except Exception as error:
+                        # A failed framework call costs only its chunk; the rest of the run carries on
+                        print(f"Scoring {len(chunk)} rows with {', '.join(names)} failed: {error!r}")
+                        for metric in metrics:
+                            self._record_unscored(metric, chunk, error)
+                        continue
+                    attributes.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+                                      cost_usd=usage.cost)
+                    for metric in metrics:
+                        values = frame[self.metric_name(metric)].tolist()
+                        # The frameworks turn per-row judge failures into missing scores
+                        missing = [score is None or score != score for score in values]
+                        failed = [i for i, miss in zip(chunk, missing) if miss]
+                        if failed:
+                            self._record_unscored(metric, failed, "no score returned")
+                        if len(failed) < len(chunk):
+                            self._record(rows, metric, [i for i, miss in zip(chunk, missing) if not miss],
+                                         [score for score, miss in zip(values, missing) if not miss], scores, entries)
+        finally:
+            # Scores already paid for are kept even when the run fails or is cancelled
+            if self.cache is not None:
+                self.cache.put_many(entries)
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+
+    def _prepare(self) -> tuple:
+        """Resolve carried, checkpointed, cached and cascaded scores; return what still needs the judge."""
+        rows = self.get_rows()
+        self.unscored = []
+        self.score_sources = {}
+        self.context_memo.clear()
+        names = [self._score_name(m) for m in self.real_metrics]
+        configs = {self._score_name(m): self._metric_config(m) for m in self.real_metrics}
+        scores = {name: [None] * len(rows) for name in names}
+        if self.manifest is not None:
+            print(f"Incremental run against previous manifest: {self.manifest.diff(rows)}")
+        completed = {}
+        if self.checkpoint is not None:
+            completed = self.checkpoint.start(configs)
+        groups = self._gate(rows, self._pending_rows(rows, scores, completed), scores)
+        self.judge_units = sum(len(pending) * len(metrics) for pending, metrics in groups.items())
+        return rows, names, configs, scores, groups
+
+    def _finish(self, rows: List[Dict[str, Any]], names: List[str], configs: Dict[str, Any],
+                scores: Dict[str, List[Any]]) -> EvaluationResult:
+        import pandas as pd
+        if self.cascade is not None:
+            self.cascade.print_summary()
+        store = self.context_store.stats()
+        if store["references"] > store["unique_chunks"]:
+            print(f"Context store: {store['unique_chunks']} unique chunks for {store['references']} references; "
+                  f"{self.context_memo.hits} context results reused")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"Score cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        if self.scheduler is not None and (self.scheduler.timeouts or self.scheduler.hedges):
+            print(f"Judge calls: {self.scheduler.stats()}")
+        if self.manifest is not None:
+            # Like the score cache and checkpoint, the manifest only keeps judge scores; the cascade's local
+            # scores are not part of the metric config a later run would match them on
+            judged = {name: [None if self.score_sources.get(name, {}).get(i) == "cascade" else score
+                             for i, score in enumerate(values)] for name, values in scores.items()}
+            self.manifest.update(rows, configs, judged)
+            self.manifest.save()
+        table = rows.to_pandas() if isinstance(rows, TestCaseStore) else pd.DataFrame(rows)
+        for name in names:
+            table[name] = pd.to_numeric(pd.Series(scores[name], dtype="object"), errors="coerce")
+        for name in names:
+            # Cheap cascade, batched and per-row judge scores share the metric column; this says which is which
+            sources = self.score_sources.get(name, {})
+            default = "batched" if name.endswith("_batched") else "judge"
+            table[f"{name}_source"] = [None if score is None else sources.get(i, default)
+                                       for i, score in enumerate(scores[name])]
+        result = EvaluationResult(table, names, configs, list(self.unscored))
+        if self.unscored:
+            print(f"{len(self.unscored)} row/metric scores unscored; coverage: "
+                  + ", ".join(f"{name} {value:.1%}" for name, value in result.coverage.items()))
+        return result
+
+    def _run(self) -> EvaluationResult:
+        rows, names, configs, scores, groups = self._prepare()
+        self._dispatch(rows, groups, scores)
+        return self._finish(rows, names, configs, scores)
+
+    async def _arun(self) -> EvaluationResult:
+        """Evaluate inside the running event loop; requires a scheduler, which may be shared with other evaluators."""
+        if self.scheduler is None:
+            raise ValueError("Evaluating inside an event loop needs a scheduler; call set_scheduler() first.")
+        rows, names, configs, scores, groups = self._prepare()
+        await self._adispatch(rows, groups, scores)
+        return self._finish(rows, names, configs, scores)
+
+    def evaluate_stream(self, handler: DataHandler, writer: Optional[BatchWriter] = None,
+                        batch_size: int = 1000) -> Dict[str, Any]:
+        """Evaluate a file batch by batch, writing per-row scores as they are produced."""
+        if self.manifest is not None:
+            raise ValueError("Incremental manifests need the full table; use the score cache with streaming runs.")
+        totals = {}
+        counts = {}
+        for batch_number, batch in enumerate(handler.iter_batches(batch_size)):
+            print(f"Evaluating batch {batch_number} ({len(batch)} rows)...")
+            # Clearing the store per batch keeps memory bounded; each run also starts with an empty context memo
+            self.context_store.clear()
+            self.load_frame(batch)
+            batch_result = self._run()
+            scores = batch_result.to_pandas()
+            for name in batch_result.metric_names:
+                totals[name] = totals.get(name, 0.0) + float(scores[name].sum())
+                counts[name] = counts.get(name, 0) + int(scores[name].count())
+            if writer is not None:
+                writer.write(scores)
+        if writer is not None:
+            writer.close()
+        self.results = {name: totals[name] / counts[name] if counts[name] else float("nan") for name in totals}
+        return self.results
+
+# Concrete Class for RAGAs Framework - Implements EvaluationInterface
+class RAGAsEvaluator(BaseEvaluator):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.embedding_cache = None
+        self.embedding_model = "text-embedding-ada-002"
+        self._embeddings = None
+
+    def set_embedding_cache(self, cache: EmbeddingCache, model: str = "text-embedding-ada-002") -> None:
+        """Serve embedding-based metrics (answer_relevancy) from an on-disk cache; only unseen texts are embedded."""
+        self.embedding_cache = cache
+        self.embedding_model = model
+        self._embeddings = None
+        # Metrics already prepared pick up the new embeddings on their next score
+        for metric in self.real_metrics or []:
+            metric._unit_ready = False
+
+    def embeddings(self) -> Any:
+        """Embeddings client for metrics without their own; cached when an embedding cache is set."""
+        if self._embeddings is None:
+            from ragas.embeddings import LangchainEmbeddingsWrapper
+            embeddings = LangchainEmbeddingsWrapper(get_registry().embeddings(self.embedding_model))
+            if self.embedding_cache is not None:
+                from embedding_cache import CachedEmbeddings
+                embeddings = LangchainEmbeddingsWrapper(
+                    CachedEmbeddings(embeddings.embeddings, self.embedding_cache, self.embedding_model),
+                    run_config=embeddings.run_config,
+                )
+            self._embeddings = embeddings
+        return self._embeddings
     
     def load_dataset(self, dataset_path: Any= None, dataset: Dataset= None) -> None:
         print("Loading dataset in RAGAs format...")
-        if dataset:
+        if dataset is not None:
+            # The Dataset's Arrow table is stored as is; rows are only decoded when scored
             self.dataset = dataset
+            table = dataset.with_format("arrow")[:] if hasattr(dataset, "with_format") else dataset
+            self.store = DatasetAdapter().to_store(table)
         else:
-            # loads the dataset
-            handler = DataHandler(dataset_path)
-            data = handler.get_data()
-            # Converts data into the RAGAs required format
-            data_adapter = DatasetAdapter()
-            self.dataset = data_adapter.adapt_dataset(data=dataset, data_path=dataset_path, target_framework= "RAGAs")
+            # Rows are read into the compact store; RAGAs datasets are built per scored chunk. No context store:
+            # the store already keeps repeated passages once, and no RAGAs judge work is memoized per context
+            self.store = DatasetAdapter().to_store(data=None, data_path=dataset_path)
         return self.dataset
     
     def set_metrics(self, metrics: List[str]) -> List[str]:
         # Configures the RAGAs-specific metrics
         print("Setting RAGAs-specific metrics...")
-        raga_metrics = RAGAsMetricStrategy()
-        self.real_metrics = raga_metrics.configure_metrics(metrics)
+        with stage("configure_metrics", framework="RAGAs", metrics=list(metrics)):
+            raga_metrics = RAGAsMetricStrategy(self.judge_model)
+            # Registry metrics are shared by every evaluator in the process; this evaluator's embeddings are
+            # attached to its own copies
+            self.real_metrics = [copy.copy(m) for m in raga_metrics.configure_metrics(metrics)]
         return self.real_metrics
     
+    def load_frame(self, data: pd.DataFrame) -> None:
+        self.dataset = None
+        self.store = DatasetAdapter().to_store(data)
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        return self.store
+
+    def metric_name(self, metric: Any) -> str:
+        return metric.name
+
+    def score_rows(self, indices: List[int], metrics: List[Any]) -> pd.DataFrame:
+        from ragas import evaluate as ragas_evaluate
+        from datasets import Dataset
+        from datasets.table import InMemoryTable
+        for metric in metrics:
+            self._attach_embeddings(metric)
+        result = ragas_evaluate(
+            Dataset(InMemoryTable(self.store.to_arrow(indices))),
+            metrics=metrics,
+            embeddings=self.embeddings(),
+        )
+        frame = result.to_pandas()
+        frame.index = indices
+        return frame[[metric.name for metric in metrics]]
+
+    def _attach_embeddings(self, metric: Any) -> None:
+        # Metrics without their own embeddings use this evaluator's, replaced when its embedding cache changes
+        from ragas.metrics.base import MetricWithEmbeddings
+        if isinstance(metric, MetricWithEmbeddings) and (metric.embeddings is None
+                                                         or getattr(metric, "_evaluator_embeddings", False)):
+            metric.embeddings = self.embeddings()
+            metric._evaluator_embeddings = True
+
+    def _prepare_metric(self, metric: Any) -> None:
+        # ragas.evaluate() attaches default models and initialises metrics; do the same for direct scoring
+        if getattr(metric, "_unit_ready", False):
+            return
+        from ragas.llms import LangchainLLMWrapper
+        from ragas.metrics.base import MetricWithLLM
+        from ragas.run_config import RunConfig
+        if isinstance(metric, MetricWithLLM) and metric.llm is None:
+            # ragas' llm_factory() default judge, on the registry's shared connection pools
+            metric.llm = LangchainLLMWrapper(get_registry().chat_model(RAGAS_DEFAULT_JUDGE), RunConfig())
+        self._attach_embeddings(metric)
+        metric.init(RunConfig())
+        metric._unit_ready = True
+
+    async def ascore_unit(self, index: int, metric: Any) -> float:
+        self._prepare_metric(metric)
+        return await metric.ascore(self.store[index].to_ragas())
+
     def evaluate(self) -> Dict[str, Any]:
         # Executes the RAGAs evaluation process and returns the results
         print("Evaluating using RAGAs framework...")
-        self.results = evaluate(
-            self.dataset,
-            metrics=self.real_metrics,
-        )
+        with stage("evaluate", framework="RAGAs"):
+            self.results = self._run()
         return self.results
 
-# Concrete Class for DeepEval Framework - Implements EvaluationInterface
-class DeepEvalEvaluator(EvaluationInterface):
+# DeepEval reports metrics by display name; map them to the common metric names
+DEEPEVAL_METRIC_NAMES = {
+    "Answer Relevancy": "answer_relevancy",
+    "Faithfulness": "faithfulness",
+    "Contextual Recall": "context_recall",
+    "Contextual Precision": "context_precision",
+    "Hallucination": "hallucination",
+}
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.dataset = None
-        self.real_metrics = None
-        self.results = None
+# Order in which DeepEval metrics are configured and reported
+DEEPEVAL_METRIC_ORDER = ["context_recall", "context_precision", "faithfulness", "answer_relevancy"]
+
+# Concrete Class for DeepEval Framework - Implements EvaluationInterface
+class DeepEvalEvaluator(BaseEvaluator):
     
     def load_dataset(self, dataset: EvaluationDataset= None, dataset_path:Any=None) -> None:
         # Converts and loads the dataset into the DeepEval required format
+        from deepeval.dataset import EvaluationDataset
         print("Loading dataset in DeepEval format...")
-        # Converts data into the RAGAs required format
-        data_adapter = DatasetAdapter()
-        self.dataset = data_adapter.adapt_dataset(data=dataset, data_path=dataset_path, target_framework= "DeepEval")
+        if isinstance(dataset, EvaluationDataset):
+            # Test cases built by the caller are scored as given
+            self.dataset = dataset
+            self.store = None
+            return
+        # Rows are read into the compact store; test cases are built only for the rows being scored
+        self.dataset = None
+        self.store = DatasetAdapter(self.context_store).to_store(data=dataset, data_path=dataset_path)
     
     def set_metrics(self, metrics: List[str]) -> None:
         # Configures the DeepEval-specific metrics
         print("Setting DeepEval-specific metrics...")
-        faithfulness_metric = FaithfulnessMetric(
-            threshold=0.7,
-            model="gpt-4",
-            include_reason=False
-        )
-        context_recall_metric = ContextualRecallMetric(
-            threshold=0.7,
-            model="gpt-4",
-            include_reason=False
-        )
-        context_precision_metric = ContextualPrecisionMetric(
-            threshold=0.7,
-            model="gpt-4",
-            include_reason=False
-        )
-        # hallucination_metric = HallucinationMetric(threshold=0.3)
-        answer_relevancy_metric = AnswerRelevancyMetric(threshold=0.5)
-        self.real_metrics = [context_recall_metric, context_precision_metric, \
-                             faithfulness_metric, answer_relevancy_metric]
+        from context_store import memoize_context_truths
+        with stage("configure_metrics", framework="DeepEval", metrics=list(metrics)):
+            unknown = [m for m in metrics if m not in DEEPEVAL_METRIC_ORDER]
+            if unknown:
+                raise ValueError(f"Unknown DeepEval metric: {', '.join(unknown)}")
+            if not metrics:
+                raise ValueError("No metrics to evaluate.")
+            # Keep only the requested metrics so single-metric runs pay for a single metric
+            requested = [m for m in DEEPEVAL_METRIC_ORDER if m in metrics]
+            configured = DeepEvalMetricStrategy(self.judge_model).configure_metrics(requested)
+            # The registry's instances are shared; each evaluator memoizes truths on its own shallow copy
+            self.real_metrics = [memoize_context_truths(copy.copy(m), self.context_memo, self.context_store)
+                                 for m in configured]
     
+    def load_frame(self, data: pd.DataFrame) -> None:
+        self.dataset = None
+        self.store = DatasetAdapter(self.context_store).to_store(data)
+
+    def test_case(self, index: int) -> Any:
+        """The DeepEval test case for one row."""
+        if self.store is not None:
+            return self.store[index].to_test_case()
+        return self.dataset.test_cases[index]
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        if self.store is not None:
+            return self.store
+        return [
+            normalize_row({
+                "question": test_case.input,
+                "answer": test_case.actual_output,
+                "contexts": test_case.retrieval_context,
+                "ground_truth": test_case.expected_output,
+            })
+            for test_case in self.dataset.test_cases
+        ]
+
+    def metric_name(self, metric: Any) -> str:
+        return DEEPEVAL_METRIC_NAMES.get(metric.__name__, metric.__name__)
+
+    def score_rows(self, indices: List[int], metrics: List[Any]) -> pd.DataFrame:
+        import pandas as pd
+        from deepeval import evaluate as deepeval_evaluate
+        test_cases = [self.test_case(i) for i in indices]
+        # Failed metrics come back without a score instead of aborting the whole batch
+        test_results = deepeval_evaluate(test_cases, metrics, ignore_errors=True)
+        # Test results are not guaranteed to come back in submission order
+        positions = {}
+        for i, test_case in zip(indices, test_cases):
+            key = (test_case.input, test_case.actual_output, test_case.expected_output)
+            positions.setdefault(key, []).append(i)
+        frame = pd.DataFrame(index=indices, columns=[self.metric_name(m) for m in metrics], dtype=float)
+        for test_result in test_results:
+            key = (test_result.input, test_result.actual_output, test_result.expected_output)
+            i = positions[key].pop(0)
+            metrics_data = getattr(test_result, "metrics_metadata", None) or getattr(test_result, "metrics_data", [])
+            for metric_data in metrics_data:
+                display_name = getattr(metric_data, "metric", None) or getattr(metric_data, "name", None)
+                frame.at[i, DEEPEVAL_METRIC_NAMES.get(display_name, display_name)] = metric_data.score
+        return frame
+
+    async def ascore_unit(self, index: int, metric: Any) -> float:
+        # Metrics keep per-measurement state, so concurrent units each measure on their own copy
+        unit_metric = copy.copy(metric)
+        await unit_metric.a_measure(self.test_case(index))
+        return unit_metric.score
+
     def evaluate(self) -> Dict[str, Any]:
         # Executes the DeepEval evaluation process and returns the results
         print("Evaluating using DeepEval framework...")
-        # You can also call the evaluate() function directly
-        self.results = evaluate(self.dataset, self.real_metrics)
+        with stage("evaluate", framework="DeepEval"):
+            self.results = self._run()
         return self.results
 
 # Factory Pattern Implementation for Framework Selection
 class FrameworkFactory:
     
     @staticmethod
-    def get_evaluator(framework: str) -> EvaluationInterface:
+    def get_evaluator(framework: str, shards: Optional[int] = None) -> EvaluationInterface:
         """Factory method to return the appropriate evaluator based on the framework."""
+        if shards is not None:
+            from sharding import ShardedEvaluator
+            return ShardedEvaluator(framework, shards)
         if framework == "RAGAs":
             return RAGAsEvaluator()
         elif framework == "DeepEval":
@@ -182,48 +887,115 @@ class FrameworkFactory:
 # Adapter Pattern for Dataset Conversion
 class DatasetAdapter:
 
+    def __init__(self, context_store: Optional[ContextStore] = None) -> None:
+        self.context_store = context_store
+
+    @staticmethod
+    def to_arrow(data: Any, context_store: Optional[ContextStore] = None, keep_extra: bool = False) -> pa.Table:
+        """Arrow table with the common column names and contexts as list<string>.
+
+        With a context store, contexts are interned and stored as list<dictionary<int32, string>>. With keep_extra,
+        columns that are not one of the common fields (category, source, ...) follow them unchanged.
+        """
+        import pyarrow as pa
+        raw_contexts = None
+        if isinstance(data, pa.Table):
+            table = data
+        elif isinstance(data, pa.RecordBatch):
+            table = pa.Table.from_batches([data])
+        else:
+            name = next((alias for alias in ROW_COLUMN_ALIASES["contexts"] if alias in data.columns), None)
+            if context_store is not None and name is not None:
+                # Contexts go straight into the store, never copied into Arrow once per row
+                raw_contexts = data[name].tolist()
+                data = data.drop(columns=[name])
+            table = pa.Table.from_pandas(data, preserve_index=False)
+        columns = {}
+        for field, aliases in ROW_COLUMN_ALIASES.items():
+            if field == "contexts" and raw_contexts is not None:
+                columns[field] = context_store.encode([parse_contexts(v) for v in raw_contexts])
+                continue
+            name = next((alias for alias in aliases if alias in table.column_names), None)
+            if name is None:
+                continue
+            column = table.column(name)
+            is_list = pa.types.is_list(column.type) or pa.types.is_large_list(column.type)
+            if field == "contexts" and context_store is not None:
+                column = context_store.encode([parse_contexts(v) for v in column.to_pylist()])
+            elif field == "contexts" and not is_list:
+                # Lists stored as text (CSV/Excel) are parsed once here, never split on a delimiter
+                column = pa.array([parse_contexts(v) for v in column.to_pylist()], type=pa.list_(pa.string()))
+            elif field == "ground_truth":
+                values = column.to_pylist()
+                if is_list or any(isinstance(v, str) and v.lstrip().startswith("[") for v in values):
+                    column = pa.array([parse_ground_truth(v) for v in values], type=pa.string())
+            columns[field] = column
+        if keep_extra:
+            aliases = {alias for names in ROW_COLUMN_ALIASES.values() for alias in names}
+            for name in table.column_names:
+                if name not in aliases and name not in columns:
+                    columns[name] = table.column(name)
+        return pa.table(columns)
+
+    def to_store(self, data: Any, data_path: Any = None) -> TestCaseStore:
+        """Compact row store of a DataFrame or Arrow table, or of the file at data_path when data is None.
+
+        With a context store, the store's passage counts are registered for context-only judge work.
+        """
+        if data is None:
+            data = DataHandler(data_path, stream=True).get_table()
+        with stage("adapt", framework="store"):
+            store = TestCaseStore.from_arrow(self.to_arrow(data, keep_extra=True))
+            if self.context_store is not None:
+                self.context_store.register(store)
+        return store
+
     def adapt_dataset(self, data: Any, data_path: Any, target_framework: str) -> Any:
         """Converts the input dataset into the format required by the target framework."""
-        if target_framework == "RAGAs":
-            print("Adapting dataset to RAGAs format...")
-            data_dict = {
-                "question": data["question"].values.tolist(),
-                "answer": data["answer"].values.tolist(),
-                "contexts": data["contexts"].values.tolist(),
-                "ground_truth": data["ground_truth"].values.tolist()
-            }
-            dataset = Dataset.from_dict(data_dict)
-            # Perform conversion to RAGAs format
-        elif target_framework == "DeepEval":
-            print("Adapting dataset to DeepEval format...")
-            # Perform conversion to DeepEval format
-            dataset = EvaluationDataset()
-            dataset.add_test_cases_from_csv_file(
-                # file_path is the absolute path to you .csv file
-                file_path=data_path,
-                input_col_name="query",
-                actual_output_col_name="actual_output",
-                expected_output_col_name="expected_output",
-                # context_col_name="context",
-                # context_col_delimiter= "|",
-                # retrieval_context_col_name="retrieval_context",
-                # retrieval_context_col_delimiter= "|"
-            )
+        if data is None:
+            # The file is parsed exactly once, whichever framework consumes it
+            data = DataHandler(data_path).get_data()
+        with stage("adapt", framework=target_framework):
+            table = self.to_arrow(data, self.context_store)
+            if target_framework == "RAGAs":
+                from datasets import Dataset
+                from datasets.table import InMemoryTable
+                print("Adapting dataset to RAGAs format...")
+                # Perform conversion to RAGAs format, wrapping the Arrow table without copying it
+                dataset = Dataset(InMemoryTable(table))
+            elif target_framework == "DeepEval":
+                from deepeval.dataset import EvaluationDataset
+                print("Adapting dataset to DeepEval format...")
+                # Perform conversion to DeepEval format, building test cases row by row from the compact store;
+                # test cases share one string object per passage repeated across rows
+                dataset = EvaluationDataset()
+                for test_case in TestCaseStore.from_arrow(table).iter_test_cases():
+                    dataset.add_test_case(test_case)
+            else:
+                raise ValueError("Unknown framework")
         return dataset
 
 # Abstract Class for Metric Strategy - Strategy Pattern
 class MetricStrategy(ABC):
-    
+
+    def __init__(self, judge_model: Optional[str] = None) -> None:
+        # None keeps each metric's default judge model
+        self.judge_model = judge_model
+
     @abstractmethod
     def configure_metrics(self, metrics: List[str]) -> List[Any]:
         """Abstract method for configuring metrics."""
         pass
 
+# Judge model ragas attaches to metrics without one (ragas.llms.llm_factory's default)
+RAGAS_DEFAULT_JUDGE = "gpt-4o-mini"
+
 # Concrete Class for RAGAs Metric Strategy - Implements MetricStrategy
 class RAGAsMetricStrategy(MetricStrategy):
     
     def configure_metrics(self, metrics: List[str]) -> List[Any]:
         # Configure RAGAs-specific metrics
+        from ragas.metrics import answer_relevancy, context_precision, context_recall, faithfulness
         print("Configuring RAGAs-specific metrics...")
         metric_map = {
             "answer_relevancy": answer_relevancy,
@@ -231,12 +1003,26 @@ class RAGAsMetricStrategy(MetricStrategy):
             "context_recall": context_recall,
             "context_precision": context_precision
         }
+        model = self.judge_model or RAGAS_DEFAULT_JUDGE
+        registry = get_registry()
         actual_metrics = []
         for m in metrics:
             actual_metric = metric_map.get(m)
             if actual_metric is None:
                 raise ValueError
-            actual_metrics.append(actual_metric)
+
+            def build(actual_metric=actual_metric):
+                from ragas.llms import LangchainLLMWrapper
+                from ragas.run_config import RunConfig
+                # ragas metrics are module singletons; each judge model gets its own copy. Attaching the model
+                # up front keeps it in cache keys computed before the first judge call
+                metric = copy.copy(actual_metric)
+                if hasattr(metric, "llm"):
+                    metric.llm = LangchainLLMWrapper(registry.chat_model(model), RunConfig())
+                metric._unit_ready = False
+                return metric
+
+            actual_metrics.append(registry.metric("RAGAs", m, build, model=model))
         return actual_metrics
 
 # Concrete Class for DeepEval Metric Strategy - Implements MetricStrategy
@@ -244,17 +1030,34 @@ class DeepEvalMetricStrategy(MetricStrategy):
     
     def configure_metrics(self, metrics: List[str]) -> List[Any]:
         # Configure DeepEval-specific metrics
+        from deepeval.metrics import (
+            AnswerRelevancyMetric,
+            ContextualPrecisionMetric,
+            ContextualRecallMetric,
+            FaithfulnessMetric,
+        )
         print("Configuring DeepEval-specific metrics...")
+        # (metric class, judge model, constructor options); None uses DeepEval's default judge model
         metric_map = {
-            "answer_relevancy": AnswerRelevancyMetric,
-            "faithfulness": FaithfulnessMetric,
-            "context_recall": ContextualRecallMetric,
-            "context_precision": ContextualPrecisionMetric
+            "answer_relevancy": (AnswerRelevancyMetric, None, {"threshold": 0.5}),
+            "faithfulness": (FaithfulnessMetric, "gpt-4", {"threshold": 0.7, "include_reason": False}),
+            "context_recall": (ContextualRecallMetric, "gpt-4", {"threshold": 0.7, "include_reason": False}),
+            "context_precision": (ContextualPrecisionMetric, "gpt-4", {"threshold": 0.7, "include_reason": False}),
         }
+        registry = get_registry()
         actual_metrics = []
         for m in metrics:
-            actual_metric = metric_map.get(m)
-            if actual_metric is None:
-                raise ValueError
-            actual_metrics.append(actual_metric)
+            if m not in metric_map:
+                raise ValueError(f"Unknown DeepEval metric: {m}")
+            metric_class, model, options = metric_map[m]
+            model = self.judge_model or model
+
+            def build(metric_class=metric_class, model=model, options=options):
+                metric = metric_class(model=model, **options)
+                # DeepEval builds a new chat client on every judge call; the pooled model reuses one
+                metric.model = registry.deepeval_model(model)
+                return metric
+
+            # Built once per process and reused by every evaluator and evaluate() call
+            actual_metrics.append(registry.metric("DeepEval", m, build, model=model, **options))
         return actual_metrics
\ No newline at end of file
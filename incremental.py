@@ -0,0 +1,103 @@
+import json
+import math
+import os
+from typing import List, Dict, Any, Optional
+
+from score_cache import normalize_row, row_fingerprint
+
+
+class ManifestDiff:
+    """Row-level differences between the current dataset and the previous run's manifest."""
+
+    def __init__(self, added: List[int], modified: List[int], unchanged: List[int], removed: int) -> None:
+        self.added = added
+        self.modified = modified
+        self.unchanged = unchanged
+        self.removed = removed
+
+    def changed(self) -> List[int]:
+        """Indices of rows that need scoring."""
+        return sorted(self.added + self.modified)
+
+    def __repr__(self) -> str:
+        return (f"ManifestDiff(added={len(self.added)}, modified={len(self.modified)}, "
+                f"unchanged={len(self.unchanged)}, removed={self.removed})")
+
+
+class RunManifest:
+    """Fingerprints and scores of every row from the previous run, stored as JSON."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.metrics = {}
+        self.rows = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+            self.metrics = content.get("metrics", {})
+            self.rows = content.get("rows", {})
+
+    @staticmethod
+    def row_keys(rows: List[Dict[str, Any]]) -> List[str]:
+        """Identity of each row; the question text, disambiguated when it repeats."""
+        seen = {}
+        keys = []
+        for row in rows:
+            question = normalize_row(row)["question"] or ""
+            count = seen.get(question, 0)
+            seen[question] = count + 1
+            keys.append(question if count == 0 else f"{question}#{count}")
+        return keys
+
+    def diff(self, rows: List[Dict[str, Any]]) -> ManifestDiff:
+        """Compare rows against the manifest by identity and content fingerprint."""
+        added, modified, unchanged = [], [], []
+        keys = self.row_keys(rows)
+        for i, (key, row) in enumerate(zip(keys, rows)):
+            previous = self.rows.get(key)
+            if previous is None:
+                added.append(i)
+            elif previous["fingerprint"] != row_fingerprint(row):
+                modified.append(i)
+            else:
+                unchanged.append(i)
+        removed = len(set(self.rows) - set(keys))
+        return ManifestDiff(added, modified, unchanged, removed)
+
+    def carried_scores(self, metric_name: str, config: Dict[str, Any],
+                       rows: List[Dict[str, Any]]) -> Dict[int, float]:
+        """Scores from the previous run for unchanged rows, if the metric config is the same."""
+        if self.metrics.get(metric_name) != json.loads(json.dumps(config, default=str)):
+            return {}
+        carried = {}
+        for i, (key, row) in enumerate(zip(self.row_keys(rows), rows)):
+            previous = self.rows.get(key)
+            if previous is None or previous["fingerprint"] != row_fingerprint(row):
+                continue
+            score = previous["scores"].get(metric_name)
+            if score is not None:
+                carried[i] = score
+        return carried
+
+    def update(self, rows: List[Dict[str, Any]], configs: Dict[str, Dict[str, Any]],
+               scores: Dict[str, List[Optional[float]]]) -> None:
+        """Replace the manifest contents with the current rows and their scores."""
+        self.metrics = json.loads(json.dumps(configs, default=str))
+        self.rows = {}
+        for i, (key, row) in enumerate(zip(self.row_keys(rows), rows)):
+            row_scores = {}
+            for name, values in scores.items():
+                value = values[i]
+                if value is not None and not math.isnan(float(value)):
+                    row_scores[name] = float(value)
+            self.rows[key] = {"fingerprint": row_fingerprint(row), "scores": row_scores}
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so an interrupted save keeps the old manifest
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"metrics": self.metrics, "rows": self.rows}, f)
+        os.replace(tmp_path, self.path)
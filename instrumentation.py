@@ -0,0 +1,217 @@
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Optional
+
+# USD per 1K (prompt, completion) tokens, used when the client does not report a cost
+MODEL_PRICES = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-3.5-turbo-16k": (0.003, 0.004),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD from the price table; unknown models cost 0."""
+    prompt_price, completion_price = MODEL_PRICES.get(model or "", (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000.0
+
+
+class TokenUsage:
+    """Token counts and cost reported by the judge client during one call."""
+
+    def __init__(self) -> None:
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.requests = 0
+
+
+# The OpenAI callback of the innermost token_usage() block, fed by the forwarder on the pooled chat models
+_usage_callback = ContextVar("usage_callback", default=None)
+
+
+@lru_cache(maxsize=None)
+def usage_forwarder() -> Any:
+    """langchain callback handler for chat models: reports each reply to the enclosing token_usage() block.
+
+    DeepEval's GPTModel opens its own get_openai_callback() around every judge call, which hides an outer one;
+    a handler attached to the chat model itself still sees those calls.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class UsageForwarder(BaseCallbackHandler):
+        run_inline = True
+
+        def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+            callback = _usage_callback.get()
+            if callback is not None:
+                callback.on_llm_end(response, **kwargs)
+
+    return UsageForwarder()
+
+
+@contextmanager
+def token_usage():
+    """Collect token usage from langchain OpenAI clients (used by both frameworks) inside the block."""
+    usage = TokenUsage()
+    try:
+        from langchain_community.callbacks import get_openai_callback
+        from langchain_community.callbacks.openai_info import OpenAICallbackHandler
+    except ImportError:
+        yield usage
+        return
+    forwarded = OpenAICallbackHandler()
+    token = _usage_callback.set(forwarded)
+    # Both callbacks are bound to the current context, so concurrent asyncio tasks are counted separately
+    with get_openai_callback() as callback:
+        try:
+            yield usage
+        finally:
+            _usage_callback.reset(token)
+            # Pooled chat models report through the forwarder, other langchain clients through the callback
+            source = forwarded if forwarded.successful_requests >= callback.successful_requests else callback
+            usage.prompt_tokens = source.prompt_tokens
+            usage.completion_tokens = source.completion_tokens
+            usage.cost = source.total_cost
+            usage.requests = source.successful_requests
+
+
+class Tracer:
+    """Collects pipeline stage spans and per-row, per-metric judge call records for one run."""
+
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        self.run_id = run_id or uuid.uuid4().hex
+        self.spans = []
+        self.calls = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any):
+        span = {
+            "trace_id": self.run_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_span_id": self._stack[-1]["span_id"] if self._stack else None,
+            "name": name,
+            "start_time_unix_nano": time.time_ns(),
+            "attributes": dict(attributes),
+        }
+        self._stack.append(span)
+        try:
+            yield span["attributes"]
+        finally:
+            self._stack.pop()
+            span["end_time_unix_nano"] = time.time_ns()
+            self.spans.append(span)
+
+    def record_call(self, row: int, metric: str, model: Optional[str], latency: Optional[float],
+                    retries: int, usage: Optional[TokenUsage], estimated_prompt_tokens: int = 0,
+                    error: Optional[BaseException] = None) -> None:
+        """Record one judge unit; token counts fall back to the offline estimate when not reported."""
+        prompt_tokens = usage.prompt_tokens if usage is not None else 0
+        completion_tokens = usage.completion_tokens if usage is not None else 0
+        estimated = prompt_tokens == 0 and error is None
+        if estimated:
+            prompt_tokens = estimated_prompt_tokens
+        cost = usage.cost if usage is not None and usage.cost else estimate_cost(model, prompt_tokens, completion_tokens)
+        self.calls.append({
+            "run_id": self.run_id,
+            "row": row,
+            "metric": metric,
+            "model": model,
+            "latency_s": latency,
+            "retries": retries,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": estimated,
+            "cost_usd": cost,
+            "error": repr(error) if error is not None else None,
+            "end_time_unix_nano": time.time_ns(),
+        })
+
+    def export_jsonl(self, path: str) -> None:
+        """Write stage spans and judge calls as OpenTelemetry-style span records, one per line."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in self.spans:
+                f.write(json.dumps(span, default=str) + "\n")
+            for call in self.calls:
+                end = call["end_time_unix_nano"]
+                f.write(json.dumps({
+                    "trace_id": self.run_id,
+                    "span_id": uuid.uuid4().hex[:16],
+                    "parent_span_id": None,
+                    "name": f"judge_call/{call['metric']}",
+                    "start_time_unix_nano": end - int((call["latency_s"] or 0.0) * 1e9),
+                    "end_time_unix_nano": end,
+                    "attributes": call,
+                }, default=str) + "\n")
+
+    def stage_summary(self):
+        """Wall time per pipeline stage."""
+        import pandas as pd
+        rows = [{"stage": s["name"], "seconds": (s["end_time_unix_nano"] - s["start_time_unix_nano"]) / 1e9}
+                for s in self.spans]
+        if not rows:
+            return pd.DataFrame(columns=["stage", "calls", "seconds"])
+        frame = pd.DataFrame(rows)
+        return frame.groupby("stage", sort=False).agg(calls=("seconds", "size"), seconds=("seconds", "sum")).reset_index()
+
+    def call_summary(self):
+        """Latency, retries, tokens and cost per metric and model."""
+        import pandas as pd
+        if not self.calls:
+            return pd.DataFrame(columns=["metric", "model", "calls"])
+        frame = pd.DataFrame(self.calls)
+        summary = frame.groupby(["metric", "model"], dropna=False).agg(
+            calls=("row", "size"),
+            errors=("error", "count"),
+            total_latency_s=("latency_s", "sum"),
+            p50_latency_s=("latency_s", "median"),
+            p99_latency_s=("latency_s", lambda s: s.quantile(0.99)),
+            retries=("retries", "sum"),
+            prompt_tokens=("prompt_tokens", "sum"),
+            completion_tokens=("completion_tokens", "sum"),
+            cost_usd=("cost_usd", "sum"),
+        ).reset_index()
+        return summary.sort_values("total_latency_s", ascending=False)
+
+    def print_summary(self) -> None:
+        print("Stage timings:")
+        print(self.stage_summary().to_string(index=False))
+        print("Judge calls by metric:")
+        print(self.call_summary().to_string(index=False))
+
+
+# The active tracer lets DataHandler, DatasetAdapter and the evaluators report without threading it through
+_active_tracer = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    global _active_tracer
+    _active_tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _active_tracer
+
+
+@contextmanager
+def stage(name: str, **attributes: Any):
+    """Time a pipeline stage on the active tracer; a no-op when tracing is off."""
+    if _active_tracer is None:
+        yield dict(attributes)
+        return
+    with _active_tracer.stage(name, **attributes) as span_attributes:
+        yield span_attributes
@@ -0,0 +1,271 @@
+"""Runs a matrix of evaluation jobs from config.yaml as one deduplicated work graph.
+
+Each job is one dataset x framework x metric set x judge model. Every job's pending judge calls are collected
+into a single graph keyed by (framework, metric, metric config, row content); a call requested by several jobs
+is made once and its score is recorded in each of them. All calls go through one shared scheduler, so
+independent jobs run concurrently under a single concurrency and rate-limit budget.
+Run from the repository root:
+    python job_runner.py --config config.yaml
+    python job_runner.py --config config.yaml --jobs amnesty-deepeval-gpt-4 --dry-run
+"""
+import argparse
+import itertools
+import os
+import time
+from functools import partial
+from typing import List, Dict, Any, Optional
+
+from client_registry import get_registry
+from eval import DataHandler, EvaluationResult, FrameworkFactory
+from instrumentation import Tracer, get_tracer, set_tracer, stage
+from scheduler import JudgeScheduler, JudgeUnit, RateLimits, estimate_tokens
+from score_cache import ScoreCache, metric_config
+
+
+class Job:
+    """One evaluation job of the matrix and, once run, its result."""
+
+    def __init__(self, name: str, dataset: str, framework: str, metrics: List[str],
+                 judge_model: Optional[str] = None) -> None:
+        self.name = name
+        self.dataset = dataset
+        self.framework = framework
+        self.metrics = list(metrics)
+        self.judge_model = judge_model
+        self.evaluator = None
+        self.prepared = None
+        self.entries = []
+        self.requested = 0
+        self.plan = None
+        self.result = None
+
+    def __repr__(self) -> str:
+        return f"Job({self.name!r})"
+
+
+def _metric_sets(metrics: List[Any]) -> List[List[str]]:
+    # A flat list is one metric set; a list of lists is one job per set
+    if metrics and all(isinstance(m, str) for m in metrics):
+        return [list(metrics)]
+    return [list(m) for m in metrics]
+
+
+def expand_jobs(config: Dict[str, Any]) -> List[Job]:
+    """Jobs for every combination in config['matrix'] followed by the explicitly listed config['jobs']."""
+    jobs = []
+    matrix = config.get("matrix")
+    if matrix:
+        for dataset, framework, metrics, model in itertools.product(
+                matrix.get("datasets") or list(config.get("datasets", {})),
+                matrix["frameworks"],
+                _metric_sets(matrix["metrics"]),
+                matrix.get("judge_models") or [None]):
+            name = "-".join([dataset, framework.lower(), model or "default"] +
+                            (["+".join(metrics)] if len(_metric_sets(matrix["metrics"])) > 1 else []))
+            jobs.append(Job(name, dataset, framework, metrics, model))
+    for spec in config.get("jobs") or []:
+        name = spec.get("name") or f"{spec['dataset']}-{spec['framework'].lower()}-{spec.get('judge_model') or 'default'}"
+        jobs.append(Job(name, spec["dataset"], spec["framework"], spec["metrics"], spec.get("judge_model")))
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job names: {', '.join(duplicates)}")
+    unknown = sorted({job.dataset for job in jobs} - set(config.get("datasets", {})))
+    if unknown:
+        raise ValueError(f"Jobs use datasets missing from config['datasets']: {', '.join(unknown)}")
+    return jobs
+
+
+def _rate_limits(spec: Optional[Dict[str, Any]]) -> RateLimits:
+    spec = spec or {}
+    return RateLimits(spec.get("concurrency"), spec.get("requests_per_minute"), spec.get("tokens_per_minute"))
+
+
+class JobRunner:
+    """Prepares every job, makes each distinct judge call once and fans the scores out to the jobs that need them."""
+
+    def __init__(self, jobs: List[Job], datasets: Dict[str, Any], scheduler: Optional[JudgeScheduler] = None,
+                 cache: Optional[ScoreCache] = None) -> None:
+        if not jobs:
+            raise ValueError("No jobs to run.")
+        self.jobs = jobs
+        self.datasets = datasets
+        self.scheduler = scheduler or JudgeScheduler(RateLimits(concurrency=16))
+        self.cache = cache
+        self.graph = {}
+        self._frames = {}
+
+    def _frame(self, name: str) -> Any:
+        # Each dataset is read once, however many jobs use it
+        if name not in self._frames:
+            spec = self.datasets[name]
+            spec = spec if isinstance(spec, dict) else {"path": spec}
+            frame = DataHandler(spec["path"]).get_data()
+            if spec.get("rows") is not None:
+                frame = frame.head(int(spec["rows"]))
+            self._frames[name] = frame.reset_index(drop=True)
+        return self._frames[name]
+
+    def prepare(self) -> Dict[tuple, List[tuple]]:
+        """Resolve cached scores per job and build the graph of distinct judge calls still needed."""
+        self.graph = {}
+        for job in self.jobs:
+            print(f"Preparing job {job.name}...")
+            evaluator = FrameworkFactory.get_evaluator(job.framework)
+            evaluator.set_judge_model(job.judge_model)
+            evaluator.load_frame(self._frame(job.dataset))
+            evaluator.set_metrics(job.metrics)
+            if self.cache is not None:
+                evaluator.set_cache(self.cache)
+            job.evaluator = evaluator
+            job.prepared = evaluator._prepare()
+            rows, _, _, _, groups = job.prepared
+            for pending, metrics in groups.items():
+                for metric in metrics:
+                    name = evaluator.metric_name(metric)
+                    config = evaluator._metric_config(metric)
+                    for i in pending:
+                        # Frameworks score the same metric name differently, so they never share a call
+                        key = (job.framework, ScoreCache.make_key(name, config, rows[i]))
+                        self.graph.setdefault(key, []).append((job, i, metric))
+                        job.requested += 1
+        requested = sum(job.requested for job in self.jobs)
+        print(f"Work graph: {requested} judge calls requested by {len(self.jobs)} jobs, "
+              f"{len(self.graph)} distinct ({requested - len(self.graph)} shared)")
+        return self.graph
+
+    def _units(self) -> List[JudgeUnit]:
+        units = []
+        for key, consumers in self.graph.items():
+            # The first job to request a call makes it on behalf of all of them
+            job, i, metric = consumers[0]
+            rows = job.prepared[0]
+            units.append(JudgeUnit(key, partial(job.evaluator._traced_unit, i, metric), metric_config(metric)["model"],
+                                   estimate_tokens(list(rows[i].values()))))
+        return units
+
+    def _on_result(self, unit: JudgeUnit, result: Any, error: Optional[BaseException]) -> None:
+        consumers = self.graph[unit.key]
+        job, i, metric = consumers[0]
+        score, usage = result if error is None else (None, None)
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.record_call(i, job.evaluator.metric_name(metric), unit.model, unit.latency,
+                               unit.attempts - 1, usage, unit.tokens, error)
+        for job, i, metric in consumers:
+            if error is not None:
+                # A call that failed after its retries leaves the row unscored in every job that needs it
+                job.evaluator._record_unscored(metric, [i], error)
+                continue
+            rows, _, _, scores, _ = job.prepared
+            job.evaluator._record(rows, metric, [i], [score], scores, job.entries)
+            if self.cache is not None and len(job.entries) >= 100:
+                self.cache.put_many(job.entries)
+                job.entries.clear()
+
+    def run(self) -> Dict[str, EvaluationResult]:
+        """Run every job and return their results by job name."""
+        start = time.perf_counter()
+        if not self.graph:
+            self.prepare()
+        with stage("job_matrix", jobs=len(self.jobs), calls=len(self.graph)):
+            try:
+                get_registry().run(self.scheduler.arun(self._units(), self._on_result))
+            finally:
+                # Scores already paid for are kept even when the sweep is interrupted
+                if self.cache is not None:
+                    for job in self.jobs:
+                        self.cache.put_many(job.entries)
+                        job.entries.clear()
+        results = {}
+        for job in self.jobs:
+            rows, names, configs, scores, _ = job.prepared
+            job.result = job.evaluator._finish(rows, names, configs, scores)
+            results[job.name] = job.result
+        print(f"Ran {len(results)} jobs in {time.perf_counter() - start:.1f}s")
+        return results
+
+    def summary(self):
+        """One row per job: its matrix coordinates, judge calls requested, metric means and coverage."""
+        import pandas as pd
+        report = []
+        for job in self.jobs:
+            row = {
+                "job": job.name,
+                "dataset": job.dataset,
+                "framework": job.framework,
+                "judge_model": job.judge_model or "default",
+                "calls_requested": job.requested,
+                "status": "done" if job.result is not None else "pending",
+            }
+            if job.plan is not None:
+                row.update(job.plan)
+            if job.result is not None:
+                row["unscored"] = len(job.result.unscored)
+                row.update({f"mean_{name}": value for name, value in job.result.items()})
+                row.update({f"coverage_{name}": value for name, value in job.result.coverage.items()})
+            report.append(row)
+        return pd.DataFrame(report)
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    import yaml
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    if not config.get("datasets"):
+        raise ValueError(f"{path} defines no datasets.")
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--jobs", nargs="+", help="only run the named jobs")
+    parser.add_argument("--dry-run", action="store_true", help="build the work graph and plan its requests, tokens, cost and wall time without calling the judge")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    jobs = expand_jobs(config)
+    if args.jobs:
+        unknown = set(args.jobs) - {job.name for job in jobs}
+        if unknown:
+            raise ValueError(f"Unknown jobs: {', '.join(sorted(unknown))}")
+        jobs = [job for job in jobs if job.name in args.jobs]
+    tracer = Tracer()
+    set_tracer(tracer)
+    calls = config.get("calls") or {}
+    scheduler = JudgeScheduler(_rate_limits(config.get("limits") or {"concurrency": 16}),
+                               {model: _rate_limits(spec) for model, spec in (config.get("model_limits") or {}).items()},
+                               timeout=calls.get("timeout"), retries=calls.get("retries", 2),
+                               hedge_percentile=calls.get("hedge_percentile"))
+    cache = ScoreCache(config["cache"]) if config.get("cache") else None
+    runner = JobRunner(jobs, config["datasets"], scheduler, cache)
+    runner.prepare()
+    if args.dry_run:
+        from planner import plan_jobs
+        plan_jobs(runner, scheduler.global_limits, scheduler.model_limits)
+        print(runner.summary().to_string(index=False))
+        return
+
+    results = runner.run()
+    output = config.get("output", "./results/jobs")
+    os.makedirs(output, exist_ok=True)
+    store = None
+    if config.get("store"):
+        from results_store import ResultsStore
+        store = ResultsStore(config["store"])
+    for job in jobs:
+        results[job.name].to_pandas().to_csv(os.path.join(output, f"{job.name}.csv"), index=False)
+        if store is not None:
+            store.write_run(results[job.name], job.framework, run_id=f"{tracer.run_id}-{job.name}",
+                            config={"job": job.name, "dataset": job.dataset, "judge_model": job.judge_model,
+                                    **results[job.name].configs})
+    summary = runner.summary()
+    summary.to_csv(os.path.join(output, "summary.csv"), index=False)
+    tracer.export_jsonl(os.path.join(output, "trace.jsonl"))
+    tracer.print_summary()
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
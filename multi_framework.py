@@ -0,0 +1,115 @@
+import asyncio
+import time
+from typing import List, Dict, Any, Optional
+
+from client_registry import get_registry
+from eval import DataHandler, EvaluationInterface, EvaluationResult, FrameworkFactory
+from instrumentation import stage
+from scheduler import JudgeScheduler, RateLimits
+
+ROW_COLUMNS = ["question", "answer", "contexts", "ground_truth"]
+
+
+def score_column(metric: str, framework: str) -> str:
+    """Column of the comparison table holding one framework's scores for one metric."""
+    return f"{metric}_{framework.lower()}"
+
+
+# Concrete Class for side-by-side framework runs - Implements EvaluationInterface over several evaluators
+class MultiFrameworkEvaluator(EvaluationInterface):
+
+    def __init__(self, frameworks: Optional[List[str]] = None, scheduler: Optional[JudgeScheduler] = None) -> None:
+        super().__init__()
+        self.frameworks = list(frameworks or ["RAGAs", "DeepEval"])
+        if len(set(self.frameworks)) != len(self.frameworks):
+            raise ValueError("Each framework can only be compared once.")
+        self.evaluators = {framework: FrameworkFactory.get_evaluator(framework) for framework in self.frameworks}
+        # One scheduler for every framework, so they draw on a single concurrency and rate-limit budget
+        self.scheduler = scheduler or JudgeScheduler(RateLimits(concurrency=16))
+        self.metrics = None
+        self.results = None
+        self.framework_results = {}
+
+    def load_dataset(self, dataset_path: Any = None, dataset: Any = None) -> None:
+        # The file is read once; each framework only adapts the shared frame to its own format
+        print(f"Loading dataset once for {', '.join(self.frameworks)}...")
+        data = dataset if dataset is not None else DataHandler(dataset_path).get_data()
+        self.load_frame(data)
+
+    def load_frame(self, data: Any) -> None:
+        for evaluator in self.evaluators.values():
+            evaluator.load_frame(data)
+
+    def set_metrics(self, metrics: List[str]) -> None:
+        self.metrics = list(metrics)
+        for evaluator in self.evaluators.values():
+            evaluator.set_metrics(self.metrics)
+
+    def set_scheduler(self, scheduler: JudgeScheduler) -> None:
+        """Replace the shared scheduler holding the combined concurrency and rate limits."""
+        self.scheduler = scheduler
+
+    async def _evaluate_all(self) -> Dict[str, EvaluationResult]:
+        start = time.perf_counter()
+
+        async def run(framework):
+            result = await self.evaluators[framework]._arun()
+            print(f"{framework} finished after {time.perf_counter() - start:.1f}s")
+            return result
+
+        results = await asyncio.gather(*(run(framework) for framework in self.frameworks))
+        return dict(zip(self.frameworks, results))
+
+    def evaluate(self) -> Dict[str, Any]:
+        print(f"Evaluating with {' and '.join(self.frameworks)} concurrently...")
+        for evaluator in self.evaluators.values():
+            evaluator.set_scheduler(self.scheduler)
+        with stage("evaluate", framework="+".join(self.frameworks)):
+            self.framework_results = get_registry().run(self._evaluate_all())
+        self.results = self.comparison_table()
+        return self.results
+
+    def comparison_table(self) -> EvaluationResult:
+        """One row per input row with every framework's score for each common metric side by side."""
+        import pandas as pd
+
+        first = self.framework_results[self.frameworks[0]].to_pandas()
+        table = first[[column for column in ROW_COLUMNS if column in first]].copy()
+        metrics = [name for name in self.metrics
+                   if any(name in result.metric_names for result in self.framework_results.values())]
+        columns = []
+        for metric in metrics:
+            for framework in self.frameworks:
+                scores = self.framework_results[framework].to_pandas()
+                column = score_column(metric, framework)
+                table[column] = scores[metric].values if metric in scores else float("nan")
+                columns.append(column)
+            if len(self.frameworks) == 2:
+                table[f"{metric}_delta"] = (table[score_column(metric, self.frameworks[1])]
+                                            - table[score_column(metric, self.frameworks[0])])
+        return EvaluationResult(pd.DataFrame(table), columns)
+
+    def summary(self, threshold: float = 0.5):
+        """Per metric: each framework's mean, and for two frameworks how closely their row scores agree."""
+        import pandas as pd
+
+        table = self.results.to_pandas()
+        report = []
+        for metric in self.metrics:
+            if score_column(metric, self.frameworks[0]) not in table:
+                continue
+            row = {"metric": metric}
+            for framework in self.frameworks:
+                row[f"mean_{framework.lower()}"] = table[score_column(metric, framework)].mean()
+            if len(self.frameworks) == 2:
+                a = table[score_column(metric, self.frameworks[0])]
+                b = table[score_column(metric, self.frameworks[1])]
+                paired = a.notna() & b.notna()
+                row["rows"] = int(paired.sum())
+                row["mean_abs_diff"] = (a - b)[paired].abs().mean()
+                # Undefined when either framework gives every row the same score
+                varied = a[paired].nunique() > 1 and b[paired].nunique() > 1
+                row["correlation"] = a[paired].corr(b[paired]) if varied else float("nan")
+                row["pass_agreement"] = ((a[paired] >= threshold) == (b[paired] >= threshold)).mean()
+            report.append(row)
+        return pd.DataFrame(report)
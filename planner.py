@@ -0,0 +1,473 @@
+"""Dry-run planner: judge calls, tokens, cost and wall time of an evaluation, before anything is spent.
+
+Rows are loaded with DataHandler and prepared by the FrameworkFactory evaluator exactly as a real run would, so
+cached scores are left out. For each metric still to be judged, the prompts the framework sends per row (measured
+on RAGAs 0.1.14 and DeepEval 1.0.4) are sized from the row text with the offline four-characters-per-token
+approximation and priced with MODEL_PRICES. Wall time is projected from per-call latencies under the concurrency,
+requests/minute and tokens/minute limits. Full, batched, cascaded and sampled runs are compared, and the batch
+judge size, shard count and chunk size are picked for the dataset.
+Run from the repository root:
+    python planner.py --dataset ./deep_eval_data/amnesty_qa_sample.csv --framework RAGAs
+    python planner.py --dataset rows.parquet --framework DeepEval --metrics faithfulness --judge-model gpt-4o-mini \\
+        --concurrency 32 --rpm 5000 --tpm 2000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from statistics import NormalDist
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+from batch_judge import BATCH_RUBRICS, SYSTEM_PROMPT, BatchJudge
+from cascade import Cascade
+from eval import FrameworkFactory
+from instrumentation import estimate_cost
+from scheduler import RateLimits, estimate_tokens
+from score_cache import ScoreCache, metric_config
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from testcase_store import TestCaseStore
+
+# Model -> (seconds to the first token, completion tokens per second); unknown models use DEFAULT_SPEED
+MODEL_SPEEDS = {
+    "gpt-4": (0.8, 25.0),
+    "gpt-4-32k": (0.8, 25.0),
+    "gpt-4-turbo": (0.6, 35.0),
+    "gpt-4o": (0.4, 80.0),
+    "gpt-4o-mini": (0.35, 90.0),
+    "gpt-3.5-turbo": (0.3, 100.0),
+    "gpt-3.5-turbo-16k": (0.3, 100.0),
+    "text-embedding-ada-002": (0.15, 1.0),
+}
+DEFAULT_SPEED = (0.5, 50.0)
+PREFILL_TOKENS_PER_SECOND = 5000.0
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# One judge request kind of a metric: (call, template tokens, calls per row, inserted prompt tokens,
+# completion tokens[, model]), the last three as functions of RowStats giving one value per row. Template
+# tokens are the framework's instructions and few-shot examples without the row text.
+ONE = lambda s: 1
+PROMPT_SHAPES = {
+    "RAGAs": {
+        "faithfulness": [
+            ("statements", 645, ONE, lambda s: s.question + s.answer,
+             lambda s: s.answer + 10 * s.answer_sentences),
+            ("nli", 820, ONE, lambda s: s.contexts + s.answer,
+             lambda s: s.answer + 30 * s.answer_sentences),
+        ],
+        "context_recall": [
+            ("attribution", 1115, ONE, lambda s: s.question + s.ground_truth + s.contexts,
+             lambda s: s.ground_truth + 30 * s.ground_truth_sentences),
+        ],
+        # One request per retrieved context, each with the question and ground truth
+        "context_precision": [
+            ("verdict", 1060, lambda s: s.n_contexts, lambda s: s.n_contexts * (s.question + s.ground_truth) + s.contexts,
+             lambda s: 40 * s.n_contexts),
+        ],
+        # Three questions generated in one request (n=3), then the question and the three are embedded
+        "answer_relevancy": [
+            ("question_generation", 615, ONE, lambda s: s.answer + s.contexts, lambda s: 90),
+            ("embeddings", 0, lambda s: 2, lambda s: 4 * s.question, lambda s: 0, EMBEDDING_MODEL),
+        ],
+    },
+    "DeepEval": {
+        # Truths are extracted from the row's whole context list, once per list repeated across rows
+        "faithfulness": [
+            ("truths", 163, lambda s: s.first_list, lambda s: s.first_list * s.contexts,
+             lambda s: s.first_list * s.contexts // 2),
+            ("claims", 210, ONE, lambda s: s.answer, lambda s: s.answer + 10 * s.answer_sentences),
+            ("verdicts", 593, ONE, lambda s: s.answer + s.contexts // 2, lambda s: 30 * s.answer_sentences),
+        ],
+        "context_recall": [
+            ("verdicts", 324, ONE, lambda s: s.ground_truth + s.contexts, lambda s: 30 * s.ground_truth_sentences),
+        ],
+        "context_precision": [
+            ("verdicts", 392, ONE, lambda s: s.question + s.ground_truth + s.contexts, lambda s: 40 * s.n_contexts),
+        ],
+        "answer_relevancy": [
+            ("statements", 143, ONE, lambda s: s.answer, lambda s: s.answer + 10 * s.answer_sentences),
+            ("verdicts", 388, ONE, lambda s: s.question + s.answer, lambda s: 30 * s.answer_sentences),
+            ("reason", 215, ONE, lambda s: s.question, lambda s: 40),
+        ],
+    },
+}
+
+# Request kinds sent alongside the ones before them (asyncio.gather) rather than after
+CONCURRENT_CALLS = {("DeepEval", "faithfulness", "claims")}
+
+# Judge calls one worker process keeps in flight before the frameworks' prompt rendering and output parsing
+# make it CPU-bound; more in-flight calls than this are spread over shards
+CALLS_PER_SHARD = 32
+# Fewer rows than this per shard and process start-up outweighs the parallelism
+MIN_ROWS_PER_SHARD = 200
+# Rows per chunk are sized so a chunk takes about this long: a failure loses at most this much work
+CHUNK_SECONDS = 60.0
+# Rows scored by the cheap tier to estimate a cascade's escalation rate
+CASCADE_SAMPLE_ROWS = 5000
+
+
+def _tokens(chars: np.ndarray) -> np.ndarray:
+    # estimate_tokens per value: a quarter of the UTF-8 bytes (characters, for ASCII text), at least 1 for any non-empty text
+    import numpy as np
+    return np.where(chars > 0, np.maximum(1, chars // 4), 0)
+
+
+class RowStats:
+    """Token, sentence and context counts of the given store rows, computed from its buffers without decoding rows."""
+
+    def __init__(self, store: TestCaseStore, indices: Any) -> None:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        indices = np.asarray(indices, dtype=np.int64)
+        self.rows = len(indices)
+        for field in ("question", "answer", "ground_truth"):
+            column = store.columns[field]
+            setattr(self, field, _tokens(np.diff(column.offsets)[indices]))
+        for field in ("answer", "ground_truth"):
+            # Sentence ends approximate the statements the judge extracts; any text is at least one statement
+            marks = pc.count_substring_regex(store.columns[field].array.take(pa.array(indices)), r"[.!?](\s|$)")
+            marks = marks.fill_null(0).to_numpy(zero_copy_only=False)
+            setattr(self, f"{field}_sentences", np.where(getattr(self, field) > 0, np.maximum(1, marks), 0))
+
+        offsets, ids = store.context_offsets, store.context_ids
+        starts, ends = offsets[indices], offsets[indices + 1]
+        self.n_contexts = ends - starts
+        passage_tokens = _tokens(np.diff(store.passages.offsets))
+        ref_tokens = passage_tokens[ids]
+        shared = store.passage_counts() > 1
+
+        def per_row(values):
+            cumulative = np.concatenate([[0], np.cumsum(values)])
+            return cumulative[ends] - cumulative[starts]
+
+        self.contexts = per_row(ref_tokens)
+        # Rows with an identical context list share one truths extraction (ContextStore.memo_key); only a row
+        # whose passages are all used elsewhere can repeat another row's list
+        self.first_list = np.ones(self.rows, dtype=np.int64)
+        seen = set()
+        candidates = (per_row(~shared[ids]) == 0) & (self.n_contexts > 0)
+        for row in np.flatnonzero(candidates).tolist():
+            key = ids[starts[row]:ends[row]].tobytes()
+            if key in seen:
+                self.first_list[row] = 0
+            else:
+                seen.add(key)
+
+
+def request_seconds(model: str, requests: Any, prompt_tokens: Any, completion_tokens: Any,
+                    latency_s: Optional[float] = None) -> Any:
+    """Seconds spent on judge requests: time to first token each, prompt processing and generation."""
+    if latency_s is not None:
+        return requests * latency_s
+    first_token, tokens_per_second = MODEL_SPEEDS.get(model, DEFAULT_SPEED)
+    return requests * first_token + prompt_tokens / PREFILL_TOKENS_PER_SECOND + completion_tokens / tokens_per_second
+
+
+def plan_metric(framework: str, name: str, model: str, stats: RowStats,
+                latency_s: Optional[float] = None) -> List[Dict[str, Any]]:
+    """One record per request kind of a metric over the planned rows: requests, tokens, cost and slot time."""
+    import numpy as np
+    shapes = PROMPT_SHAPES.get(framework, {}).get(name)
+    if shapes is None:
+        raise ValueError(f"No prompt shapes for {framework} metric {name!r}; "
+                         f"known: {', '.join(PROMPT_SHAPES.get(framework, {}))}")
+    records = []
+    # A (row, metric) unit holds its scheduler slot until its requests are done, one after another
+    unit_seconds = np.zeros(stats.rows)
+    for shape in shapes:
+        call, template, calls, inserted, completion = shape[:5]
+        call_model = shape[5] if len(shape) > 5 else model
+        calls = np.broadcast_to(calls(stats), (stats.rows,))
+        prompt = calls * template + np.broadcast_to(inserted(stats), (stats.rows,))
+        completion = np.broadcast_to(completion(stats), (stats.rows,))
+        seconds = np.where(calls > 0, request_seconds(call_model, calls, prompt, completion, latency_s), 0.0)
+        if (framework, name, call) in CONCURRENT_CALLS:
+            unit_seconds = np.maximum(unit_seconds, seconds)
+        else:
+            unit_seconds = unit_seconds + seconds
+        records.append({
+            "metric": name, "call": call, "model": call_model, "rows": stats.rows,
+            "requests": int(calls.sum()), "prompt_tokens": int(prompt.sum()), "completion_tokens": int(completion.sum()),
+            "cost_usd": estimate_cost(call_model, int(prompt.sum()), int(completion.sum())),
+        })
+    slot_seconds = float(unit_seconds.sum())
+    requests = sum(r["requests"] for r in records)
+    for record in records:
+        # Slot time belongs to the unit, so it is split across its request kinds by their share of the requests
+        record["slot_seconds"] = slot_seconds * record["requests"] / requests if requests else 0.0
+        record["max_unit_seconds"] = float(unit_seconds.max()) if stats.rows else 0.0
+    return records
+
+
+def plan_batched(name: str, stats: RowStats, judge: BatchJudge, latency_s: Optional[float] = None) -> tuple:
+    """(record, rows per request) for one metric scored K rows per request by the batch judge.
+
+    K is the most rows whose 95th-percentile payload still fits the context budget, capped at judge.max_batch,
+    so batches are rarely cut short by a long row.
+    """
+    import numpy as np
+    rubric, fields = BATCH_RUBRICS[name]
+    overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(rubric) + 80
+    budget = judge.context_tokens - overhead
+    # JSON keys and quoting add a few tokens per field and passage to the row text
+    payload = sum(getattr(stats, field) + 3 for field in fields) + 3 * stats.n_contexts + 4
+    row_cost = payload + judge.completion_tokens_per_row
+    if not stats.rows:
+        return None, judge.max_batch
+    k = int(max(1, min(judge.max_batch, budget // max(1, int(np.percentile(row_cost, 95))))))
+    requests = max(math.ceil(stats.rows / k), math.ceil(int(row_cost.sum()) / budget))
+    prompt = requests * overhead + int(payload.sum())
+    completion = stats.rows * judge.completion_tokens_per_row
+    seconds = request_seconds(judge.model, requests, prompt, completion, latency_s)
+    record = {
+        "metric": name, "call": "batched", "model": judge.model, "rows": stats.rows, "requests": requests,
+        "prompt_tokens": prompt, "completion_tokens": completion,
+        "cost_usd": estimate_cost(judge.model, prompt, completion),
+        "slot_seconds": seconds, "max_unit_seconds": seconds / requests,
+    }
+    return record, k
+
+
+def project_seconds(records: List[Dict[str, Any]], global_limits: RateLimits,
+                    model_limits: Optional[Dict[str, RateLimits]] = None) -> tuple:
+    """(wall seconds, bottleneck) of the records' requests under the limits, as the JudgeScheduler enforces them.
+
+    Each limit gives a lower bound: slot time over concurrency, requests over requests/minute and tokens over
+    tokens/minute, globally and per model. The slowest single unit bounds the run from below as well.
+    """
+    bounds = {"latency": max([r["max_unit_seconds"] for r in records], default=0.0)}
+    scopes = [("all", global_limits, records)]
+    for model, limits in (model_limits or {}).items():
+        scopes.append((model, limits, [r for r in records if r["model"] == model]))
+    for scope, limits, selected in scopes:
+        if not selected:
+            continue
+        if limits.concurrency:
+            bounds[f"{scope} concurrency"] = sum(r["slot_seconds"] for r in selected) / limits.concurrency
+        if limits.requests_per_minute:
+            bounds[f"{scope} requests_per_minute"] = 60.0 * sum(r["requests"] for r in selected) / limits.requests_per_minute
+        if limits.tokens_per_minute:
+            tokens = sum(r["prompt_tokens"] + r["completion_tokens"] for r in selected)
+            bounds[f"{scope} tokens_per_minute"] = 60.0 * tokens / limits.tokens_per_minute
+    bottleneck = max(bounds, key=bounds.get)
+    return bounds[bottleneck], bottleneck
+
+
+def _scaled(record: Dict[str, Any], fraction: float) -> Dict[str, Any]:
+    # The same request mix over a fraction of the rows
+    scaled = dict(record)
+    for key in ("requests", "prompt_tokens", "completion_tokens"):
+        scaled[key] = int(round(record[key] * fraction))
+    scaled["cost_usd"] = record["cost_usd"] * fraction
+    scaled["slot_seconds"] = record["slot_seconds"] * fraction
+    return scaled
+
+
+def sample_rows(rows: int, tolerance: float, confidence: float, min_rows: int = 30, batch_size: int = 50) -> int:
+    """Rows a SampledEvaluator scores before its interval is narrower than tolerance.
+
+    Worst case for scores in [0, 1] (standard deviation 0.5), rounded up to its batch size.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    needed = max(min_rows, math.ceil((2 * z * 0.5 / tolerance) ** 2))
+    return min(rows, batch_size * math.ceil(needed / batch_size))
+
+
+class RunPlan(dict):
+    """Totals per scenario ('full', 'batched', 'cascaded', 'sampled') plus the per-call breakdown and settings."""
+
+    def __init__(self, scenarios: Dict[str, Dict[str, Any]], calls: pd.DataFrame, settings: Dict[str, Any]) -> None:
+        super().__init__(scenarios)
+        self.calls = calls
+        self.settings = settings
+
+    def to_pandas(self) -> pd.DataFrame:
+        import pandas as pd
+        return pd.DataFrame.from_dict(self, orient="index").rename_axis("scenario").reset_index()
+
+    def print_summary(self) -> None:
+        if not self.calls.empty:
+            print(self.calls.drop(columns=["slot_seconds", "max_unit_seconds"]).to_string(
+                index=False, float_format=lambda value: f"{value:.4f}"))
+        print(self.to_pandas().to_string(index=False, float_format=lambda value: f"{value:.2f}"))
+        for name, value in self.settings.items():
+            print(f"{name}: {value}")
+
+
+class RunPlanner:
+    """Plans an evaluation without calling the judge; configured like the evaluator it plans for."""
+
+    def __init__(self, framework: str, global_limits: Optional[RateLimits] = None,
+                 model_limits: Optional[Dict[str, RateLimits]] = None, judge_model: Optional[str] = None,
+                 batch_judge: Optional[BatchJudge] = None, cascade: Optional[Cascade] = None,
+                 tolerance: float = 0.05, confidence: float = 0.95, latency_s: Optional[float] = None) -> None:
+        if framework not in PROMPT_SHAPES:
+            raise ValueError("Unknown framework")
+        self.framework = framework
+        # Same default as JobRunner's scheduler
+        self.global_limits = global_limits or RateLimits(concurrency=16)
+        self.model_limits = model_limits or {}
+        # Without a configured batch judge, batching is planned on each metric's own judge model
+        self.batch_judge = batch_judge
+        self.cascade = cascade or Cascade()
+        self.tolerance = tolerance
+        self.confidence = confidence
+        # Fixed seconds per request, e.g. the p50 latency of a previous run's trace, instead of MODEL_SPEEDS
+        self.latency_s = latency_s
+        self.evaluator = FrameworkFactory.get_evaluator(framework)
+        self.evaluator.set_judge_model(judge_model)
+
+    def load_dataset(self, dataset_path: Any = None, dataset: Any = None) -> None:
+        """Load rows as the evaluator would: a file through DataHandler, or a DataFrame."""
+        if dataset is None:
+            self.evaluator.load_dataset(dataset_path=dataset_path)
+        else:
+            self.evaluator.load_frame(dataset)
+
+    def set_metrics(self, metrics: List[str]) -> None:
+        self.evaluator.set_metrics(metrics)
+
+    def set_cache(self, cache: ScoreCache) -> None:
+        """Leave out rows whose scores are already cached."""
+        self.evaluator.set_cache(cache)
+
+    def _escalation_rate(self, rows: Any, name: str, pending: List[int]) -> float:
+        if name not in self.cascade.bands or not pending:
+            return 1.0
+        step = max(1, len(pending) // CASCADE_SAMPLE_ROWS)
+        sample = [rows[i] for i in pending[::step][:CASCADE_SAMPLE_ROWS]]
+        cheap = self.cascade.score(sample)
+        _, escalated = self.cascade.route(name, cheap, range(len(sample)))
+        return len(escalated) / len(sample)
+
+    def plan(self) -> RunPlan:
+        """Count, price and time the judge calls the prepared rows still need under each scenario."""
+        import pandas as pd
+        evaluator = self.evaluator
+        rows, _, _, _, groups = evaluator._prepare()
+        store = evaluator.store
+        if store is None:
+            raise ValueError("The planner needs rows loaded from a file or frame.")
+        full, batched, cascaded = [], [], []
+        batch_sizes = {}
+        planned_rows = set()
+        for pending, metrics in groups.items():
+            stats = RowStats(store, pending)
+            planned_rows.update(pending)
+            for metric in metrics:
+                name = evaluator.metric_name(metric)
+                model = metric_config(metric)["model"]
+                records = plan_metric(self.framework, name, model, stats, self.latency_s)
+                full.extend(records)
+                judge = self.batch_judge or BatchJudge(model=model)
+                if judge.supports(name) and stats.rows:
+                    record, batch_sizes[name] = plan_batched(name, stats, judge, self.latency_s)
+                    batched.append(record)
+                else:
+                    batched.extend(records)
+                rate = self._escalation_rate(rows, name, list(pending))
+                cascaded.extend(_scaled(record, rate) for record in records)
+
+        rows_to_judge = len(planned_rows)
+        sampled_rows = sample_rows(rows_to_judge, self.tolerance, self.confidence)
+        fraction = sampled_rows / rows_to_judge if rows_to_judge else 0.0
+        sampled = [_scaled(record, fraction) for record in full]
+
+        scenarios = {}
+        for scenario, records, judged in (("full", full, rows_to_judge), ("batched", batched, rows_to_judge),
+                                          ("cascaded", cascaded, rows_to_judge), ("sampled", sampled, sampled_rows)):
+            seconds, bottleneck = project_seconds(records, self.global_limits, self.model_limits)
+            scenarios[scenario] = {
+                "rows": judged,
+                "requests": sum(r["requests"] for r in records),
+                "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+                "completion_tokens": sum(r["completion_tokens"] for r in records),
+                "cost_usd": sum(r["cost_usd"] for r in records),
+                "wall_minutes": seconds / 60.0,
+                "bottleneck": bottleneck,
+            }
+        settings = self._settings(full, rows_to_judge, scenarios["full"]["wall_minutes"] * 60.0, batch_sizes)
+        print(f"Planned {self.framework} on {len(rows)} rows: {rows_to_judge} still need the judge")
+        return RunPlan(scenarios, pd.DataFrame(full), settings)
+
+    def _settings(self, records: List[Dict[str, Any]], rows: int, seconds: float,
+                  batch_sizes: Dict[str, int]) -> Dict[str, Any]:
+        """Batch judge size, shard count and rows per streamed batch / checkpoint chunk for the full run."""
+        default = (self.batch_judge or BatchJudge()).max_batch
+        settings = {"batch_judge_max_batch": min(batch_sizes.values()) if batch_sizes else default}
+        if not rows or seconds <= 0:
+            return {**settings, "shards": 1, "chunk_rows": 50}
+        # Little's law: the average number of units in flight is their total slot time over the wall time
+        in_flight = sum(r["slot_seconds"] for r in records) / seconds
+        settings["shards"] = max(1, min(math.ceil(in_flight / CALLS_PER_SHARD), os.cpu_count() or 1,
+                                        rows // MIN_ROWS_PER_SHARD))
+        settings["chunk_rows"] = int(min(5000, max(50, round(rows / seconds * CHUNK_SECONDS))))
+        return settings
+
+
+def plan_jobs(runner: Any, global_limits: RateLimits,
+              model_limits: Optional[Dict[str, RateLimits]] = None) -> Dict[str, Any]:
+    """Plan a prepared JobRunner's distinct judge calls; each call is charged to the job that makes it."""
+    import numpy as np
+    planned = {}
+    for consumers in runner.graph.values():
+        job, i, metric = consumers[0]
+        planned.setdefault((job, job.evaluator.metric_name(metric), metric_config(metric)["model"]), []).append(i)
+    records = []
+    for job in runner.jobs:
+        job.plan = {"planned_requests": 0, "planned_tokens": 0, "planned_cost_usd": 0.0}
+    for (job, name, model), indices in planned.items():
+        for record in plan_metric(job.framework, name, model, RowStats(job.evaluator.store, np.sort(indices))):
+            records.append(record)
+            job.plan["planned_requests"] += record["requests"]
+            job.plan["planned_tokens"] += record["prompt_tokens"] + record["completion_tokens"]
+            job.plan["planned_cost_usd"] += record["cost_usd"]
+    seconds, bottleneck = project_seconds(records, global_limits, model_limits)
+    totals = {
+        "requests": sum(r["requests"] for r in records),
+        "tokens": sum(r["prompt_tokens"] + r["completion_tokens"] for r in records),
+        "cost_usd": sum(r["cost_usd"] for r in records),
+        "wall_minutes": seconds / 60.0,
+        "bottleneck": bottleneck,
+    }
+    print(f"Planned {totals['requests']} judge requests, {totals['tokens']} tokens, ${totals['cost_usd']:.2f}, "
+          f"about {totals['wall_minutes']:.1f} minutes (bound by {bottleneck})")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", required=True)
+    parser.add_argument("--framework", choices=list(PROMPT_SHAPES), required=True)
+    parser.add_argument("--metrics", nargs="+",
+                        default=["faithfulness", "context_recall", "context_precision", "answer_relevancy"])
+    parser.add_argument("--judge-model", default=None)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rpm", type=float, default=None, help="requests per minute")
+    parser.add_argument("--tpm", type=float, default=None, help="tokens per minute")
+    parser.add_argument("--model-limits", type=json.loads, default=None,
+                        help='per-model limits as JSON, e.g. \'{"gpt-4": {"concurrency": 8, "tokens_per_minute": 300000}}\'')
+    parser.add_argument("--latency", type=float, default=None, help="fixed seconds per judge request")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="interval width for the sampled scenario")
+    parser.add_argument("--cache", default=None, help="score cache whose rows are left out")
+    args = parser.parse_args()
+
+    model_limits = {model: RateLimits(spec.get("concurrency"), spec.get("requests_per_minute"),
+                                      spec.get("tokens_per_minute"))
+                    for model, spec in (args.model_limits or {}).items()}
+    planner = RunPlanner(args.framework, RateLimits(args.concurrency, args.rpm, args.tpm), model_limits,
+                         judge_model=args.judge_model, tolerance=args.tolerance, latency_s=args.latency)
+    planner.load_dataset(args.dataset)
+    planner.set_metrics(args.metrics)
+    if args.cache:
+        planner.set_cache(ScoreCache(args.cache))
+    planner.plan().print_summary()
+
+
+if __name__ == "__main__":
+    main()
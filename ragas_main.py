@@ -1,5 +1,17 @@
 
 from eval import FrameworkFactory
+from score_cache import ScoreCache
+from incremental import RunManifest
+from checkpoint import Checkpoint
+from cascade import Cascade
+from batch_judge import BatchJudge
+from embedding_cache import EmbeddingCache
+from sampling import SampledEvaluator
+from multi_framework import MultiFrameworkEvaluator
+from scheduler import JudgeScheduler, RateLimits
+from instrumentation import Tracer, set_tracer
+from results_store import ResultsStore
+from analysis import analyze
 from datasets import load_dataset
 import os
 from dotenv import load_dotenv
@@ -9,6 +21,10 @@ os.environ["OPENAI_API_KEY"]
 
 # Example Usage
 if __name__ == "__main__":
+    # Record stage timings and per-row judge calls for this run
+    tracer = Tracer()
+    set_tracer(tracer)
+
     # User selects the framework they want to use
     framework_name = "RAGAs"  # or "DeepEval"
     # Dataset and metrics provided by the use
@@ -35,6 +51,17 @@ if __name__ == "__main__":
 
     # Use Factory Pattern to get the appropriate evaluator
     evaluator = FrameworkFactory.get_evaluator(framework_name)
+    # For aggregate scores only: sample rows until every metric's 95% interval is narrower than 0.05
+    # sampled = SampledEvaluator(framework_name, tolerance=0.05, max_rows=5000, max_cost=20.0)
+    # sampled.load_dataset(dataset=dataset["eval"].to_pandas())
+    # sampled.set_metrics(metrics)
+    # print(sampled.evaluate().to_pandas())
+    # Compare RAGAs and DeepEval on the same rows in one pass, sharing one judge concurrency budget
+    # compared = MultiFrameworkEvaluator(["RAGAs", "DeepEval"], JudgeScheduler(RateLimits(concurrency=16)))
+    # compared.load_dataset(dataset=dataset["eval"].to_pandas())
+    # compared.set_metrics(metrics)
+    # compared.evaluate().to_pandas().to_csv("./results/framework_comparison.csv", index=False)
+    # print(compared.summary())
     
     # Load the dataset & use Adapter Pattern to handle dataset conversion
     evaluator.load_dataset(dataset=dataset["eval"])
@@ -42,10 +69,37 @@ if __name__ == "__main__":
     # Set metrics and run the evaluation
     evaluator.set_metrics(metrics)
 
+    # Reuse judge scores from previous runs for rows that have not changed
+    evaluator.set_cache(ScoreCache("./.eval_cache/scores.sqlite", max_age_seconds=30 * 24 * 3600))
+    # Embed each question and generated question once across runs and metrics
+    evaluator.set_embedding_cache(EmbeddingCache("./.eval_cache/embeddings"))
+    # Only score rows added or modified since the previous run of this dataset
+    # evaluator.set_manifest(RunManifest("./.eval_cache/ragas_manifest.json"))
+    # Resume an interrupted run without re-scoring rows it already finished
+    # evaluator.set_checkpoint(Checkpoint("./.eval_cache/ragas_checkpoint.jsonl", run_id="ragas-nightly"))
+    # Only send rows whose cheap lexical scores are uncertain to the judge model
+    # evaluator.set_cascade(Cascade())
+    # Pack several rows into each judge request, scored into <metric>_batched columns by a one-number rubric
+    # evaluator.set_batch_judge(BatchJudge(model="gpt-4", context_tokens=8192, max_batch=8))
+
+    # Control judge concurrency and throughput instead of the framework defaults; calls past the 60s deadline
+    # are retried, calls slower than the p95 latency are hedged, and rows that still fail are left unscored
+    # evaluator.set_scheduler(JudgeScheduler(
+    #     RateLimits(concurrency=16),
+    #     {"gpt-4": RateLimits(concurrency=8, requests_per_minute=500, tokens_per_minute=300000)},
+    #     timeout=60, hedge_percentile=95,
+    # ))
+
     # Run the evaluator to generate score for each metrics
     results = evaluator.evaluate()
+    tracer.print_summary()
+    tracer.export_jsonl("./results/ragas_trace.jsonl")
+    # Keep per-row scores for cross-run queries: python results_store.py runs | aggregate | diff | slices
+    ResultsStore("./results/store").write_run(results, "RAGAs", tracer=tracer)
     
     print(results)
+    # Means with bootstrap intervals and pass rates at each metric's threshold; add by=[...] for slices
+    print(analyze(results).to_string(index=False))
 
     df = results.to_pandas()
     print(df.head())
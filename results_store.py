@@ -0,0 +1,277 @@
+"""Columnar store of evaluation runs: per-row scores as Parquet partitioned by run, framework and metric.
+
+Layout under the store root:
+    runs/<run_id>.json                                         run manifest (dataset, config, timings, cost)
+    scores/run_id=<id>/framework=<fw>/metric=<m>/part-0.parquet row, row_fingerprint, score
+    rows/run_id=<id>/part-0.parquet                            row, row_fingerprint, question and slice columns
+
+Query from the command line:
+    python results_store.py --root results/store runs
+    python results_store.py --root results/store aggregate --runs <id> <id>
+    python results_store.py --root results/store diff <baseline id> <candidate id>
+    python results_store.py --root results/store slices <id> --by category
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import List, Dict, Any, Optional
+
+from score_cache import ROW_COLUMN_ALIASES, normalize_row, row_fingerprint
+
+PARTITION_KEYS = ("run_id", "framework", "metric")
+
+
+def _slice_array(values: Any) -> Any:
+    """Arrow array of one slice column; NaN and None are nulls, and a column of mixed types is stored as text."""
+    import pyarrow as pa
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None or value != value else str(value) for value in values],
+                        type=pa.string())
+
+
+class ResultsStore:
+    """Writes evaluation runs as partitioned Parquet and answers cross-run queries over them."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.runs_dir = os.path.join(root, "runs")
+        self.scores_dir = os.path.join(root, "scores")
+        self.rows_dir = os.path.join(root, "rows")
+        for directory in (self.runs_dir, self.scores_dir, self.rows_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    def write_run(self, result: Any, framework: str, run_id: Optional[str] = None,
+                  config: Optional[Dict[str, Any]] = None, tracer: Any = None, slices: Any = None) -> str:
+        """Store an EvaluationResult; slices is an optional DataFrame of row attributes aligned with its rows.
+
+        Without slices, the result's own dataset columns beyond the common fields (category, ...) are stored.
+        The run ID defaults to the tracer's, so stored scores join with the exported trace.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = result.to_pandas()
+        run_id = run_id or (tracer.run_id if tracer is not None else None) or \
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        records = table.to_dict("records")
+        fingerprints = [row_fingerprint(row) for row in records]
+        rows = pa.table({
+            "row": pa.array(range(len(table)), type=pa.int64()),
+            "row_fingerprint": pa.array(fingerprints, type=pa.string()),
+            "question": pa.array([normalize_row(row)["question"] for row in records], type=pa.string()),
+        })
+        if slices is None:
+            known = {alias for aliases in ROW_COLUMN_ALIASES.values() for alias in aliases} | {"row", "row_fingerprint"}
+            known |= {column for name in result.metric_names for column in (name, f"{name}_source")}
+            slices = table[[column for column in table.columns if column not in known]]
+        if len(slices.columns):
+            if len(slices) != len(table):
+                raise ValueError(f"Slices have {len(slices)} rows, the result has {len(table)}.")
+            for column in slices.columns:
+                rows = rows.append_column(column, _slice_array(slices[column]))
+        row_dir = os.path.join(self.rows_dir, f"run_id={run_id}")
+        os.makedirs(row_dir, exist_ok=True)
+        pq.write_table(rows, os.path.join(row_dir, "part-0.parquet"))
+
+        names = [name for name in result.metric_names if name in table]
+        for name in names:
+            metric_dir = os.path.join(self.scores_dir, f"run_id={run_id}", f"framework={framework}", f"metric={name}")
+            os.makedirs(metric_dir, exist_ok=True)
+            columns = {
+                "row": rows.column("row"),
+                "row_fingerprint": rows.column("row_fingerprint"),
+                "score": pa.array(table[name].astype(float).tolist(), type=pa.float64()),
+            }
+            if f"{name}_source" in table:
+                # judge, batched or cascade, so queries can keep the scorers apart
+                columns["source"] = pa.array(table[f"{name}_source"].tolist(), type=pa.string())
+            pq.write_table(pa.table(columns), os.path.join(metric_dir, "part-0.parquet"))
+
+        manifest = {
+            "run_id": run_id,
+            "created_at": time.time(),
+            "framework": framework,
+            "metrics": names,
+            "rows": len(table),
+            # Order-independent, so reordered datasets still compare as the same data
+            "dataset_fingerprint": hashlib.sha256("".join(sorted(fingerprints)).encode("utf-8")).hexdigest(),
+            "config": config if config is not None else getattr(result, "configs", {}),
+            "means": {name: value for name, value in result.items()},
+            "timings": {},
+            "cost_usd": None,
+            "coverage": getattr(result, "coverage", {}),
+            "unscored": len(getattr(result, "unscored", [])),
+        }
+        if tracer is not None:
+            summary = tracer.stage_summary()
+            manifest["timings"] = {stage: float(seconds) for stage, seconds in zip(summary["stage"], summary["seconds"])}
+            # Scheduled and batched runs record cost per judge call, framework bulk calls on their score_rows span
+            span_cost = sum(span["attributes"].get("cost_usd") or 0.0 for span in tracer.spans)
+            manifest["cost_usd"] = span_cost + sum(call["cost_usd"] or 0.0 for call in tracer.calls)
+            manifest["judge_calls"] = len(tracer.calls)
+        # Written last and atomically: a run is visible to queries only once all its files exist
+        path = os.path.join(self.runs_dir, f"{run_id}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(path + ".tmp", path)
+        print(f"Stored run {run_id} ({len(table)} rows, {len(names)} metrics) in {self.root}")
+        return run_id
+
+    def runs(self):
+        """One row per stored run with its manifest fields and per-metric means."""
+        import pandas as pd
+        manifests = []
+        for name in sorted(os.listdir(self.runs_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.runs_dir, name), "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                manifests.append({
+                    "run_id": manifest["run_id"],
+                    "created_at": pd.to_datetime(manifest["created_at"], unit="s"),
+                    "framework": manifest["framework"],
+                    "rows": manifest["rows"],
+                    "dataset_fingerprint": manifest["dataset_fingerprint"][:12],
+                    "cost_usd": manifest.get("cost_usd"),
+                    **{f"mean_{metric}": value for metric, value in manifest["means"].items()},
+                })
+        return pd.DataFrame(manifests).sort_values("created_at") if manifests else pd.DataFrame()
+
+    def manifest(self, run_id: str) -> Dict[str, Any]:
+        with open(os.path.join(self.runs_dir, f"{run_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _committed(self, run_ids: Optional[List[str]]) -> List[str]:
+        committed = [name[:-5] for name in os.listdir(self.runs_dir) if name.endswith(".json")]
+        if run_ids is None:
+            return committed
+        unknown = set(run_ids) - set(committed)
+        if unknown:
+            raise ValueError(f"Unknown run IDs: {', '.join(sorted(unknown))}")
+        return list(run_ids)
+
+    def scores(self, run_ids: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+               frameworks: Optional[List[str]] = None, columns: Optional[List[str]] = None):
+        """Per-row scores as an Arrow table, reading only the matching partitions and the given columns."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        run_ids = self._committed(run_ids)
+        partitioning = ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor="hive")
+        # Only the selected runs' directories are listed, however many runs the store holds
+        paths = [os.path.join(self.scores_dir, f"run_id={run_id}") for run_id in run_ids]
+        paths = [path for path in paths if os.path.isdir(path)]
+        if not paths:
+            return pa.table({key: pa.array([], type=pa.string()) for key in PARTITION_KEYS})
+        dataset = ds.dataset([ds.dataset(path, format="parquet", partitioning=partitioning,
+                                         partition_base_dir=self.scores_dir) for path in paths])
+        condition = None
+        for key, values in (("metric", metrics), ("framework", frameworks)):
+            if values:
+                clause = ds.field(key).isin(values)
+                condition = clause if condition is None else condition & clause
+        columns = list(columns or ["row", "row_fingerprint", "score"])
+        return dataset.to_table(columns=list(PARTITION_KEYS) + columns, filter=condition)
+
+    def thresholds(self, run_ids: List[str]) -> Dict[str, float]:
+        """Pass threshold of each metric as configured in the runs' manifests (the first run wins)."""
+        thresholds = {}
+        for run_id in run_ids:
+            for metric, config in (self.manifest(run_id).get("config") or {}).items():
+                if isinstance(config, dict) and config.get("threshold") is not None:
+                    thresholds.setdefault(metric, float(config["threshold"]))
+        return thresholds
+
+    def aggregate(self, run_ids: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+                  threshold: Optional[float] = None):
+        """Mean, spread, coverage, pass rate and bootstrap intervals per run, framework and metric.
+
+        Pass rates use each metric's configured threshold unless one threshold is given.
+        """
+        from analysis import analyze
+        run_ids = self._committed(run_ids)
+        table = self.scores(run_ids, metrics, columns=["score"])
+        thresholds = threshold if threshold is not None else self.thresholds(run_ids)
+        return analyze(table, by=["run_id", "framework"], thresholds=thresholds, metric_column="metric")
+
+    def diff(self, baseline: str, candidate: str, metrics: Optional[List[str]] = None, tolerance: float = 0.0):
+        """Per-metric comparison of two runs over rows matched by content fingerprint."""
+        import pandas as pd
+        frame = self.scores([baseline, candidate], metrics, columns=["row_fingerprint", "score"]).to_pandas()
+        if frame.empty:
+            return frame
+        # Duplicate rows share a fingerprint; compare them by their mean score
+        wide = frame.pivot_table(index=["metric", "row_fingerprint"], columns="run_id", values="score",
+                                 aggfunc="mean")
+        report = []
+        for metric, group in wide.groupby(level="metric"):
+            base = group.get(baseline, pd.Series(dtype=float))
+            cand = group.get(candidate, pd.Series(dtype=float))
+            paired = (base - cand).notna()
+            delta = (cand - base)[paired]
+            report.append({
+                "metric": metric,
+                "baseline_mean": base.mean(),
+                "candidate_mean": cand.mean(),
+                "mean_delta": cand.mean() - base.mean(),
+                "paired_rows": int(paired.sum()),
+                "paired_mean_delta": delta.mean(),
+                "improved": int((delta > tolerance).sum()),
+                "regressed": int((delta < -tolerance).sum()),
+                "only_in_baseline": int((base.notna() & cand.isna()).sum()),
+                "only_in_candidate": int((cand.notna() & base.isna()).sum()),
+            })
+        return pd.DataFrame(report)
+
+    def slices(self, run_id: str, by: List[str], metrics: Optional[List[str]] = None,
+               threshold: Optional[float] = None):
+        """Per-slice aggregates with bootstrap intervals, joining scores with only the requested row attribute columns."""
+        import pyarrow.parquet as pq
+        from analysis import analyze
+        scores = self.scores([run_id], metrics, columns=["row", "score"]).to_pandas()
+        attributes = pq.read_table(os.path.join(self.rows_dir, f"run_id={run_id}", "part-0.parquet"),
+                                   columns=["row"] + list(by)).to_pandas()
+        frame = scores.merge(attributes, on="row", how="left")
+        thresholds = threshold if threshold is not None else self.thresholds([run_id])
+        return analyze(frame, by=["framework"] + list(by), thresholds=thresholds, metric_column="metric")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default="./results/store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="list stored runs")
+    aggregate = commands.add_parser("aggregate", help="aggregates per run, framework and metric")
+    aggregate.add_argument("--runs", nargs="+")
+    aggregate.add_argument("--metrics", nargs="+")
+    aggregate.add_argument("--threshold", type=float, help="default: each metric's configured threshold")
+    diff = commands.add_parser("diff", help="compare two runs row by row")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+    diff.add_argument("--metrics", nargs="+")
+    diff.add_argument("--tolerance", type=float, default=0.0)
+    slices = commands.add_parser("slices", help="aggregates per slice of row attributes")
+    slices.add_argument("run_id")
+    slices.add_argument("--by", nargs="+", required=True)
+    slices.add_argument("--metrics", nargs="+")
+    slices.add_argument("--threshold", type=float, help="default: each metric's configured threshold")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.root)
+    if args.command == "runs":
+        frame = store.runs()
+    elif args.command == "aggregate":
+        frame = store.aggregate(args.runs, args.metrics, args.threshold)
+    elif args.command == "diff":
+        frame = store.diff(args.baseline, args.candidate, args.metrics, args.tolerance)
+    else:
+        frame = store.slices(args.run_id, args.by, args.metrics, args.threshold)
+    print(frame.to_string(index=False) if len(frame) else "No results.")
+
+
+if __name__ == "__main__":
+    main()
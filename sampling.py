@@ -0,0 +1,204 @@
+import math
+from statistics import NormalDist
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from eval import DataHandler, EvaluationInterface, FrameworkFactory
+from instrumentation import estimate_cost, token_usage
+from scheduler import estimate_tokens
+from score_cache import metric_config
+
+
+def wilson_interval(successes: int, total: int, confidence: float = 0.95) -> tuple:
+    """Wilson score interval for a binomial proportion."""
+    if total == 0:
+        return float("nan"), float("nan")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def bootstrap_interval(values: np.ndarray, confidence: float = 0.95, resamples: int = 1000,
+                       rng: Optional[np.random.Generator] = None) -> tuple:
+    """Percentile bootstrap interval of the mean, resampled in one vectorized draw."""
+    if len(values) == 0:
+        return float("nan"), float("nan")
+    rng = rng or np.random.default_rng(0)
+    means = values[rng.integers(0, len(values), size=(resamples, len(values)))].mean(axis=1)
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(means, [alpha, 1 - alpha])
+    return float(lower), float(upper)
+
+
+class RunningInterval:
+    """Mean, pass count and Poisson bootstrap of one metric's scores, updated as batches of rows arrive.
+
+    Each resample weights every row by a Poisson(1) draw, so earlier rows keep their draws and a batch only
+    costs resamples x batch rows, instead of redrawing a resamples x n index matrix each time.
+    """
+
+    def __init__(self, threshold: float, resamples: int = 1000, rng: Optional[np.random.Generator] = None) -> None:
+        self.threshold = threshold
+        self.rng = rng or np.random.default_rng(0)
+        self.count = 0
+        self.total = 0.0
+        self.passed = 0
+        self.weighted_totals = np.zeros(resamples)
+        self.weights = np.zeros(resamples)
+
+    def add(self, values: np.ndarray) -> None:
+        weights = self.rng.poisson(1.0, size=(len(self.weights), len(values)))
+        self.weighted_totals += weights @ values
+        self.weights += weights.sum(axis=1)
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.passed += int((values >= self.threshold).sum())
+
+    def bootstrap(self, confidence: float) -> tuple:
+        """(mean, lower, upper) from the bootstrap means."""
+        if self.count == 0:
+            return float("nan"), float("nan"), float("nan")
+        drawn = self.weights > 0
+        means = self.weighted_totals[drawn] / self.weights[drawn]
+        alpha = (1 - confidence) / 2
+        lower, upper = np.quantile(means, [alpha, 1 - alpha])
+        return self.total / self.count, float(lower), float(upper)
+
+    def wilson(self, confidence: float) -> tuple:
+        """(pass rate, lower, upper) at the threshold."""
+        lower, upper = wilson_interval(self.passed, self.count, confidence)
+        return (self.passed / self.count if self.count else float("nan")), lower, upper
+
+
+def sampling_order(data: Any, strata: Optional[str] = None, seed: int = 0) -> np.ndarray:
+    """Random row order; with a strata column, each prefix keeps the strata in proportion."""
+    rng = np.random.default_rng(seed)
+    if strata is None:
+        return rng.permutation(len(data))
+    # Rank rows within their stratum, then interleave by relative rank so prefixes are proportional
+    keys = data[strata].astype(str).to_numpy()
+    relative_rank = np.empty(len(data))
+    for value in np.unique(keys):
+        members = np.flatnonzero(keys == value)
+        relative_rank[rng.permutation(members)] = (np.arange(len(members)) + rng.random()) / len(members)
+    return np.lexsort((rng.random(len(data)), relative_rank))
+
+
+class SamplingResult(dict):
+    """Per-metric estimate, interval and rows used by an adaptive sampling run."""
+
+    def __init__(self, estimates: Dict[str, Dict[str, Any]], scores: Any, rows_used: int,
+                 cost: float, stop_reason: str) -> None:
+        super().__init__(estimates)
+        self.scores = scores
+        self.rows_used = rows_used
+        self.cost = cost
+        self.stop_reason = stop_reason
+
+    def to_pandas(self):
+        """Return the summary table, one row per metric."""
+        import pandas as pd
+        return pd.DataFrame([{"metric": name, **estimate} for name, estimate in self.items()])
+
+
+# Concrete Class for sampled execution - Implements EvaluationInterface with early stopping
+class SampledEvaluator(EvaluationInterface):
+
+    def __init__(self, framework: str, tolerance: float = 0.05, confidence: float = 0.95,
+                 method: str = "bootstrap", batch_size: int = 50, min_rows: int = 30,
+                 max_rows: Optional[int] = None, max_cost: Optional[float] = None,
+                 strata: Optional[str] = None, threshold: float = 0.5, seed: int = 0) -> None:
+        super().__init__()
+        if method not in ("bootstrap", "wilson"):
+            raise ValueError("Unsupported interval method. Please use 'bootstrap' or 'wilson'.")
+        self.framework = framework
+        # The wrapped evaluator takes the cache, scheduler, cascade and progress hooks as usual
+        self.evaluator = FrameworkFactory.get_evaluator(framework)
+        self.tolerance = tolerance
+        self.confidence = confidence
+        self.method = method
+        self.batch_size = batch_size
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.max_cost = max_cost
+        self.strata = strata
+        self.threshold = threshold
+        self.seed = seed
+        self.data = None
+        self.metrics = None
+        self.results = None
+
+    def load_dataset(self, dataset_path: Any = None, dataset: Any = None) -> None:
+        print(f"Loading dataset for sampled {self.framework} evaluation...")
+        self.data = dataset if dataset is not None else DataHandler(dataset_path).get_data()
+        self.data = self.data.reset_index(drop=True)
+
+    def set_metrics(self, metrics: List[str]) -> None:
+        self.metrics = list(metrics)
+        self.evaluator.set_metrics(self.metrics)
+
+    def interval(self, running: RunningInterval) -> tuple:
+        """(estimate, lower, upper) for one metric's scored rows."""
+        if self.method == "wilson":
+            # Wilson intervals are for proportions, so the estimate is the pass rate at the threshold
+            return running.wilson(self.confidence)
+        return running.bootstrap(self.confidence)
+
+    def _batch_cost(self, batch: Any, reported: float) -> float:
+        # A batch served entirely from the score cache, checkpoint or cascade really did cost nothing
+        if reported or not self.evaluator.judge_units:
+            return reported
+        # Offline estimate: every metric sends each row's text to its judge model once
+        tokens = estimate_tokens(batch.astype(str).to_numpy().ravel().tolist())
+        return sum(estimate_cost(metric_config(m)["model"], tokens, 0) for m in self.evaluator.real_metrics)
+
+    def evaluate(self) -> Dict[str, Any]:
+        import pandas as pd
+
+        order = sampling_order(self.data, self.strata, self.seed)
+        limit = min(len(order), self.max_rows) if self.max_rows is not None else len(order)
+        rng = np.random.default_rng(self.seed)
+        running = {}
+        frames, estimates, cost, used = [], {}, 0.0, 0
+        stop_reason = "dataset exhausted"
+        print(f"Sampling up to {limit} of {len(self.data)} rows using {self.framework} framework "
+              f"(tolerance {self.tolerance}, {self.method} {self.confidence:.0%} intervals)...")
+        while used < limit:
+            if self.max_cost is not None and cost >= self.max_cost:
+                stop_reason = "cost budget exhausted"
+                break
+            positions = order[used:min(used + self.batch_size, limit)]
+            batch = self.data.iloc[positions]
+            self.evaluator.load_frame(batch)
+            with token_usage() as usage:
+                result = self.evaluator.evaluate()
+            cost += self._batch_cost(batch, usage.cost)
+            frame = result.to_pandas()
+            frame.index = batch.index
+            frames.append(frame)
+            used += len(positions)
+
+            estimates = {}
+            for name in result.metric_names:
+                values = pd.to_numeric(frame[name], errors="coerce").dropna().to_numpy(dtype=float)
+                metric = running.setdefault(name, RunningInterval(self.threshold, rng=rng))
+                metric.add(values)
+                estimate, lower, upper = self.interval(metric)
+                estimates[name] = {"estimate": estimate, "lower": lower, "upper": upper,
+                                   "width": upper - lower, "rows": metric.count}
+            widths = ", ".join(f"{name} ±{e['width'] / 2:.3f}" for name, e in estimates.items())
+            print(f"Sampled {used} rows (${cost:.2f}): {widths}")
+            if used >= self.min_rows and all(e["width"] <= self.tolerance for e in estimates.values()):
+                stop_reason = "tolerance reached"
+                break
+        else:
+            if limit < len(order):
+                stop_reason = "row budget exhausted"
+        scores = pd.concat(frames).sort_index() if frames else pd.DataFrame()
+        print(f"Stopped after {used} rows: {stop_reason}")
+        self.results = SamplingResult(estimates, scores, used, cost, stop_reason)
+        return self.results
@@ -0,0 +1,306 @@
+import asyncio
+import random
+import time
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+
+def estimate_tokens(text: Any) -> int:
+    """Rough offline token estimate (about four characters per token)."""
+    if text is None:
+        return 0
+    if isinstance(text, (list, tuple)):
+        return sum(estimate_tokens(t) for t in text)
+    return max(1, len(str(text)) // 4)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for provider throttling errors (HTTP 429) from openai, httpx or langchain clients."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(error).__name__ == "RateLimitError"
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by the provider's Retry-After header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class JudgeTimeout(Exception):
+    """Raised when a judge call misses its per-call deadline."""
+
+
+class RateLimits:
+    """Concurrency, requests/minute and tokens/minute limits; None means unlimited."""
+
+    def __init__(self, concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None) -> None:
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+    def divided(self, parts: int) -> "RateLimits":
+        """An equal share of these limits, for splitting one quota across worker processes."""
+        def share(value):
+            return None if value is None else max(1, value // parts) if isinstance(value, int) else value / parts
+        return RateLimits(share(self.concurrency), share(self.requests_per_minute), share(self.tokens_per_minute))
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Requests larger than the bucket would never fit; let them drain it completely instead
+        amount = min(float(amount), self.capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class _Limiter:
+    """Semaphore, buckets and adaptive backoff state for one scope (global or one model)."""
+
+    def __init__(self, limits: RateLimits) -> None:
+        self.semaphore = asyncio.Semaphore(limits.concurrency) if limits.concurrency else None
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.backoff = 0.0
+        self.paused_until = 0.0
+
+    async def wait(self, tokens: int) -> None:
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(tokens)
+
+    def throttled(self, retry_after: Optional[float], base_backoff: float, max_backoff: float) -> float:
+        # Each consecutive 429 doubles the pause for every request in this scope
+        self.backoff = min(max_backoff, self.backoff * 2 if self.backoff else base_backoff)
+        delay = max(self.backoff, retry_after or 0.0)
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        return delay
+
+    def succeeded(self) -> None:
+        self.backoff = self.backoff / 2 if self.backoff > 0.05 else 0.0
+
+
+class JudgeUnit:
+    """One judge call: an async callable plus the model and token estimate used for rate limiting."""
+
+    def __init__(self, key: Any, call: Callable[[], Awaitable[Any]], model: Optional[str] = None,
+                 tokens: int = 0) -> None:
+        self.key = key
+        self.call = call
+        self.model = model or "default"
+        self.tokens = tokens
+        self.attempts = 0
+        self.latency = None
+
+
+class JudgeScheduler:
+    """Asyncio scheduler for judge calls with global and per-model rate limits.
+
+    timeout is a per-call deadline in seconds; calls that miss it or fail are retried up to retries times
+    with jittered exponential backoff. With hedge_percentile (e.g. 95), a call still running after that
+    percentile of recent latencies gets a duplicate request, and whichever answers first is used.
+    """
+
+    def __init__(self, global_limits: Optional[RateLimits] = None,
+                 model_limits: Optional[Dict[str, RateLimits]] = None, max_retries: int = 5,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0, timeout: Optional[float] = None,
+                 retries: int = 2, hedge_percentile: Optional[float] = None, hedge_min_samples: int = 20) -> None:
+        self.global_limits = global_limits or RateLimits()
+        self.model_limits = model_limits or {}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retries = retries
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = []
+        self.timeouts = 0
+        self.failed_attempts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._limiters = None
+        self._loop = None
+
+    def _limiter(self, model: str) -> _Limiter:
+        # Limiters hold asyncio primitives, so they are created inside the running loop
+        if model not in self._limiters:
+            self._limiters[model] = _Limiter(self.model_limits.get(model, RateLimits()))
+        return self._limiters[model]
+
+    async def _acquire_slots(self, limiters: List[_Limiter]) -> None:
+        for limiter in limiters:
+            if limiter.semaphore is not None:
+                await limiter.semaphore.acquire()
+
+    def _release_slots(self, limiters: List[_Limiter]) -> None:
+        for limiter in limiters:
+            if limiter.semaphore is not None:
+                limiter.semaphore.release()
+
+    def _hedge_after(self) -> Optional[float]:
+        """Seconds after which a call is hedged: the configured percentile of recent latencies."""
+        if self.hedge_percentile is None or len(self.latencies) < self.hedge_min_samples:
+            return None
+        recent = sorted(self.latencies[-1000:])
+        return recent[min(len(recent) - 1, int(len(recent) * self.hedge_percentile / 100))]
+
+    async def _attempt(self, unit: JudgeUnit) -> Any:
+        """One request for a unit, abandoned once it passes the per-call deadline."""
+        if self.timeout is None:
+            return await unit.call()
+        try:
+            return await asyncio.wait_for(unit.call(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise JudgeTimeout(f"No reply from {unit.model} within {self.timeout:.1f}s") from None
+
+    async def _call(self, unit: JudgeUnit, limiters: List[_Limiter]) -> Any:
+        hedge_after = self._hedge_after()
+        if hedge_after is None:
+            return await self._attempt(unit)
+        tasks = {asyncio.ensure_future(self._attempt(unit))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                return done.pop().result()
+            # Slower than most calls: send a duplicate within the same slot and take whichever answers first
+            primary = next(iter(tasks))
+            for limiter in limiters:
+                await limiter.wait(unit.tokens)
+            if primary.done():
+                return primary.result()
+            self.hedges += 1
+            tasks.add(asyncio.ensure_future(self._attempt(unit)))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def submit(self, unit: JudgeUnit) -> Any:
+        """Run one unit under the limits, retrying with adaptive backoff on 429 responses and jittered
+        exponential backoff on timeouts and other failures."""
+        limiters = [self._limiters["__global__"], self._limiter(unit.model)]
+        failures = 0
+        while True:
+            unit.attempts += 1
+            await self._acquire_slots(limiters)
+            try:
+                for limiter in limiters:
+                    await limiter.wait(unit.tokens)
+                start = time.monotonic()
+                result = await self._call(unit, limiters)
+                unit.latency = time.monotonic() - start
+                self.latencies.append(unit.latency)
+                for limiter in limiters:
+                    limiter.succeeded()
+                return result
+            except Exception as error:
+                if is_rate_limit_error(error):
+                    if unit.attempts > self.max_retries:
+                        raise
+                    retry_after = _retry_after(error)
+                    delay = max(limiter.throttled(retry_after, self.base_backoff, self.max_backoff)
+                                for limiter in limiters)
+                    print(f"Rate limited on {unit.model}; backing off {delay:.1f}s (attempt {unit.attempts})")
+                    # Jitter keeps throttled callers from retrying in lockstep
+                    pause = random.uniform(0, self.base_backoff)
+                else:
+                    failures += 1
+                    self.failed_attempts += 1
+                    if failures > self.retries:
+                        raise
+                    # Full jitter: a random pause up to the exponential backoff, so retries spread out
+                    pause = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** (failures - 1)))
+                    print(f"Judge call on {unit.model} failed ({error!r}); retry {failures} in {pause:.1f}s")
+            finally:
+                self._release_slots(limiters)
+            await asyncio.sleep(pause)
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts and latency percentiles, including how often deadlines and hedging kicked in."""
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else None
+
+        return {"calls": len(ordered), "p50_s": percentile(50), "p99_s": percentile(99), "timeouts": self.timeouts,
+                "failed_attempts": self.failed_attempts, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+    async def as_completed(self, units: List[JudgeUnit]):
+        """Yield (unit, result, error) tuples as units finish."""
+        # Limiters are shared by every batch of units running in the same event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._limiters = {"__global__": _Limiter(self.global_limits)}
+            self._loop = loop
+
+        async def run(unit):
+            try:
+                return unit, await self.submit(unit), None
+            except Exception as error:
+                return unit, None, error
+
+        tasks = [asyncio.ensure_future(run(unit)) for unit in units]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            # A consumer that stops early (cancel, an error in on_result) stops the judge calls still in flight
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def arun(self, units: List[JudgeUnit],
+                   on_result: Callable[[JudgeUnit, Any, Optional[BaseException]], None]) -> None:
+        """Run all units and call on_result for each as it completes, inside the running event loop."""
+        results = self.as_completed(units)
+        try:
+            async for unit, result, error in results:
+                on_result(unit, result, error)
+        finally:
+            # Closed here rather than when garbage collected, so unfinished units are cancelled before returning
+            await results.aclose()
+
+    def run(self, units: List[JudgeUnit], on_result: Callable[[JudgeUnit, Any, Optional[BaseException]], None]) -> None:
+        """Blocking entry point: run all units and call on_result for each as it completes."""
+        asyncio.run(self.arun(units, on_result))
@@ -0,0 +1,219 @@
+import ast
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+from typing import List, Dict, Any, Optional
+
+# Column aliases so RAGAs-style and DeepEval-style files normalize to the same row
+ROW_COLUMN_ALIASES = {
+    "question": ("question", "query", "input"),
+    "answer": ("answer", "actual_output"),
+    "contexts": ("contexts", "retrieval_context", "context"),
+    "ground_truth": ("ground_truth", "expected_output", "ground_truths"),
+}
+
+
+def _clean_text(value: Any) -> Optional[str]:
+    """Return a stripped string, or None for missing values."""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return str(value).strip()
+
+
+def parse_contexts(value: Any) -> List[str]:
+    """Return contexts as a list of stripped strings, parsing list literals stored as text."""
+    if value is None:
+        return []
+    if isinstance(value, float) and math.isnan(value):
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("["):
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                value = [text]
+        else:
+            value = [text]
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    return [str(v).strip() for v in value if v is not None]
+
+
+def parse_ground_truth(value: Any) -> Optional[str]:
+    """Return the ground truth as text; lists (or list literals stored as text) use their first entry."""
+    if isinstance(value, str) and value.lstrip().startswith("["):
+        contexts = parse_contexts(value)
+        return contexts[0] if contexts else None
+    if isinstance(value, (list, tuple)) or hasattr(value, "tolist"):
+        values = list(value)
+        return _clean_text(values[0]) if values else None
+    return _clean_text(value)
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a row from either framework's schema to question/answer/contexts/ground_truth."""
+    normalized = {}
+    for field, aliases in ROW_COLUMN_ALIASES.items():
+        value = None
+        for alias in aliases:
+            if alias in row:
+                value = row[alias]
+                break
+        if field == "contexts":
+            normalized[field] = parse_contexts(value)
+        elif field == "ground_truth":
+            # RAGAs v1 datasets store ground truths as a list with a single entry
+            normalized[field] = parse_ground_truth(value)
+        else:
+            normalized[field] = _clean_text(value)
+    return normalized
+
+
+def row_fingerprint(row: Dict[str, Any]) -> str:
+    """Content hash of a normalized row."""
+    payload = json.dumps(normalize_row(row), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _model_name(metric: Any) -> Optional[str]:
+    """Best-effort name of the judge model attached to a metric."""
+    # DeepEval metrics expose the resolved model name directly
+    model = getattr(metric, "evaluation_model", None)
+    if isinstance(model, str) and model:
+        return model
+    # RAGAs metrics hold an LLM wrapper around a langchain model
+    llm = getattr(metric, "llm", None)
+    inner = getattr(llm, "langchain_llm", llm)
+    for attr in ("model_name", "model"):
+        value = getattr(inner, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+def metric_config(metric: Any) -> Dict[str, Any]:
+    """Configuration fields of a metric that change its score."""
+    return {
+        "threshold": getattr(metric, "threshold", None),
+        "model": _model_name(metric),
+        "include_reason": getattr(metric, "include_reason", None),
+    }
+
+
+class ScoreCache:
+    """Persistent SQLite cache of judge-model metric scores keyed by content hash."""
+
+    def __init__(self, path: str, max_entries: Optional[int] = None,
+                 max_age_seconds: Optional[float] = None, evict_interval: float = 60.0) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        # put_many() evicts at most this often (seconds) rather than on every flush
+        self.evict_interval = evict_interval
+        self._evicted_at = None
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Sharded runs open one connection per worker process; WAL lets them read while another writes, and each
+        # waits up to 60s for a write lock. Scheduled runs write from the client registry's loop thread while the
+        # caller waits, never concurrently
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA busy_timeout = 60000")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, metric TEXT, score REAL, "
+            "created_at REAL, accessed_at REAL)"
+        )
+        # Eviction deletes by age and least recent use; the indexes keep it off a full scan and sort
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_created_at ON scores (created_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_accessed_at ON scores (accessed_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(metric_name: str, config: Dict[str, Any], row: Dict[str, Any]) -> str:
+        """Hash of the metric name, metric config and normalized row."""
+        payload = json.dumps(
+            {"metric": metric_name, "config": config, "row": normalize_row(row)},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        """Return cached scores for the given keys and update hit/miss counts."""
+        found = {}
+        now = time.time()
+        unique_keys = list(dict.fromkeys(keys))
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT key, score, created_at FROM scores WHERE key IN ({placeholders})"
+            for key, score, created_at in self.conn.execute(query, chunk):
+                if self.max_age_seconds is not None and now - created_at > self.max_age_seconds:
+                    continue
+                found[key] = score
+        if found:
+            placeholders = ",".join("?" * len(found))
+            self.conn.execute(
+                f"UPDATE scores SET accessed_at = ? WHERE key IN ({placeholders})",
+                [now, *found.keys()],
+            )
+            self.conn.commit()
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, entries: List[tuple]) -> None:
+        """Store (key, metric_name, score) entries, skipping failed (NaN) scores."""
+        now = time.time()
+        rows = [
+            (key, metric_name, float(score), now, now)
+            for key, metric_name, score in entries
+            if score is not None and not math.isnan(float(score))
+        ]
+        if rows:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+        if self._evicted_at is None or time.monotonic() - self._evicted_at >= self.evict_interval:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop entries older than max_age_seconds, then least recently used beyond max_entries."""
+        self._evicted_at = time.monotonic()
+        removed = 0
+        if self.max_age_seconds is not None:
+            cursor = self.conn.execute(
+                "DELETE FROM scores WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+            )
+            removed += cursor.rowcount
+        if self.max_entries is not None and \
+                self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] > self.max_entries:
+            cursor = self.conn.execute(
+                "DELETE FROM scores WHERE key IN ("
+                "SELECT key FROM scores ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            removed += cursor.rowcount
+        if removed:
+            self.conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counts for this session and the number of stored entries."""
+        (entries,) = self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,153 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+
+from eval import DataHandler, EvaluationCancelled, EvaluationInterface, EvaluationResult, FrameworkFactory
+from scheduler import JudgeScheduler, RateLimits
+
+
+def _evaluate_shard(framework: str, metrics: List[str], shard: Any, options: Dict[str, Any]) -> tuple:
+    """Worker entry point: evaluate one shard and return its per-row scores under the original index."""
+    from score_cache import ScoreCache
+
+    evaluator = FrameworkFactory.get_evaluator(framework)
+    evaluator.set_judge_model(options["judge_model"])
+    evaluator.load_frame(shard)
+    evaluator.set_metrics(metrics)
+    if options["cache"] is not None:
+        evaluator.set_cache(ScoreCache(**options["cache"]))
+    if options["checkpoint"] is not None:
+        evaluator.set_checkpoint(options["checkpoint"])
+    if options["cascade"] is not None:
+        evaluator.set_cascade(options["cascade"])
+    if options["scheduler"] is not None:
+        evaluator.set_scheduler(JudgeScheduler(**options["scheduler"]))
+    result = evaluator.evaluate()
+    scores = result.to_pandas()
+    scores.index = shard.index
+    unscored = [dict(entry, row=int(shard.index[entry["row"]])) for entry in result.unscored]
+    return scores, result.metric_names, unscored, result.configs
+
+
+# Concrete Class for sharded execution - Implements EvaluationInterface over a process pool
+class ShardedEvaluator(EvaluationInterface):
+
+    def __init__(self, framework: str, shards: Optional[int] = None) -> None:
+        super().__init__()
+        self.framework = framework
+        self.shards = shards or os.cpu_count() or 1
+        self.data = None
+        self.metrics = None
+        self.results = None
+        self.cache = None
+        self.checkpoint = None
+        self.cascade = None
+        self.judge_model = None
+        self.scheduler = None
+        self.progress_callback = None
+        self.cancel_event = None
+
+    def load_dataset(self, dataset_path: Any = None, dataset: Any = None) -> None:
+        # Rows stay as a DataFrame here; each worker adapts only its own shard
+        print(f"Loading dataset for {self.shards} {self.framework} shards...")
+        self.data = dataset if dataset is not None else DataHandler(dataset_path).get_data()
+        self.data = self.data.reset_index(drop=True)
+
+    def load_frame(self, data: Any) -> None:
+        self.data = data.reset_index(drop=True)
+
+    def set_metrics(self, metrics: List[str]) -> None:
+        self.metrics = list(metrics)
+
+    def set_cache(self, cache: Any) -> None:
+        """Share the score cache's SQLite file between the worker processes, each with its own connection."""
+        self.cache = {"path": cache.path, "max_entries": cache.max_entries, "max_age_seconds": cache.max_age_seconds}
+
+    def set_manifest(self, manifest: Any) -> None:
+        raise ValueError("Incremental manifests need the full table; use the score cache with sharded runs.")
+
+    def set_checkpoint(self, checkpoint: Any) -> None:
+        """Every shard appends to the same write-ahead log, so a resumed run skips rows whichever shard scored them."""
+        self.checkpoint = checkpoint
+
+    def set_cascade(self, cascade: Any) -> None:
+        self.cascade = cascade
+
+    def set_judge_model(self, model: Optional[str]) -> None:
+        self.judge_model = model
+
+    def set_scheduler(self, scheduler: JudgeScheduler) -> None:
+        """Run each shard through a scheduler with the given settings and an equal share of its rate limits."""
+        self.scheduler = scheduler
+
+    def set_rate_limits(self, global_limits: Optional[RateLimits] = None,
+                        model_limits: Optional[Dict[str, RateLimits]] = None) -> None:
+        """Run each shard through a scheduler holding an equal share of the overall limits."""
+        self.scheduler = JudgeScheduler(global_limits, model_limits)
+
+    def set_progress(self, callback: Optional[Any] = None, cancel_event: Optional[Any] = None) -> None:
+        """Report scores as callback(metric_name, row_index, score) as each shard finishes; stop when cancel_event is set.
+
+        Shards already running finish their rows; shards not yet started are cancelled.
+        """
+        self.progress_callback = callback
+        self.cancel_event = cancel_event
+
+    def split(self) -> List[Any]:
+        """Contiguous shards of near-equal size that keep the original row index."""
+        count = max(1, min(self.shards, len(self.data)))
+        size, extra = divmod(len(self.data), count)
+        shards, start = [], 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            shards.append(self.data.iloc[start:end])
+            start = end
+        return shards
+
+    def _options(self, shards: int) -> Dict[str, Any]:
+        scheduler = None
+        if self.scheduler is not None:
+            # Schedulers hold asyncio state, so each worker builds its own from the same settings
+            base = self.scheduler
+            scheduler = {
+                "global_limits": base.global_limits.divided(shards),
+                "model_limits": {model: limits.divided(shards) for model, limits in base.model_limits.items()},
+                "max_retries": base.max_retries, "base_backoff": base.base_backoff, "max_backoff": base.max_backoff,
+                "timeout": base.timeout, "retries": base.retries, "hedge_percentile": base.hedge_percentile,
+                "hedge_min_samples": base.hedge_min_samples,
+            }
+        return {"cache": self.cache, "checkpoint": self.checkpoint, "cascade": self.cascade,
+                "judge_model": self.judge_model, "scheduler": scheduler}
+
+    def evaluate(self) -> Dict[str, Any]:
+        import pandas as pd
+
+        shards = self.split()
+        print(f"Evaluating {len(self.data)} rows in {len(shards)} shards using {self.framework} framework...")
+        options = self._options(len(shards))
+        outputs = [None] * len(shards)
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = {
+                pool.submit(_evaluate_shard, self.framework, self.metrics, shard, options): n
+                for n, shard in enumerate(shards)
+            }
+            for future in as_completed(futures):
+                outputs[futures[future]] = output = future.result()
+                if self.progress_callback is not None:
+                    frame, names = output[0], output[1]
+                    for name in names:
+                        for row, score in frame[name].items():
+                            self.progress_callback(name, int(row), None if pd.isna(score) else float(score))
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    raise EvaluationCancelled("Evaluation cancelled")
+        # Concatenate in shard order and sort by the original index so row order is deterministic
+        scores = pd.concat([frame for frame, _, _, _ in outputs]).sort_index()
+        metric_names = outputs[0][1] if outputs else []
+        unscored = [entry for _, _, shard_unscored, _ in outputs for entry in shard_unscored]
+        # Every shard configures the same metrics, so the first shard's configs describe the whole run
+        configs = outputs[0][3] if outputs else {}
+        # Aggregates are recomputed over all rows, not averaged across shards
+        self.results = EvaluationResult(scores.reset_index(drop=True), metric_names, configs, unscored)
+        return self.results
@@ -0,0 +1,228 @@
+"""Offline, deterministic OpenAI-compatible stand-in for the judge and embedding models.
+
+Run it and point both frameworks at it:
+    python stub_judge_server.py --port 8765 --latency-ms 200 --latency-dist lognormal --error-rate 0.01
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_BASE=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional
+
+from scheduler import estimate_tokens
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def _verdicts(prompt: str, count: int, yes_rate: float = 0.8) -> List[bool]:
+    """Deterministic yes/no verdicts derived from the prompt text."""
+    rng = random.Random(_seed(prompt))
+    return [rng.random() < yes_rate for _ in range(count)]
+
+
+def judge_reply(prompt: str) -> Dict[str, Any]:
+    """Build a valid JSON reply for the prompt shapes used by RAGAs and DeepEval metrics."""
+    verdicts = _verdicts(prompt, 3)
+    # Batched judge prompts list their rows as JSON objects with an "id" and ask for one score per id
+    if '"scores"' in prompt:
+        ids = [int(i) for i in re.findall(r'"id": (\d+)', prompt)]
+        rng = random.Random(_seed(prompt))
+        return {"scores": [{"id": i, "score": round(rng.random(), 2)} for i in ids]}
+    # DeepEval templates ask for a JSON object with a named key; check the most specific first
+    if '"verdicts"' in prompt:
+        return {"verdicts": [
+            {"verdict": "yes" if v else "no", "reason": f"Stub verdict {i}."} for i, v in enumerate(verdicts)
+        ]}
+    if '"truths"' in prompt:
+        return {"truths": [f"Stub truth {i}." for i in range(3)]}
+    if '"claims"' in prompt:
+        return {"claims": [f"Stub claim {i}." for i in range(3)]}
+    # RAGAs prompts embed the pydantic output schema, so their field names appear in the prompt
+    if '"simpler_statements"' in prompt:
+        return [{"sentence_index": 0, "simpler_statements": [f"Stub statement {i}." for i in range(3)]}]
+    if '"attributed"' in prompt:
+        return [{"statement": f"Stub statement {i}.", "reason": "Stub reason.", "attributed": int(v)}
+                for i, v in enumerate(verdicts)]
+    if '"noncommittal"' in prompt:
+        return {"question": "What does the stub answer describe?", "noncommittal": 0}
+    if '"verdict"' in prompt and '"statement"' in prompt:
+        return [{"statement": f"Stub statement {i}.", "reason": "Stub reason.", "verdict": int(v)}
+                for i, v in enumerate(verdicts)]
+    if '"verdict"' in prompt:
+        return {"reason": "Stub reason.", "verdict": int(verdicts[0])}
+    if '"statements"' in prompt:
+        return {"statements": [f"Stub statement {i}." for i in range(3)]}
+    return {"reason": "Stub reason."}
+
+
+def embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector for a text."""
+    rng = random.Random(_seed(text))
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class StubConfig:
+    """Latency and error-rate distributions for the stub server."""
+
+    def __init__(self, latency_ms: float = 0.0, latency_dist: str = "fixed", error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, embedding_dim: int = 1536, seed: int = 0,
+                 connect_ms: float = 0.0, stall_rate: float = 0.0, stall_ms: float = 30000.0) -> None:
+        if latency_dist not in ("fixed", "exponential", "lognormal"):
+            raise ValueError("latency_dist must be fixed, exponential or lognormal")
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.embedding_dim = embedding_dim
+        self.connect_ms = connect_ms
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def sample(self) -> tuple:
+        """Return (latency seconds, status code) for the next request."""
+        with self.lock:
+            self.requests += 1
+            draw = self.rng.random()
+            if self.latency_dist == "fixed":
+                latency = self.latency_ms
+            elif self.latency_dist == "exponential":
+                latency = self.rng.expovariate(1.0 / self.latency_ms) if self.latency_ms else 0.0
+            else:
+                # Median at latency_ms with a heavy right tail, like real judge calls
+                latency = self.rng.lognormvariate(math.log(self.latency_ms), 0.75) if self.latency_ms else 0.0
+            # A few requests hang far beyond the usual tail, like an overloaded judge replica
+            if self.rng.random() < self.stall_rate:
+                latency = self.stall_ms
+        if draw < self.rate_limit_rate:
+            return latency / 1000.0, 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return latency / 1000.0, 500
+        return latency / 1000.0, 200
+
+
+class StubJudgeHandler(BaseHTTPRequestHandler):
+    config = StubConfig()
+    # Keep-alive like real judge endpoints, so client connection reuse is visible
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.config.lock:
+            self.config.connections += 1
+        # Stands in for the TCP and TLS handshake a new connection pays
+        time.sleep(self.config.connect_ms / 1000.0)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this request, e.g. at its deadline
+            self.close_connection = True
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/models"):
+            self._send(200, {"object": "list", "data": [{"id": "gpt-4", "object": "model"}]})
+        else:
+            self._send(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        latency, status = self.config.sample()
+        time.sleep(latency)
+        if status == 429:
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                       {"Retry-After": "1"})
+            return
+        if status != 200:
+            self._send(status, {"error": {"message": "Stub server error", "type": "server_error"}})
+            return
+        if self.path.endswith("/embeddings"):
+            inputs = request.get("input", [])
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            self._send(200, {
+                "object": "list",
+                "model": request.get("model", "text-embedding-ada-002"),
+                "data": [{"object": "embedding", "index": i, "embedding": embedding(str(text), self.config.embedding_dim)}
+                         for i, text in enumerate(inputs)],
+                "usage": {"prompt_tokens": estimate_tokens(inputs), "total_tokens": estimate_tokens(inputs)},
+            })
+        elif self.path.endswith("/chat/completions"):
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            content = json.dumps(judge_reply(prompt))
+            choices = [
+                {"index": i, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                for i in range(request.get("n") or 1)
+            ]
+            prompt_tokens = estimate_tokens(prompt)
+            completion_tokens = estimate_tokens(content) * len(choices)
+            self._send(200, {
+                "id": f"chatcmpl-stub-{_seed(prompt) % 10**12}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4"),
+                "choices": choices,
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+        else:
+            self._send(404, {"error": {"message": "Not found"}})
+
+
+def make_stub_server(port: int = 0, config: Optional[StubConfig] = None) -> ThreadingHTTPServer:
+    """Create a stub server bound to localhost; port 0 picks a free port."""
+    handler = type("ConfiguredStubJudgeHandler", (StubJudgeHandler,), {"config": config or StubConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(port: int = 0, config: Optional[StubConfig] = None) -> ThreadingHTTPServer:
+    """Start the stub server on a background thread."""
+    server = make_stub_server(port, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-dist", choices=["fixed", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 429")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="delay paid once per new connection")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fraction of requests that hang for --stall-ms")
+    parser.add_argument("--stall-ms", type=float, default=30000.0)
+    args = parser.parse_args()
+    stub_config = StubConfig(args.latency_ms, args.latency_dist, args.error_rate, args.rate_limit_rate,
+                             args.embedding_dim, args.seed, args.connect_ms, args.stall_rate, args.stall_ms)
+    server = make_stub_server(args.port, stub_config)
+    print(f"Stub judge server listening on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,272 @@
+"""Compact column store of evaluation rows, read through small row views.
+
+Questions, answers and ground truths each live once in a contiguous UTF-8 buffer addressed by offsets. Contexts
+are deduplicated into one buffer of unique passages, and every row holds int32 passage ids delimited by an
+offsets array. Row views have no per-row dict; a field is decoded only when it is read, and RAGAs rows or
+DeepEval test cases are built one at a time while iterating.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Callable, Iterator
+
+from score_cache import ROW_COLUMN_ALIASES
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+ROW_FIELDS = tuple(ROW_COLUMN_ALIASES)
+TEXT_FIELDS = ("question", "answer", "ground_truth")
+
+
+class StringColumn:
+    """Strings in one contiguous UTF-8 buffer addressed by int64 offsets; None where a value is missing."""
+
+    __slots__ = ("array", "offsets", "data", "valid")
+
+    def __init__(self, array: pa.Array) -> None:
+        import numpy as np
+        import pyarrow as pa
+        array = array.cast(pa.large_string())
+        _, offsets, data = array.buffers()
+        self.array = array
+        # Views over the Arrow buffers; nothing is copied into Python objects
+        self.offsets = (np.frombuffer(offsets, dtype=np.int64, count=len(array) + 1, offset=array.offset * 8)
+                        if offsets is not None else np.zeros(1, dtype=np.int64))
+        self.data = memoryview(data) if data is not None else memoryview(b"")
+        self.valid = array.is_valid().to_numpy(zero_copy_only=False) if array.null_count else None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get(self, index: int) -> Optional[str]:
+        if self.valid is not None and not self.valid[index]:
+            return None
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+
+def _string_array(column: Any) -> pa.Array:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    column = column.cast(pa.large_string())
+    # Stripped once here, as normalize_row would on every read; copied only when some value needs it
+    if pc.any(pc.match_substring_regex(column, r"^\s|\s$")).as_py():
+        column = pc.utf8_trim_whitespace(column)
+    return column
+
+
+def _context_lists(column: Any) -> tuple:
+    """(row offsets, passage ids, unique passages) of a list<string> or list<dictionary<int32, string>> column."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    lists = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    offsets = lists.offsets.to_numpy().astype(np.int64)
+    values = lists.values.slice(offsets[0], offsets[-1] - offsets[0])
+    offsets -= offsets[0]
+    if not pa.types.is_dictionary(values.type):
+        values = pc.dictionary_encode(values.cast(pa.large_string()))
+    ids = values.indices
+    if ids.null_count:
+        # Missing passages are dropped from their row, as parse_contexts does
+        kept = np.concatenate([[0], np.cumsum(ids.is_valid().to_numpy(zero_copy_only=False))])
+        offsets = kept[offsets]
+        ids = ids.drop_null()
+    return offsets, ids.to_numpy(zero_copy_only=False).astype(np.int32, copy=False), \
+        StringColumn(_string_array(values.dictionary))
+
+
+def _narrow(array: pa.Array) -> pa.Array:
+    # datasets/RAGAs expect string and list<string>; large types are kept only past the 2 GiB offset limit
+    import pyarrow as pa
+    return array.cast(pa.string()) if array.nbytes < 2**31 - 1 else array
+
+
+class TestCaseRow(Mapping):
+    """Read-only view of one stored row with the question/answer/contexts/ground_truth keys of normalize_row."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: "TestCaseStore", index: int) -> None:
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, field: str) -> Any:
+        if field == "contexts":
+            return self.store.contexts(self.index)
+        column = self.store.columns.get(field)
+        if column is None:
+            raise KeyError(field)
+        return column.get(self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(ROW_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"TestCaseRow({self.index}, {dict(self)!r})"
+
+    def to_ragas(self) -> Dict[str, Any]:
+        """The row as a RAGAs sample dict."""
+        return self.store.ragas_row(self.index)
+
+    def to_test_case(self) -> Any:
+        """The row as a DeepEval LLMTestCase."""
+        return self.store.test_case(self.index)
+
+
+class TestCaseStore:
+    """Evaluation rows held as Arrow string buffers, indexed and iterated like a list of TestCaseRow views."""
+
+    def __init__(self, columns: Dict[str, StringColumn], passages: StringColumn, context_offsets: np.ndarray,
+                 context_ids: np.ndarray, fields: Optional[List[str]] = None,
+                 extra: Optional[Dict[str, pa.ChunkedArray]] = None) -> None:
+        self.columns = columns
+        self.passages = passages
+        self.context_offsets = context_offsets
+        self.context_ids = context_ids
+        # Fields present in the source data; the others read as None / []
+        self.fields = list(fields) if fields is not None else list(ROW_FIELDS)
+        # Other source columns (category, source, ...), kept as Arrow arrays for the result table
+        self.extra = dict(extra) if extra is not None else {}
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> "TestCaseStore":
+        """Store a table with the common column names, e.g. from DatasetAdapter.to_arrow().
+
+        contexts may be list<string> or list<dictionary<int32, string>>; passages repeated across rows are stored once.
+        """
+        import numpy as np
+        import pyarrow as pa
+        rows = table.num_rows
+        # Contexts first, so their intermediate arrays are released before the text columns are copied
+        if "contexts" in table.column_names:
+            offsets, ids, passages = _context_lists(table.column("contexts"))
+        else:
+            offsets = np.zeros(rows + 1, dtype=np.int64)
+            ids = np.zeros(0, dtype=np.int32)
+            passages = StringColumn(pa.array([], type=pa.large_string()))
+        columns = {
+            field: StringColumn(_string_array(table.column(field) if field in table.column_names
+                                              else pa.nulls(rows, pa.large_string())))
+            for field in TEXT_FIELDS
+        }
+        extra = {name: table.column(name) for name in table.column_names if name not in ROW_FIELDS}
+        return cls(columns, passages, offsets, ids, [f for f in ROW_FIELDS if f in table.column_names], extra)
+
+    def __len__(self) -> int:
+        return len(self.context_offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [TestCaseRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return TestCaseRow(self, index)
+
+    def __iter__(self) -> Iterator[TestCaseRow]:
+        for index in range(len(self)):
+            yield TestCaseRow(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the store's buffers."""
+        return (sum(column.nbytes for column in self.columns.values()) + self.passages.nbytes
+                + self.context_offsets.nbytes + self.context_ids.nbytes
+                + sum(column.nbytes for column in self.extra.values()))
+
+    def passage_counts(self) -> np.ndarray:
+        """Number of context references to each unique passage."""
+        import numpy as np
+        return np.bincount(self.context_ids, minlength=len(self.passages))
+
+    def contexts(self, index: int, read: Optional[Callable[[int], str]] = None) -> List[str]:
+        read = read or self.passages.get
+        return [read(j) for j in self.context_ids[self.context_offsets[index]:self.context_offsets[index + 1]].tolist()]
+
+    def shared_reader(self) -> Callable[[int], str]:
+        """Passage reader that decodes a passage used by several rows once and returns the same string after."""
+        shared = self.passage_counts() > 1
+        cache = {}
+
+        def read(j: int) -> str:
+            if not shared[j]:
+                return self.passages.get(j)
+            text = cache.get(j)
+            if text is None:
+                text = cache[j] = self.passages.get(j)
+            return text
+
+        return read
+
+    def ragas_row(self, index: int, read: Optional[Callable[[int], str]] = None) -> Dict[str, Any]:
+        row = {field: self.columns[field].get(index) for field in TEXT_FIELDS if field in self.fields}
+        if "contexts" in self.fields:
+            row["contexts"] = self.contexts(index, read)
+        return row
+
+    def test_case(self, index: int, read: Optional[Callable[[int], str]] = None) -> Any:
+        from deepeval.test_case import LLMTestCase
+        return LLMTestCase(
+            input=self.columns["question"].get(index),
+            actual_output=self.columns["answer"].get(index),
+            expected_output=self.columns["ground_truth"].get(index),
+            retrieval_context=self.contexts(index, read) or None,
+        )
+
+    def iter_ragas_rows(self, indices: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield RAGAs sample dicts one at a time; only the current row is decoded."""
+        read = self.shared_reader()
+        for index in range(len(self)) if indices is None else indices:
+            yield self.ragas_row(index, read)
+
+    def iter_test_cases(self, indices: Optional[List[int]] = None) -> Iterator[Any]:
+        """Yield DeepEval LLMTestCase objects one at a time; only the current row is decoded."""
+        read = self.shared_reader()
+        for index in range(len(self)) if indices is None else indices:
+            yield self.test_case(index, read)
+
+    def to_arrow(self, indices: Optional[List[int]] = None) -> pa.Table:
+        """The given rows (all by default) as a table with contexts as list<string>, e.g. for datasets.Dataset."""
+        import numpy as np
+        import pyarrow as pa
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.int64)
+        starts = self.context_offsets[indices]
+        lengths = self.context_offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        columns = {field: _narrow(self.columns[field].array.take(indices)) for field in TEXT_FIELDS}
+        passages = _narrow(self.passages.array.take(pa.array(self.context_ids[positions])))
+        if passages.type == pa.string():
+            columns["contexts"] = pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), passages)
+        else:
+            columns["contexts"] = pa.LargeListArray.from_arrays(pa.array(offsets), passages)
+        return pa.table({field: columns[field] for field in ROW_FIELDS if field in self.fields})
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Rows as a DataFrame of Python strings (None when missing); repeated passages share one string.
+
+        Other source columns follow the four common ones.
+        """
+        import pandas as pd
+        read = self.shared_reader()
+        frame = pd.DataFrame({field: self.columns[field].array.to_pandas() for field in TEXT_FIELDS})
+        frame.insert(2, "contexts", pd.Series([self.contexts(i, read) for i in range(len(self))], dtype="object"))
+        for name, column in self.extra.items():
+            frame[name] = column.to_pandas()
+        return frame
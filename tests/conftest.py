@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def stub_judge():
+    """Offline stub judge for the whole session; the OpenAI clients are pointed at it."""
+    from stub_judge_server import StubConfig, start_stub_server
+
+    config = StubConfig()
+    server = start_stub_server(0, config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    saved = {name: os.environ.get(name) for name in ("OPENAI_BASE_URL", "OPENAI_API_BASE", "OPENAI_API_KEY",
+                                                      "DEEPEVAL_TELEMETRY_OPT_OUT")}
+    os.environ.update(OPENAI_BASE_URL=base_url, OPENAI_API_BASE=base_url, OPENAI_API_KEY="stub",
+                      DEEPEVAL_TELEMETRY_OPT_OUT="YES")
+    yield config
+    server.shutdown()
+    for name, value in saved.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
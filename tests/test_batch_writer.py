@@ -0,0 +1,16 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+from eval import BatchWriter
+
+
+def test_parquet_batches_after_an_all_none_column(tmp_path):
+    path = str(tmp_path / "scores.parquet")
+    writer = BatchWriter(path)
+    writer.write(pd.DataFrame({"question": ["a", "b"], "faithfulness": [float("nan")] * 2,
+                               "faithfulness_source": [None, None]}))
+    writer.write(pd.DataFrame({"question": ["c"], "faithfulness": [0.5], "faithfulness_source": ["judge"]}))
+    writer.close()
+    table = pq.read_table(path).to_pandas()
+    assert table["faithfulness_source"].tolist() == [None, None, "judge"]
+    assert table["faithfulness"].tolist()[2] == 0.5
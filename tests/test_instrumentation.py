@@ -0,0 +1,24 @@
+import asyncio
+
+from instrumentation import token_usage
+
+
+def test_deepeval_metric_tokens_are_captured(stub_judge):
+    from deepeval.test_case import LLMTestCase
+
+    from eval import DeepEvalMetricStrategy
+
+    metric = DeepEvalMetricStrategy().configure_metrics(["faithfulness"])[0]
+    test_case = LLMTestCase(input="Who wrote Hamlet?", actual_output="Shakespeare wrote Hamlet.",
+                            retrieval_context=["Hamlet is a tragedy written by William Shakespeare."])
+
+    async def measure():
+        # DeepEval opens its own OpenAI callback per judge call; the outer block must still see the tokens
+        with token_usage() as usage:
+            await metric.a_measure(test_case)
+        return usage
+
+    usage = asyncio.run(measure())
+    assert usage.requests > 0
+    assert usage.prompt_tokens > 0
+    assert usage.completion_tokens > 0
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from eval import EvaluationResult
+from results_store import ResultsStore
+
+
+def _result(category):
+    table = pd.DataFrame({
+        "question": ["q1", "q2", "q3", "q4"],
+        "answer": ["a1", "a2", "a3", "a4"],
+        "contexts": [["c1"], ["c2"], ["c3"], ["c4"]],
+        "ground_truth": ["g1", "g2", "g3", "g4"],
+        "category": category,
+        "faithfulness": [1.0, 0.5, 0.0, 1.0],
+    })
+    return EvaluationResult(table, ["faithfulness"], {"faithfulness": {"threshold": 0.5}})
+
+
+def test_slices_with_missing_values(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    run_id = store.write_run(_result(["a", None, float("nan"), "b"]), "RAGAs")
+    frame = store.slices(run_id, ["category"])
+    assert set(frame["category"].dropna()) == {"a", "b"}
+    assert frame["rows"].sum() == 4
+
+
+def test_slices_with_mixed_types(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    slices = pd.DataFrame({"bucket": [1, "x", float("nan"), 2.5]})
+    run_id = store.write_run(_result(["a", "a", "b", "b"]), "RAGAs", slices=slices)
+    frame = store.slices(run_id, ["bucket"])
+    assert set(frame["bucket"].dropna()) == {"1", "x", "2.5"}
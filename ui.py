@@ -1,6 +1,95 @@
+import os
+import tempfile
+import threading
+import time
+
 import streamlit as st
-import random
+
+from analysis import analyze
+from eval import DataHandler, EvaluationCancelled, FrameworkFactory
+from scheduler import JudgeScheduler, RateLimits
+
 st.set_page_config(layout="wide")
+
+METRIC_NAMES = ("faithfulness", "context_recall", "context_precision", "answer_relevancy")
+
+
+# Parsed uploads are cached by file content, so reruns never re-parse the same file
+@st.cache_data(show_spinner="Parsing uploaded file...")
+def parse_upload(file_name, file_bytes):
+    suffix = os.path.splitext(file_name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(file_bytes)
+    try:
+        return DataHandler(tmp.name).get_data()
+    finally:
+        os.remove(tmp.name)
+
+
+# Runs one evaluation on a worker thread; the script thread only reads its progress
+class EvaluationJob:
+    def __init__(self, data, framework, metrics, concurrency):
+        self.data = data
+        self.framework = framework
+        self.metrics = list(metrics)
+        self.concurrency = concurrency
+        self.total_units = len(data) * len(self.metrics)
+        self.done_units = 0
+        self.sums = {m: 0.0 for m in self.metrics}
+        self.counts = {m: 0 for m in self.metrics}
+        self.results = None
+        self.summary = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.finished = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def running(self):
+        return self.thread.is_alive()
+
+    def _on_score(self, metric_name, row_index, score):
+        with self.lock:
+            self.done_units += 1
+            if metric_name in self.sums and score is not None and score == score:
+                self.sums[metric_name] += float(score)
+                self.counts[metric_name] += 1
+
+    def _run(self):
+        try:
+            evaluator = FrameworkFactory.get_evaluator(self.framework)
+            evaluator.load_frame(self.data)
+            evaluator.set_metrics(self.metrics)
+            evaluator.set_scheduler(JudgeScheduler(RateLimits(concurrency=self.concurrency)))
+            evaluator.set_progress(self._on_score, self.cancel_event)
+            self.results = evaluator.evaluate()
+            # Intervals and pass rates at each metric's configured threshold, for the finished tiles
+            self.summary = analyze(self.results).set_index("metric")
+        except EvaluationCancelled:
+            self.error = "Analysis cancelled."
+        except Exception as e:
+            self.error = f"Analysis failed: {e}"
+        finally:
+            self.finished = time.monotonic()
+
+    def snapshot(self):
+        """Running metric means, rows/sec and ETA in seconds."""
+        with self.lock:
+            means = {m: (self.sums[m] / self.counts[m] if self.counts[m] else None) for m in self.metrics}
+            done = self.done_units
+        elapsed = (self.finished or time.monotonic()) - self.started
+        rows_done = done / max(1, len(self.metrics))
+        rate = rows_done / elapsed if elapsed > 0 else 0.0
+        remaining_rows = len(self.data) - rows_done
+        eta = remaining_rows / rate if rate > 0 else None
+        return means, done, rate, eta
 st.markdown(
     """
     <style>
@@ -15,7 +104,7 @@ st.markdown(
         align-items: center;
         justify-content: center;
         width: 150px;
-        height: 150px;
+        height: 180px;
         border: 1px solid #ccc;
         padding: 10px;
         border-radius: 10px;
@@ -33,15 +122,22 @@ st.markdown(
     .metric-value {
         font-weight: bold;
     }
+
+    .metric-detail {
+        font-size: 0.8em;
+        color: grey;
+        text-align: center;
+    }
     </style>
     """,
     unsafe_allow_html=True,
 )
 
 st.sidebar.title("Upload and Configure")
-uploaded_file = st.sidebar.file_uploader("Upload CSV or Excel File", type=["csv", "xlsx"])
-framework = st.sidebar.radio("Select Framework", ("Framework A", "Framework B", "Framework C"))
-metrics = st.sidebar.multiselect("Select Metrics", ("Metric 1", "Metric 2", "Metric 3", "Metric 4", "Metric 5", "Metric 6"))
+uploaded_file = st.sidebar.file_uploader("Upload CSV, Excel, JSONL or Parquet File", type=["csv", "xlsx", "jsonl", "parquet"])
+framework = st.sidebar.radio("Select Framework", ("RAGAs", "DeepEval"))
+metrics = st.sidebar.multiselect("Select Metrics", METRIC_NAMES)
+concurrency = st.sidebar.slider("Concurrent judge calls", min_value=1, max_value=64, value=8)
 
 # Add custom CSS to style buttons
 st.markdown(
@@ -63,65 +159,102 @@ st.markdown(
 # Create two columns to place the buttons side by side
 col1, col2 = st.sidebar.columns(2)
 
-# Initialize a state variable for the analysis
-if 'analysis_running' not in st.session_state:
-    st.session_state.analysis_running = False
+# The running job lives in session state so it survives reruns
+if 'job' not in st.session_state:
+    st.session_state.job = None
+job = st.session_state.job
+analysis_running = job is not None and job.running()
+
 # Add 'Run Analysis' button in the sidebar
-run_analysis = st.sidebar.button("Run Analysis", disabled=st.session_state.analysis_running, key="run_analysis")
+with col1:
+    run_analysis = st.button("Run Analysis", disabled=analysis_running, key="run_analysis")
+with col2:
+    cancel_analysis = st.button("Cancel", disabled=not analysis_running, key="cancel_analysis")
+
+
+def render_tiles(metric_values, summary=None):
+    # Organize metrics into rows of 3 per row
+    num_columns = 3
+    names = list(metric_values)
+    metric_groups = [names[i:i + num_columns] for i in range(0, len(names), num_columns)]
+
+    # Display the metrics group-wise
+    for group in metric_groups:
+        columns = st.columns(len(group))  # Create a new set of columns for each group
+        for i, metric_name in enumerate(group):
+            metric_value = metric_values[metric_name]
+            if metric_value is None:
+                color, shown = "grey", "..."
+            else:
+                color = "red" if metric_value < 0.4 else "#FFBF00" if metric_value < 0.6 else "green"  # Use hex for amber
+                shown = round(metric_value, 2)
+            detail = ""
+            if summary is not None and metric_name in summary.index:
+                row = summary.loc[metric_name]
+                detail = (f"95% CI {row['ci_low']:.2f}&ndash;{row['ci_high']:.2f}<br>"
+                          f"{row['pass_rate']:.0%} pass at {row['threshold']:g}")
+
+            # Display the metric in the respective column
+            with columns[i]:
+                st.markdown(
+                    f"""
+                    <div class="metric-tile">
+                        <p class="metric-name">{metric_name}</p>
+                        <p class="metric-value" style="color: {color};">{shown}</p>
+                        <p class="metric-detail">{detail}</p>
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
 
 
 st.title("Metrics")
 
+if cancel_analysis and job is not None:
+    job.cancel()
+
 if run_analysis:
-    # Set the analysis running state to True
-    st.session_state.analysis_running = True
     if uploaded_file and metrics:
-        # Display file name, framework, and selected metrics in the right panel
-        st.markdown(f"""
-            <p style="color:black; font-weight:bold;">File Uploaded: {uploaded_file.name}</p>
-            <p style="color:black; font-weight:bold;">Framework Selected: {framework}</p>
-            <p style="color:black; font-weight:bold;">Metrics Selected: {', '.join(metrics)}</p>
-            """, unsafe_allow_html=True)
-        # Show a spinner while running the analysis
-        with st.spinner("Running analysis..."):
-            # Simulate a long-running process (e.g., 3 seconds delay)
-            import time
-            time.sleep(5) 
-
-        available_metrics = {metric: round(random.uniform(0.11, 0.99), 2) for metric in metrics}
-
-        # Organize metrics into rows of 3 per row
-        num_columns = 3
-        metric_groups = [metrics[i:i + num_columns] for i in range(0, len(metrics), num_columns)]
-
-        # Display the metrics group-wise
-        for group in metric_groups:
-            columns = st.columns(len(group))  # Create a new set of columns for each group
-            for i, metric_name in enumerate(group):
-                metric_value = available_metrics[metric_name]
-                color = "red" if metric_value < 0.4 else "#FFBF00" if metric_value < 0.6 else "green"  # Use hex for amber
-
-                # Display the metric in the respective column
-                with columns[i]:
-                    st.markdown(
-                        f"""
-                        <div class="metric-tile">
-                            <p class="metric-name">{metric_name}</p>
-                            <p class="metric-value" style="color: {color};">{metric_value}</p>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-        # Once analysis is complete, enable the Save Results button
-        st.session_state.analysis_running = False
+        data = parse_upload(uploaded_file.name, uploaded_file.getvalue())
+        job = EvaluationJob(data, framework, metrics, concurrency)
+        job.start()
+        st.session_state.job = job
+        st.session_state.job_file = uploaded_file.name
     else:
         st.error("Please upload a file and select metrics before running analysis.")
+
+if job is not None:
+    # Display file name, framework, and selected metrics in the right panel
+    st.markdown(f"""
+        <p style="color:black; font-weight:bold;">File Uploaded: {st.session_state.get('job_file', '')}</p>
+        <p style="color:black; font-weight:bold;">Framework Selected: {job.framework}</p>
+        <p style="color:black; font-weight:bold;">Metrics Selected: {', '.join(job.metrics)}</p>
+        """, unsafe_allow_html=True)
+    means, done_units, rows_per_sec, eta = job.snapshot()
+    st.progress(done_units / max(1, job.total_units))
+    eta_text = f"{eta:.0f}s" if eta is not None else "estimating..."
+    st.markdown(f"""
+        <p style="color:black;">{done_units}/{job.total_units} scores &middot; {rows_per_sec:.2f} rows/sec &middot; ETA {eta_text}</p>
+        """, unsafe_allow_html=True)
+    render_tiles(means, job.summary)
+    if job.running():
+        # Poll the worker and redraw the tiles as rows finish
+        time.sleep(1)
+        st.rerun()
+    elif job.error:
+        st.error(job.error)
 else:
     righ_panel_msg = "Please select metrics and press 'Run Analysis' to see results."
     st.markdown(f"""
             <p style="color:black; font-weight:bold;">{righ_panel_msg}</p>""", unsafe_allow_html=True)
 
 # Add Save Results button, only show if analysis is completed
-if not st.session_state.analysis_running:
-    # Add 'Save Results' button in the second column
-    st.sidebar.button("Save Results", key="save_results")
\ No newline at end of file
+if job is not None and not job.running() and job.results is not None:
+    # Add 'Save Results' button in the sidebar
+    st.sidebar.download_button(
+        "Save Results",
+        job.results.to_pandas().to_csv(index=False),
+        file_name=f"{job.framework.lower()}_evaluation.csv",
+        mime="text/csv",
+        key="save_results",
+    )